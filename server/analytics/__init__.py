@@ -0,0 +1,7 @@
+"""
+Batch analytics over the roll-call record.
+
+Jobs in this package read the ``votes`` table into NumPy arrays, compute their
+statistics in vectorized form and persist the results to their own tables,
+so the API only ever reads precomputed values.
+"""
@@ -0,0 +1,46 @@
+"""
+Shape-preserving downsampling of time series for charts.
+
+Largest-Triangle-Three-Buckets (Steinarsson, 2013) keeps the first and last
+points and splits the rest into equal-count buckets. From each bucket it
+keeps the point that forms the largest triangle with the previously kept
+point and the average of the next bucket. Peaks and dips survive, unlike
+with averaging or taking every n-th point.
+"""
+import numpy as np
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Return the sorted indices of the at most ``threshold`` points of the
+    series (``x`` ascending) that best preserve its shape.
+    """
+    if threshold < 3:
+        raise ValueError("LTTB needs a threshold of at least 3 points")
+    n = len(x)
+    if threshold >= n:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # Bucket boundaries over the points between the first and the last
+    edges = (np.arange(threshold - 1) * (n - 2) / (threshold - 2)).astype(np.int64) + 1
+    edges[-1] = n - 1
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # The next bucket's average; the last bucket looks at the last point
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean()
+
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected
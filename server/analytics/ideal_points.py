@@ -0,0 +1,115 @@
+"""
+Ideal points: a two-dimensional ideological placement of every member, per
+congress and chamber.
+
+The placement is the truncated SVD of the centred members x roll calls vote
+matrix. Each roll call is centred on the mean position of the members who
+voted on it, and a missed vote counts as that mean, i.e. 0 after centring.
+The left singular vectors of the centred matrix X are the eigenvectors of
+its Gram matrix X X^T, which is only members x members. That Gram matrix is
+accumulated over chunks of roll calls, so only one chunk of X is ever held
+as floats.
+
+As in NOMINATE, near-unanimous roll calls carry no ideological signal and
+are dropped, and so are members with too few votes to place. Coordinates
+are scaled into the unit circle. The first dimension is oriented so that
+Republicans sit on the positive side when there are any.
+
+Run ``python -m server.analytics.ideal_points`` to recompute every session.
+"""
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import delete
+from sqlmodel import Session
+
+from server.analytics.matrix import YES, NO, SessionJob, load_vote_matrix
+from server.analytics.party_unity import member_parties
+from server.models import Chamber, IdealPoint
+
+# Roll calls whose losing side got less than this share of the votes are dropped
+MIN_MINORITY_SHARE = 0.025
+# Members with fewer votes on the remaining roll calls are not placed
+MIN_VOTES = 20
+# Roll calls converted to floats at a time
+CHUNK_SIZE = 1024
+
+_ORIENT_PARTY = "Republican"
+
+
+def ideal_points(votes: np.ndarray, dimensions: int = 2, chunk_size: int = CHUNK_SIZE) -> np.ndarray:
+    """
+    Place the members of a (members, roll calls) YES / NO / 0 vote matrix;
+    returns a (members, dimensions) array of coordinates.
+    """
+    members = votes.shape[0]
+    yes = (votes == YES).sum(axis=0)
+    no = (votes == NO).sum(axis=0)
+    means = (yes - no) / np.maximum(yes + no, 1)
+
+    gram = np.zeros((members, members), dtype=np.float64)
+    for start in range(0, votes.shape[1], chunk_size):
+        chunk = votes[:, start:start + chunk_size]
+        centred = np.where(chunk != 0, chunk - means[start:start + chunk_size], 0).astype(np.float32)
+        gram += centred @ centred.T
+
+    # eigh returns eigenvalues in ascending order
+    eigenvalues, eigenvectors = np.linalg.eigh(gram)
+    top = np.arange(members - 1, max(members - 1 - dimensions, -1), -1)
+    coordinates = eigenvectors[:, top] * np.sqrt(np.clip(eigenvalues[top], 0, None))
+    if coordinates.shape[1] < dimensions:
+        coordinates = np.pad(coordinates, ((0, 0), (0, dimensions - coordinates.shape[1])))
+
+    radius = np.linalg.norm(coordinates, axis=1).max(initial=0)
+    return coordinates / radius if radius > 0 else coordinates
+
+
+def compute_ideal_points(db: Session, congress_session: int) -> int:
+    """Recompute and store the ideal points of one session. Commits; returns the number of members placed."""
+    parties = member_parties(db, congress_session)
+    computed_at = datetime.utcnow()
+    db.execute(delete(IdealPoint).where(IdealPoint.congress_session == congress_session))
+
+    placed = []
+    for chamber in Chamber:
+        matrix = load_vote_matrix(db, congress_session, chamber)
+        votes = matrix.votes
+        yes = (votes == YES).sum(axis=0)
+        no = (votes == NO).sum(axis=0)
+        contested = np.minimum(yes, no) >= MIN_MINORITY_SHARE * (yes + no)
+        votes = votes[:, contested & (yes + no > 0)]
+        members = np.count_nonzero(votes, axis=1) >= MIN_VOTES
+        if members.sum() < 2:
+            continue
+
+        politician_ids = matrix.politician_ids[members]
+        coordinates = ideal_points(votes[members])
+        member_party = [parties.get(int(politician_id)) for politician_id in politician_ids]
+        oriented = np.array([party == _ORIENT_PARTY for party in member_party])
+        if oriented.any() and coordinates[oriented, 0].mean() < 0:
+            coordinates[:, 0] *= -1
+
+        placed += [
+            IdealPoint(
+                congress_session=congress_session,
+                chamber=chamber,
+                politician_id=int(politician_id),
+                party_name=party,
+                dim1=float(x),
+                dim2=float(y),
+                votes_scaled=int(count),
+                computed_at=computed_at,
+            )
+            for politician_id, party, (x, y), count
+            in zip(politician_ids, member_party, coordinates, np.count_nonzero(votes[members], axis=1))
+        ]
+    db.add_all(placed)
+    db.commit()
+    return len(placed)
+
+
+ideal_points_job = SessionJob(compute_ideal_points, "members placed")
+
+
+if __name__ == "__main__":
+    ideal_points_job.main()
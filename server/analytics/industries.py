@@ -0,0 +1,70 @@
+"""
+The industries bills and donors are classified into.
+
+Each industry has keywords, matched as word prefixes in bill titles and
+summaries and in donor names, and well-known organizations, matched in
+donor names. ``classify`` returns every industry a text matches.
+"""
+import re
+from typing import Dict, List, NamedTuple, Tuple
+
+
+class Industry(NamedTuple):
+    keywords: Tuple[str, ...]
+    organizations: Tuple[str, ...]
+
+
+INDUSTRIES: Dict[str, Industry] = {
+    "energy": Industry(
+        ("energy", "oil", "gas", "petroleum", "pipeline", "coal", "fossil fuel", "drilling"),
+        ("ExxonMobil", "Chevron", "Shell", "BP", "ConocoPhillips"),
+    ),
+    "environment": Industry(
+        ("environment", "climate", "renewable", "emission", "conservation", "wildlife", "clean water", "clean air"),
+        ("NextEra Energy", "Vestas", "First Solar", "Orsted", "Siemens Gamesa"),
+    ),
+    "health": Industry(
+        ("health", "medicare", "medicaid", "drug", "pharmaceutical", "hospital", "prescription"),
+        ("Johnson & Johnson", "Pfizer", "Merck", "AbbVie", "Amgen"),
+    ),
+    "defense": Industry(
+        ("defense", "military", "armed forces", "national security", "weapon"),
+        ("Lockheed Martin", "Raytheon", "Boeing Defense", "Northrop Grumman", "General Dynamics"),
+    ),
+    "technology": Industry(
+        ("technology", "internet", "broadband", "cyber", "data privacy", "artificial intelligence", "semiconductor"),
+        ("Google", "Microsoft", "Amazon", "Meta", "Apple"),
+    ),
+    "finance": Industry(
+        ("bank", "financial", "finance", "securities", "credit", "mortgage", "investment"),
+        ("JPMorgan Chase", "Goldman Sachs", "Morgan Stanley", "Citigroup", "Bank of America"),
+    ),
+    "agriculture": Industry(
+        ("agricultur", "farm", "crop", "livestock", "rural", "food"),
+        ("Cargill", "Archer Daniels Midland", "Pilgrim's Pride", "Tyson Foods", "Land O'Lakes"),
+    ),
+    "transportation": Industry(
+        ("transport", "highway", "railroad", "rail", "aviation", "airport", "transit", "infrastructure"),
+        ("Union Pacific", "FedEx", "United Airlines", "Delta Air Lines", "Caterpillar"),
+    ),
+}
+
+INDUSTRY_NAMES: Tuple[str, ...] = tuple(INDUSTRIES)
+
+# Keywords match at the start of a word ("agricultur" matches "agricultural");
+# organization names match as whole words
+_PATTERNS = {
+    name: re.compile(
+        "|".join(
+            [rf"\b{re.escape(keyword)}" for keyword in industry.keywords]
+            + [rf"\b{re.escape(organization)}\b" for organization in industry.organizations]
+        ),
+        re.IGNORECASE,
+    )
+    for name, industry in INDUSTRIES.items()
+}
+
+
+def classify(text: str) -> List[str]:
+    """Return the names of the industries ``text`` mentions, in INDUSTRY_NAMES order."""
+    return [name for name, pattern in _PATTERNS.items() if pattern.search(text)]
@@ -0,0 +1,120 @@
+"""
+Dense members x roll-calls vote matrices.
+
+A roll call is identified by (congress_session, chamber, roll_call_number,
+vote date): roll call numbers restart every session and differ between the
+chambers, and the date guards against numbering collisions in imported data.
+
+Jobs that store results per congress are `SessionJob`s: a module supplies the
+function computing one session, and `SessionJob` selects the sessions and
+provides the refresh loop and the command-line entry point.
+"""
+from itertools import chain
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+from sqlalchemy import Integer, case, cast, func
+from sqlmodel import Session, col, select
+
+from server.models import Bill, Chamber, Vote, VotePosition
+
+# Vote positions as small ints. Abstentions, "Not Voting" and absent members
+# are all 0, so a 0 never counts as agreement or disagreement.
+YES, NO, NOT_VOTING = 1, -1, 0
+
+CHAMBER_CODES = {Chamber.HOUSE: 0, Chamber.SENATE: 1, Chamber.JOINT: 2}
+
+
+class VoteMatrix(NamedTuple):
+    politician_ids: np.ndarray # (members,) sorted politician ids, one per row of `votes`
+    roll_calls: np.ndarray     # (roll calls, 4) int64 rows of (congress_session, chamber code, roll_call_number, day number)
+    votes: np.ndarray          # (members, roll calls) int8 of YES / NO / NOT_VOTING
+
+
+def vote_rows_query(congress_session: Optional[int] = None, chamber: Optional[Chamber] = None):
+    """
+    Select one integer row per vote: (politician_id, congress_session, chamber
+    code, roll_call_number, day number, position code).
+    """
+    query = (
+        select(
+            Vote.politician_id,
+            Bill.congress_session,
+            case(*[(Vote.chamber == chamber_, code) for chamber_, code in CHAMBER_CODES.items()], else_=-1),
+            Vote.roll_call_number,
+            cast(func.julianday(func.date(Vote.vote_date)), Integer),
+            case((Vote.position == VotePosition.YES, YES), (Vote.position == VotePosition.NO, NO), else_=NOT_VOTING),
+        )
+        .join(Bill, col(Bill.id) == Vote.bill_id)
+    )
+    if congress_session is not None:
+        query = query.where(Bill.congress_session == congress_session)
+    if chamber is not None:
+        query = query.where(Vote.chamber == chamber)
+    return query
+
+
+def fetch_int_rows(db: Session, query, width: int) -> np.ndarray:
+    """
+    Run ``query``, whose columns are all integers, into an (n, width) int64 array.
+
+    The rows are flattened straight into ``np.fromiter``. ``np.array`` over the
+    result's Row objects probes each one as a sequence, which is over ten times
+    slower at a million votes.
+    """
+    values = chain.from_iterable(db.execute(query))
+    return np.fromiter(values, dtype=np.int64).reshape(-1, width)
+
+
+def roll_call_keys(roll_calls: np.ndarray) -> np.ndarray:
+    """
+    Pack (congress_session, chamber code, roll_call_number, day number) rows
+    into single int64 keys, which sort and deduplicate far faster than rows.
+    """
+    roll_calls = roll_calls.astype(np.int64, copy=False)
+    # Bit widths: day numbers (Julian days) fit in 22 bits, roll call numbers
+    # in 20, chamber codes in 2 and sessions in the remaining 19.
+    return (((roll_calls[:, 0] << 2 | roll_calls[:, 1]) << 20 | roll_calls[:, 2]) << 22) | roll_calls[:, 3]
+
+
+def build_vote_matrix(rows: np.ndarray) -> VoteMatrix:
+    """Build a VoteMatrix from an (n, 6) array of `vote_rows_query` rows."""
+    rows = rows.reshape(-1, 6)
+    politician_ids, member_index = np.unique(rows[:, 0], return_inverse=True)
+    keys = roll_call_keys(rows[:, 1:5])
+    _, first_seen, roll_call_index = np.unique(keys, return_index=True, return_inverse=True)
+
+    votes = np.zeros((len(politician_ids), len(first_seen)), dtype=np.int8)
+    votes[member_index, roll_call_index] = rows[:, 5]
+    return VoteMatrix(politician_ids, rows[first_seen, 1:5], votes)
+
+
+def load_vote_matrix(
+    db: Session, congress_session: Optional[int] = None, chamber: Optional[Chamber] = None
+) -> VoteMatrix:
+    """Read the votes of one session (or all) and one chamber (or both) into a VoteMatrix."""
+    return build_vote_matrix(fetch_int_rows(db, vote_rows_query(congress_session, chamber), 6))
+
+
+def vote_sessions(db: Session) -> List[int]:
+    """Every congress session with bills, oldest first."""
+    return db.exec(select(Bill.congress_session).distinct().order_by(Bill.congress_session)).all()
+
+
+class SessionJob(NamedTuple):
+    compute: Callable[[Session, int], int] # Recomputes and stores one session; commits and returns the results stored
+    results: str                           # What `compute` counts, for the command-line report
+
+    def refresh(self, db: Session, congress_sessions: Optional[List[int]] = None) -> Dict[int, int]:
+        """Recompute the given sessions (default: every session with bills); returns results stored per session."""
+        if congress_sessions is None:
+            congress_sessions = vote_sessions(db)
+        return {session: self.compute(db, session) for session in congress_sessions}
+
+    def main(self) -> None:
+        """Recompute every session of the configured database and report; the modules' ``__main__`` entry."""
+        from server.database import engine
+
+        with Session(engine) as session:
+            for congress_session, stored in self.refresh(session).items():
+                print(f"Congress {congress_session}: {stored} {self.results}")
@@ -0,0 +1,184 @@
+"""
+Money vs. votes: does industry money go with support for that industry's bills?
+
+For one congress, bills (by title and summary) and donors (by name) are
+classified into the industries of server/analytics/industries.py. Two
+members x industries matrices are then built:
+
+- money: campaign donations received during the congress's election cycle
+  plus gifts reported during its two years, from donors of each industry;
+- support: the share of a member's Yes/No votes on each industry's bills
+  that were Yes, from Yes and No counts summed per member and industry
+  through the bills x industries classification.
+
+Per industry, over the members who voted on its bills, the job stores the
+Pearson correlation between log money and support, and the lift of
+"supports" (support above one half) among funded members over all members.
+
+Run ``python -m server.analytics.money_votes`` to recompute every session.
+"""
+from datetime import date, datetime
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+from sqlalchemy import case, delete, func
+from sqlmodel import Session, col, select
+
+from server.analytics.industries import INDUSTRY_NAMES, classify
+from server.analytics.matrix import NO, NOT_VOTING, YES, SessionJob, fetch_int_rows
+from server.models import Bill, DonationRollup, Gift, MoneyVoteStat, Vote, VotePosition
+
+# Members with fewer Yes/No votes on an industry's bills are left out of its statistics
+MIN_INDUSTRY_VOTES = 3
+
+
+def congress_years(congress_session: int) -> range:
+    """The two calendar years of a congress: the 117th sat in 2021 and 2022."""
+    first = 1787 + 2 * congress_session
+    return range(first, first + 2)
+
+
+def industry_matrix(texts: Iterable[str]) -> np.ndarray:
+    """Classify each text; returns a (texts, industries) 0/1 float matrix."""
+    columns = {name: index for index, name in enumerate(INDUSTRY_NAMES)}
+    texts = list(texts)
+    matrix = np.zeros((len(texts), len(INDUSTRY_NAMES)), dtype=np.float64)
+    for row, text in enumerate(texts):
+        for name in classify(text):
+            matrix[row, columns[name]] = 1
+    return matrix
+
+
+def money_vote_statistics(money: np.ndarray, yes: np.ndarray, no: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Per-industry statistics from (members, industries) matrices of money
+    received and Yes / No vote counts. Statistics that cannot be computed
+    for an industry are NaN.
+    """
+    voted = yes + no
+    counted = voted >= MIN_INDUSTRY_VOTES
+    support = np.divide(yes, voted, out=np.zeros_like(yes, dtype=np.float64), where=voted > 0)
+    funded = money > 0
+    supports = support > 0.5
+
+    members = counted.sum(axis=0)
+    members_funded = (counted & funded).sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # Pearson correlation over the counted members of each industry, as column-wise moments
+        log_money = np.log1p(money)
+        mean_money = (log_money * counted).sum(axis=0) / members
+        mean_support = (support * counted).sum(axis=0) / members
+        money_dev = (log_money - mean_money) * counted
+        support_dev = (support - mean_support) * counted
+        correlation = (money_dev * support_dev).sum(axis=0) / np.sqrt(
+            (money_dev ** 2).sum(axis=0) * (support_dev ** 2).sum(axis=0)
+        )
+
+        support_funded = (support * (counted & funded)).sum(axis=0) / members_funded
+        support_unfunded = (support * (counted & ~funded)).sum(axis=0) / (members - members_funded)
+        share_supporting = (supports & counted).sum(axis=0) / members
+        share_supporting_funded = (supports & counted & funded).sum(axis=0) / members_funded
+        lift = share_supporting_funded / share_supporting
+
+    return {
+        "members_counted": members,
+        "members_funded": members_funded,
+        "total_amount": (money * counted).sum(axis=0),
+        "correlation": correlation,
+        "support_funded": support_funded,
+        "support_unfunded": support_unfunded,
+        "lift": lift,
+    }
+
+
+def _money_matrix(db: Session, congress_session: int, member_rows: Dict[int, int]) -> np.ndarray:
+    """(members, industries) money received from each industry's donors during the congress."""
+    years = congress_years(congress_session)
+    donations = db.execute(
+        select(DonationRollup.recipient_id, DonationRollup.donor_name, func.sum(DonationRollup.total_amount))
+        .where(DonationRollup.cycle == years[-1])
+        .group_by(DonationRollup.recipient_id, DonationRollup.donor_name)
+    ).all()
+    gifts = db.execute(
+        select(Gift.recipient_id, Gift.donor, func.sum(Gift.value))
+        .where(col(Gift.report_date).between(date(years[0], 1, 1), date(years[-1], 12, 31)))
+        .group_by(Gift.recipient_id, Gift.donor)
+    ).all()
+    rows = [row for row in (*donations, *gifts) if row[0] in member_rows]
+
+    # Classify each distinct donor once
+    donors = sorted({row[1] for row in rows})
+    donor_industries = industry_matrix(donors)
+    donor_index = {donor: index for index, donor in enumerate(donors)}
+
+    money = np.zeros((len(member_rows), len(INDUSTRY_NAMES)))
+    if rows:
+        members = np.array([member_rows[row[0]] for row in rows])
+        amounts = np.array([row[2] for row in rows], dtype=np.float64)
+        np.add.at(money, members, donor_industries[[donor_index[row[1]] for row in rows]] * amounts[:, None])
+    return money
+
+
+def compute_money_votes(db: Session, congress_session: int) -> int:
+    """Recompute and store the statistics of one session. Commits; returns the number of industries stored."""
+    bills = db.execute(
+        select(Bill.id, Bill.title, Bill.summary)
+        .where(Bill.congress_session == congress_session)
+        .order_by(col(Bill.id))
+    ).all()
+    bill_industries = industry_matrix(f"{title} {summary or ''}" for _, title, summary in bills)
+    bill_ids = np.array([bill_id for bill_id, _, _ in bills], dtype=np.int64)
+
+    votes = fetch_int_rows(db, (
+        select(
+            Vote.politician_id, Vote.bill_id,
+            case((Vote.position == VotePosition.YES, YES), (Vote.position == VotePosition.NO, NO), else_=NOT_VOTING),
+        )
+        .join(Bill, col(Bill.id) == Vote.bill_id)
+        .where(Bill.congress_session == congress_session)
+    ), 3)
+    politician_ids, members = np.unique(votes[:, 0], return_inverse=True)
+    vote_industries = bill_industries[np.searchsorted(bill_ids, votes[:, 1])]
+
+    # Members x industries Yes and No counts: one weighted bincount per industry
+    yes = np.zeros((len(politician_ids), len(INDUSTRY_NAMES)))
+    no = np.zeros_like(yes)
+    for column in range(len(INDUSTRY_NAMES)):
+        yes[:, column] = np.bincount(members, vote_industries[:, column] * (votes[:, 2] == YES), len(politician_ids))
+        no[:, column] = np.bincount(members, vote_industries[:, column] * (votes[:, 2] == NO), len(politician_ids))
+
+    money = _money_matrix(db, congress_session, {int(i): row for row, i in enumerate(politician_ids)})
+    statistics = money_vote_statistics(money, yes, no)
+    bills_per_industry = bill_industries.sum(axis=0)
+
+    def optional(value: float) -> Optional[float]:
+        return None if np.isnan(value) else float(value)
+
+    computed_at = datetime.utcnow()
+    db.execute(delete(MoneyVoteStat).where(MoneyVoteStat.congress_session == congress_session))
+    stats = [
+        MoneyVoteStat(
+            congress_session=congress_session,
+            industry=industry,
+            bills_classified=int(bills_per_industry[column]),
+            members_counted=int(statistics["members_counted"][column]),
+            members_funded=int(statistics["members_funded"][column]),
+            total_amount=float(statistics["total_amount"][column]),
+            correlation=optional(statistics["correlation"][column]),
+            support_funded=optional(statistics["support_funded"][column]),
+            support_unfunded=optional(statistics["support_unfunded"][column]),
+            lift=optional(statistics["lift"][column]),
+            computed_at=computed_at,
+        )
+        for column, industry in enumerate(INDUSTRY_NAMES)
+    ]
+    db.add_all(stats)
+    db.commit()
+    return len(stats)
+
+
+money_votes_job = SessionJob(compute_money_votes, "industries with statistics")
+
+
+if __name__ == "__main__":
+    money_votes_job.main()
@@ -0,0 +1,103 @@
+"""
+Party-unity scores: how often each member votes with their party's majority.
+
+For every roll call, a party's majority position is Yes or No, whichever
+more of its members voted; ties have no majority position. A member's score
+over a congress is the share of the roll calls they voted Yes/No on, and
+their party took a majority position on, where they voted with it.
+
+Run ``python -m server.analytics.party_unity`` to recompute every session.
+"""
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import delete, text
+from sqlmodel import Session
+
+from server.analytics.matrix import NO, YES, SessionJob, load_vote_matrix
+from server.models import PartyUnityScore
+from server.projections import party_on_date
+
+# Each member's party at their last vote of the session
+_MEMBER_PARTIES_SQL = text(f"""
+    WITH members AS (
+        SELECT v.politician_id, max(date(v.vote_date)) AS last_vote
+        FROM votes AS v JOIN bills AS b ON b.id = v.bill_id
+        WHERE b.congress_session = :congress_session
+        GROUP BY v.politician_id
+    )
+    SELECT m.politician_id, {party_on_date("m.politician_id", "m.last_vote")}
+    FROM members AS m
+""")
+
+
+def member_parties(db: Session, congress_session: int) -> Dict[int, Optional[str]]:
+    """Map each member who voted in the session to their party at their last vote."""
+    return dict(db.execute(_MEMBER_PARTIES_SQL, {"congress_session": congress_session}).all())
+
+
+def party_unity(votes: np.ndarray, party_index: np.ndarray, party_count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Count, for every member, the roll calls that count towards their score and
+    the ones on which they voted with their party's majority.
+
+    ``votes`` is a (members, roll calls) matrix of YES / NO / 0 and
+    ``party_index`` gives each member's party as an int in [0, party_count).
+    """
+    # Per-party Yes and No tallies via one-hot party membership: (parties, roll calls)
+    membership = np.zeros((party_count, len(party_index)), dtype=np.int32)
+    membership[party_index, np.arange(len(party_index))] = 1
+    yes = membership @ (votes == YES).astype(np.int32)
+    no = membership @ (votes == NO).astype(np.int32)
+    majority = np.sign(yes - no).astype(np.int8) # YES, NO, or 0 for a tie
+
+    # Each member's own party's majority position on every roll call
+    member_majority = majority[party_index]
+    counted = (votes != 0) & (member_majority != 0)
+    with_party = counted & (votes == member_majority)
+    return counted.sum(axis=1), with_party.sum(axis=1)
+
+
+def compute_party_unity(db: Session, congress_session: int) -> int:
+    """Recompute and store the scores of one session. Commits; returns the number of scores stored."""
+    matrix = load_vote_matrix(db, congress_session)
+    parties = member_parties(db, congress_session)
+
+    # Members without a known party cannot be scored
+    party_names = sorted({party for party in parties.values() if party})
+    party_codes = {party: code for code, party in enumerate(party_names)}
+    member_codes = np.array(
+        [party_codes.get(parties.get(int(politician_id)), -1) for politician_id in matrix.politician_ids],
+        dtype=np.int64
+    )
+    scored = member_codes >= 0
+
+    counted, with_party = party_unity(matrix.votes[scored], member_codes[scored], len(party_names))
+
+    computed_at = datetime.utcnow()
+    db.execute(delete(PartyUnityScore).where(PartyUnityScore.congress_session == congress_session))
+    scores = [
+        PartyUnityScore(
+            congress_session=congress_session,
+            politician_id=int(politician_id),
+            party_name=party_names[code],
+            votes_counted=int(n_counted),
+            votes_with_party=int(n_with_party),
+            unity_score=float(n_with_party / n_counted),
+            computed_at=computed_at,
+        )
+        for politician_id, code, n_counted, n_with_party
+        in zip(matrix.politician_ids[scored], member_codes[scored], counted, with_party)
+        if n_counted
+    ]
+    db.add_all(scores)
+    db.commit()
+    return len(scores)
+
+
+party_unity_job = SessionJob(compute_party_unity, "party-unity scores")
+
+
+if __name__ == "__main__":
+    party_unity_job.main()
@@ -0,0 +1,190 @@
+"""
+Voting similarity: who votes most like whom.
+
+Two members' agreement rate is the share of the roll calls they both voted
+Yes/No on where they voted the same way. The index keeps, per chamber, two
+members x members count matrices, ``shared`` and ``agree``, so looking up a
+member's closest matches is a single row read plus a top-k selection.
+
+Both matrices are sums over roll calls, which makes them cheap to maintain:
+with the members x roll calls matrix V of YES / NO / 0 codes,
+
+    shared = |V| |V|^T        agree = (shared + V V^T) / 2
+
+and new votes only change the terms of the roll calls they belong to. The
+index remembers the highest vote id it has seen; `SimilarityIndex.refresh`
+subtracts the old terms of every roll call with newer votes and adds their
+new ones. Edited or deleted votes are not picked up that way and need a
+`SimilarityIndex.rebuild`.
+"""
+import threading
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import tuple_
+from sqlmodel import Session, select, func, col
+
+from server.analytics.matrix import (
+    CHAMBER_CODES, build_vote_matrix, fetch_int_rows, roll_call_keys, vote_rows_query, vote_sessions,
+)
+from server.models import Chamber, Vote
+
+# Agreement over a handful of shared roll calls says little
+MIN_SHARED_VOTES = 20
+
+# Roll calls looked up per query when applying new votes
+_ROLL_CALL_BATCH = 500
+
+_CHAMBERS = {code: chamber for chamber, code in CHAMBER_CODES.items()}
+
+
+class SimilarPolitician(NamedTuple):
+    politician_id: int
+    agreement: float # Share of shared roll calls voted the same way
+    shared_votes: int
+
+
+class _ChamberBlock:
+    """The shared / agree count matrices of one chamber's members."""
+
+    def __init__(self):
+        self.positions: Dict[int, int] = {} # politician id -> row
+        self.politician_ids = np.zeros(0, dtype=np.int64)
+        self.shared = np.zeros((0, 0), dtype=np.int32)
+        self.agree = np.zeros((0, 0), dtype=np.int32)
+
+    def rows_for(self, politician_ids: np.ndarray) -> np.ndarray:
+        """Return the rows of ``politician_ids``, growing the matrices for new members."""
+        new_ids = [int(i) for i in politician_ids if int(i) not in self.positions]
+        if new_ids:
+            for politician_id in new_ids:
+                self.positions[politician_id] = len(self.positions)
+            self.politician_ids = np.concatenate([self.politician_ids, np.array(new_ids, dtype=np.int64)])
+            grow = ((0, len(new_ids)), (0, len(new_ids)))
+            self.shared = np.pad(self.shared, grow)
+            self.agree = np.pad(self.agree, grow)
+        return np.array([self.positions[int(i)] for i in politician_ids], dtype=np.int64)
+
+    def own_votes(self, politician_id: int) -> int:
+        """The number of Yes/No votes a member cast, which is their shared count with themselves."""
+        row = self.positions[politician_id]
+        return int(self.shared[row, row])
+
+    def add(self, politician_ids: np.ndarray, votes: np.ndarray, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) the terms of a members x roll calls vote matrix."""
+        rows = self.rows_for(politician_ids)
+        # float32 matmuls go through BLAS and are exact for counts below 2**24
+        voted = np.abs(votes).astype(np.float32)
+        signed = votes.astype(np.float32)
+        shared = voted @ voted.T
+        agree = (shared + signed @ signed.T) / 2
+        block = np.ix_(rows, rows)
+        self.shared[block] += sign * shared.astype(np.int32)
+        self.agree[block] += sign * agree.astype(np.int32)
+
+
+class SimilarityIndex:
+    """Per-chamber agreement counts between every pair of members, kept in memory."""
+
+    def __init__(self):
+        self._blocks: Dict[int, _ChamberBlock] = {}
+        self._watermark = 0 # Highest vote id included
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._blocks = {}
+            self._watermark = 0
+
+    def rebuild(self, db: Session) -> None:
+        """Recompute the index from every vote, one congress at a time."""
+        with self._lock:
+            self._blocks = {}
+            self._watermark = 0
+            self._refresh(db)
+
+    def refresh(self, db: Session) -> None:
+        """Apply any votes recorded since the last refresh; a primary-key lookup when there are none."""
+        with self._lock:
+            self._refresh(db)
+
+    def _refresh(self, db: Session) -> None:
+        latest = db.exec(select(func.max(Vote.id))).one() or 0
+        if latest == self._watermark:
+            return
+        if latest < self._watermark:
+            # Votes were deleted (or the database replaced): start over
+            self._blocks = {}
+            self._watermark = 0
+        if self._watermark == 0:
+            for congress_session in vote_sessions(db):
+                rows = self._rows(db, vote_rows_query(congress_session).where(Vote.id <= latest))
+                self._add_rows(rows, 1)
+        else:
+            self._apply_new_votes(db, latest)
+        self._watermark = latest
+
+    def _apply_new_votes(self, db: Session, latest: int) -> None:
+        new_rows = self._rows(db, vote_rows_query().where(Vote.id > self._watermark, Vote.id <= latest))
+        touched = np.unique(roll_call_keys(new_rows[:, 1:5]))
+        pairs = sorted({(_CHAMBERS[int(chamber)], int(number)) for chamber, number in new_rows[:, [2, 3]]})
+        for start in range(0, len(pairs), _ROLL_CALL_BATCH):
+            batch = pairs[start:start + _ROLL_CALL_BATCH]
+            rows = self._rows(db, vote_rows_query().where(
+                tuple_(Vote.chamber, Vote.roll_call_number).in_(batch), Vote.id <= latest
+            ))
+            # Same chamber and number, but another session or day: not touched
+            rows = rows[np.isin(roll_call_keys(rows[:, 1:5]), touched)]
+            self._add_rows(rows[rows[:, 6] <= self._watermark], -1)
+            self._add_rows(rows, 1)
+
+    @staticmethod
+    def _rows(db: Session, query) -> np.ndarray:
+        """Run a `vote_rows_query`, with the vote id appended as a 7th column."""
+        return fetch_int_rows(db, query.add_columns(Vote.id).order_by(col(Vote.id)), 7)
+
+    def _add_rows(self, rows: np.ndarray, sign: int) -> None:
+        for chamber in np.unique(rows[:, 2]):
+            matrix = build_vote_matrix(rows[rows[:, 2] == chamber, :6])
+            self._blocks.setdefault(int(chamber), _ChamberBlock()).add(matrix.politician_ids, matrix.votes, sign)
+
+    def most_similar(
+        self,
+        politician_id: int,
+        k: int,
+        chamber: Optional[Chamber] = None,
+        min_shared_votes: int = MIN_SHARED_VOTES,
+    ) -> Tuple[Optional[Chamber], List[SimilarPolitician]]:
+        """
+        The ``k`` members of ``chamber`` who most often voted like ``politician_id``,
+        best first. Without a chamber, uses the one the member cast the most votes in.
+        Returns the chamber used (None if the member has no votes) and the matches.
+        """
+        with self._lock:
+            candidates = [
+                (code, block) for code, block in self._blocks.items()
+                if politician_id in block.positions and (chamber is None or CHAMBER_CODES[chamber] == code)
+            ]
+            if not candidates:
+                return chamber, []
+            code, block = max(candidates, key=lambda item: item[1].own_votes(politician_id))
+            row = block.positions[politician_id]
+            shared = block.shared[row]
+            agree = block.agree[row]
+
+            eligible = shared >= min_shared_votes
+            eligible[row] = False
+            others = np.flatnonzero(eligible)
+            rates = agree[others] / shared[others]
+            if len(others) > k:
+                top = np.argpartition(-rates, k - 1)[:k]
+                others, rates = others[top], rates[top]
+            order = np.lexsort((block.politician_ids[others], -shared[others], -rates))
+            return _CHAMBERS[code], [
+                SimilarPolitician(int(block.politician_ids[i]), float(rate), int(shared[i]))
+                for i, rate in zip(others[order], rates[order])
+            ]
+
+
+similarity_index = SimilarityIndex()
+
@@ -0,0 +1,281 @@
+from fastapi import APIRouter, Query, Depends
+from fastapi.responses import ORJSONResponse
+from sqlmodel import SQLModel, Session, select, func, col
+from typing import Dict, List, Optional
+from enum import Enum
+
+from server.models import Politician, PartyUnityScore, IdealPoint, Chamber, DonorTotal, MoneyVoteStat
+from server.projections import ALL_CYCLES
+from server.database import get_session
+from server.analytics.matrix import SessionJob
+from server.analytics.party_unity import party_unity_job
+from server.analytics.ideal_points import ideal_points_job
+from server.analytics.money_votes import money_votes_job
+
+# Every endpoint here reads results precomputed by the batch jobs in
+# server/analytics; the POST endpoints re-run those jobs.
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+
+def _reported_session(db: Session, congress_session: Optional[int], computed_session) -> Optional[int]:
+    """The congress to report on: the requested one, else the latest in the ``computed_session`` column (None if empty)."""
+    if congress_session is None:
+        congress_session = db.exec(select(func.max(computed_session))).one()
+    return congress_session
+
+
+def _add_refresh_route(path: str, name: str, job: SessionJob, response_model, counts_key: str, description: str):
+    """Register ``POST path``, which re-runs ``job`` and reports its counts per session under ``counts_key``."""
+    def refresh(
+        congress_session: Optional[int] = Query(None, description="Congress to recompute (default: all)"),
+        db: Session = Depends(get_session)
+    ):
+        sessions = None if congress_session is None else [congress_session]
+        return ORJSONResponse({counts_key: job.refresh(db, sessions)})
+
+    router.post(path, name=name, response_model=response_model, description=description)(refresh)
+
+# --- Models for the /analytics/party-unity endpoint ---
+
+class ScoreOrder(str, Enum):
+    """Which end of a ranking to list first."""
+    LOWEST = "lowest"
+    HIGHEST = "highest"
+
+class PartyUnityPublic(SQLModel):
+    politician_id: int
+    full_name: str
+    party_name: str
+    unity_score: float # Share of counted roll calls on which the member voted with their party's majority
+    votes_counted: int
+    votes_with_party: int
+
+class PartyUnityResponse(SQLModel):
+    congress_session: Optional[int] # None when no scores have been computed yet
+    results: List[PartyUnityPublic]
+
+class PartyUnityRefreshResponse(SQLModel):
+    scores_per_session: Dict[int, int] # congress_session -> number of scores stored
+
+# --- Models for the /analytics/ideal-points endpoint ---
+
+class IdealPointPublic(SQLModel):
+    politician_id: int
+    full_name: str
+    chamber: Chamber
+    party_name: Optional[str]
+    dim1: float # Main ideological dimension, in [-1, 1]; Republicans on the positive side
+    dim2: float
+    votes_scaled: int # Yes/No votes the placement is based on
+
+class IdealPointsResponse(SQLModel):
+    congress_session: Optional[int] # None when no ideal points have been computed yet
+    results: List[IdealPointPublic] # Ordered by chamber, then dim1
+
+class IdealPointsRefreshResponse(SQLModel):
+    members_per_session: Dict[int, int] # congress_session -> number of members placed
+
+# --- Models for the /analytics/top-donors endpoint ---
+
+class TopDonorPublic(SQLModel):
+    donor_name: str
+    donor_type: str
+    donor_id: Optional[int] # The resolved donor, once server/donors.py has run
+    total_amount: float
+    donation_count: int
+
+class TopDonorsResponse(SQLModel):
+    cycle: Optional[int] # The election cycle ranked; None for all cycles
+    results: List[TopDonorPublic] # Largest first
+
+# --- Models for the /analytics/money-votes endpoint ---
+
+class MoneyVoteStatPublic(SQLModel):
+    industry: str
+    bills_classified: int # Bills of the congress about this industry
+    members_counted: int # Members with enough Yes/No votes on those bills
+    members_funded: int # ... of whom received money from the industry's donors
+    total_amount: float
+    correlation: Optional[float] # Of log(1 + money) and share of Yes votes, across members; None if undefined
+    support_funded: Optional[float] # Mean share of Yes votes among funded members
+    support_unfunded: Optional[float]
+    lift: Optional[float] # P(mostly Yes | funded) / P(mostly Yes)
+
+class MoneyVotesResponse(SQLModel):
+    congress_session: Optional[int] # None when no statistics have been computed yet
+    results: List[MoneyVoteStatPublic] # Ordered by industry
+
+class MoneyVotesRefreshResponse(SQLModel):
+    industries_per_session: Dict[int, int] # congress_session -> number of industries stored
+
+
+@router.get("/party-unity", response_model=PartyUnityResponse)
+def get_party_unity(
+    congress_session: Optional[int] = Query(None, description="Congress to report on (default: the latest with scores)"),
+    party: Optional[str] = Query(None, description="Filter by party (case-insensitive)"),
+    order: ScoreOrder = Query(ScoreOrder.LOWEST, description="List the least or the most loyal members first"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of members to return"),
+    db: Session = Depends(get_session)
+):
+    """
+    Party-unity scores for every member of a congress.
+    """
+    congress_session = _reported_session(db, congress_session, PartyUnityScore.congress_session)
+    if congress_session is None:
+        return ORJSONResponse({"congress_session": None, "results": []})
+
+    query = (
+        select(
+            PartyUnityScore.politician_id, Politician.first_name, Politician.last_name,
+            PartyUnityScore.party_name, PartyUnityScore.unity_score,
+            PartyUnityScore.votes_counted, PartyUnityScore.votes_with_party,
+        )
+        .join(Politician, col(Politician.id) == PartyUnityScore.politician_id)
+        .where(PartyUnityScore.congress_session == congress_session)
+    )
+    if party:
+        query = query.where(func.lower(PartyUnityScore.party_name) == party.lower())
+    if order == ScoreOrder.LOWEST:
+        query = query.order_by(col(PartyUnityScore.unity_score).asc(), col(PartyUnityScore.politician_id).asc())
+    else:
+        query = query.order_by(col(PartyUnityScore.unity_score).desc(), col(PartyUnityScore.politician_id).asc())
+
+    return ORJSONResponse({
+        "congress_session": congress_session,
+        "results": [
+            {
+                "politician_id": row.politician_id,
+                "full_name": f"{row.first_name} {row.last_name}",
+                "party_name": row.party_name,
+                "unity_score": row.unity_score,
+                "votes_counted": row.votes_counted,
+                "votes_with_party": row.votes_with_party,
+            }
+            for row in db.exec(query.limit(limit))
+        ],
+    })
+
+
+_add_refresh_route(
+    "/party-unity/refresh", "refresh_party_unity_scores", party_unity_job, PartyUnityRefreshResponse, "scores_per_session",
+    "Recompute party-unity scores from the vote record.",
+)
+
+
+@router.get("/ideal-points", response_model=IdealPointsResponse)
+def get_ideal_points(
+    congress_session: Optional[int] = Query(None, description="Congress to report on (default: the latest with ideal points)"),
+    chamber: Optional[Chamber] = Query(None, description="Only include members of this chamber"),
+    party: Optional[str] = Query(None, description="Filter by party (case-insensitive)"),
+    db: Session = Depends(get_session)
+):
+    """
+    Two-dimensional ideological placement of every member of a congress.
+    """
+    congress_session = _reported_session(db, congress_session, IdealPoint.congress_session)
+    if congress_session is None:
+        return ORJSONResponse({"congress_session": None, "results": []})
+
+    query = (
+        select(
+            IdealPoint.politician_id, Politician.first_name, Politician.last_name, IdealPoint.chamber,
+            IdealPoint.party_name, IdealPoint.dim1, IdealPoint.dim2, IdealPoint.votes_scaled,
+        )
+        .join(Politician, col(Politician.id) == IdealPoint.politician_id)
+        .where(IdealPoint.congress_session == congress_session)
+        .order_by(col(IdealPoint.chamber), col(IdealPoint.dim1), col(IdealPoint.politician_id))
+    )
+    if chamber is not None:
+        query = query.where(IdealPoint.chamber == chamber)
+    if party:
+        query = query.where(func.lower(IdealPoint.party_name) == party.lower())
+
+    return ORJSONResponse({
+        "congress_session": congress_session,
+        "results": [
+            {
+                "politician_id": row.politician_id,
+                "full_name": f"{row.first_name} {row.last_name}",
+                "chamber": row.chamber,
+                "party_name": row.party_name,
+                "dim1": row.dim1,
+                "dim2": row.dim2,
+                "votes_scaled": row.votes_scaled,
+            }
+            for row in db.exec(query)
+        ],
+    })
+
+
+_add_refresh_route(
+    "/ideal-points/refresh", "refresh_ideal_point_scores", ideal_points_job, IdealPointsRefreshResponse, "members_per_session",
+    "Recompute ideal points from the vote record.",
+)
+
+
+@router.get("/top-donors", response_model=TopDonorsResponse)
+def get_top_donors(
+    cycle: Optional[int] = Query(None, description="Election cycle (even year) to rank (default: all cycles)"),
+    donor_type: Optional[str] = Query(None, description="Only rank donors of this type, e.g. PAC"),
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of donors to return"),
+    db: Session = Depends(get_session)
+):
+    """
+    The largest campaign donors across all recipients, from the trigger-maintained donor totals.
+    """
+    query = (
+        select(
+            DonorTotal.donor_name, DonorTotal.donor_type, DonorTotal.donor_id,
+            DonorTotal.total_amount, DonorTotal.donation_count,
+        )
+        .where(DonorTotal.cycle == (ALL_CYCLES if cycle is None else cycle))
+        .order_by(col(DonorTotal.total_amount).desc(), col(DonorTotal.donor_name))
+        .limit(limit)
+    )
+    if donor_type:
+        query = query.where(DonorTotal.donor_type == donor_type)
+
+    return ORJSONResponse({
+        "cycle": cycle,
+        "results": [
+            {
+                "donor_name": row.donor_name,
+                "donor_type": row.donor_type,
+                "donor_id": row.donor_id,
+                "total_amount": round(row.total_amount, 2),
+                "donation_count": row.donation_count,
+            }
+            for row in db.exec(query)
+        ],
+    })
+
+
+@router.get("/money-votes", response_model=MoneyVotesResponse)
+def get_money_votes(
+    congress_session: Optional[int] = Query(None, description="Congress to report on (default: the latest with statistics)"),
+    db: Session = Depends(get_session)
+):
+    """
+    How industry money received lines up with votes on that industry's bills, per industry.
+    """
+    congress_session = _reported_session(db, congress_session, MoneyVoteStat.congress_session)
+    if congress_session is None:
+        return ORJSONResponse({"congress_session": None, "results": []})
+
+    query = (
+        select(MoneyVoteStat)
+        .where(MoneyVoteStat.congress_session == congress_session)
+        .order_by(col(MoneyVoteStat.industry))
+    )
+    return ORJSONResponse({
+        "congress_session": congress_session,
+        "results": [
+            stat.model_dump(exclude={"congress_session", "computed_at"}) for stat in db.exec(query)
+        ],
+    })
+
+
+_add_refresh_route(
+    "/money-votes/refresh", "refresh_money_vote_stats", money_votes_job, MoneyVotesRefreshResponse, "industries_per_session",
+    "Recompute the money-vs-votes statistics from bills, votes, donations and gifts.",
+)
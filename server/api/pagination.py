@@ -0,0 +1,43 @@
+"""
+Helpers for opaque, keyset-style pagination cursors.
+
+A cursor is the sort key of the last row on a page, JSON-encoded and wrapped in
+URL-safe base64 so clients treat it as an opaque token.
+"""
+import base64
+import json
+from typing import Any, List, Tuple, Type, Union
+
+from fastapi import HTTPException
+
+# The type a cursor value must have, or a tuple of the types it may have
+CursorType = Union[Type, Tuple[Type, ...]]
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort key of the last row on a page into an opaque cursor."""
+    payload = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: CursorType) -> List[Any]:
+    """
+    Decode a cursor produced by :func:`encode_cursor`, whose values must have
+    the given ``types``, in order (e.g. ``decode_cursor(cursor, str, int)``).
+
+    Cursors come from clients, so anything else (malformed, a different number
+    of values, or a value of the wrong type) is a 400 error rather than a value
+    handed on to the query.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor.")
+    if not isinstance(values, list) or len(values) != len(types):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor.")
+    for value, expected in zip(values, types):
+        # JSON true and false decode to bools, which are ints to isinstance
+        if isinstance(value, bool) or not isinstance(value, expected):
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor.")
+    return values
@@ -1,9 +1,19 @@
-from fastapi import APIRouter, Query, Depends, HTTPException
-from sqlmodel import Session, select, or_, func, col
-from sqlalchemy.orm import selectinload
-from typing import List, Optional
-from datetime import datetime, timedelta
+from fastapi import APIRouter, Query, Depends, Header, HTTPException, Response
+from fastapi.responses import ORJSONResponse
+from sqlmodel import Field, SQLModel, Session, select, func, col
+from sqlalchemy import String, and_, literal, or_, tuple_, type_coerce, union_all
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import aliased, load_only, selectinload
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+from datetime import date, datetime, time, timedelta
+from enum import Enum
+import hashlib
+import logging
 import math
+import os
+
+import numpy as np
+import orjson
 
 # --- Import all the new, enhanced models ---
 from server.models import (
@@ -17,12 +27,35 @@ from server.models import (
     Committee,
     CampaignDonation,
     FinancialDisclosure,
-    Source
+    Source,
+    Chamber,
+    PoliticianCurrentStatus,
+    DataHealthIssue,
+    DonationRollup,
+    RollCall,
+    RollCallPartyTally
 )
 from server.database import get_session
+from server.search import rank_politicians, candidates_truncated, fuzzy_match_politicians, name_suggester
+from server.api.pagination import encode_cursor, decode_cursor
+from server.data_health import ISSUE_FIELDS, latest_run, refresh_data_issues
+from server.donors import resolve_donors
+from server.cache import VersionedCache, politician_version
+from server.analytics.similarity import MIN_SHARED_VOTES, similarity_index
+from server.analytics.downsample import lttb
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Handlers that touch the database are plain `def` functions: FastAPI runs them
+# in its bounded worker thread pool (sized in server/database.py), so a slow
+# query never blocks the event loop. Only handlers that do no I/O are `async`.
+#
+# List-shaped handlers select only the columns they need and return plain
+# dicts through ORJSONResponse, skipping per-row ORM and model construction.
+# Their `response_model` still documents the JSON shape, which must not change.
+
 # --- Models for the /search endpoint ---
 
 class PoliticianSearchResult(SQLModel):
@@ -32,9 +65,21 @@ class PoliticianSearchResult(SQLModel):
     current_party: Optional[str] = None
     current_position_title: Optional[str] = None
     jurisdiction: Optional[str] = None
+    score: Optional[float] = None # Search relevance, higher is better (search results only)
 
 class SearchResponse(SQLModel):
     results: List[PoliticianSearchResult]
+    next_cursor: Optional[str] = None # Pass back as `cursor` to fetch the next page
+    # True when the term matched more bills or committees than are ranked; refine it to see the rest
+    candidates_truncated: bool = False
+
+class NameSuggestion(SQLModel):
+    """A single autocomplete suggestion for a politician's name."""
+    id: int
+    full_name: str
+
+class SuggestResponse(SQLModel):
+    results: List[NameSuggestion]
 
 # --- Models for the GET /politicians endpoint (List View) ---
 
@@ -45,13 +90,21 @@ class PoliticianSortBy(str, Enum):
     FIRST_NAME_ASC = "first_name_asc"
     FIRST_NAME_DESC = "first_name_desc"
 
+class TotalMode(str, Enum):
+    """How the total row count of a list is computed."""
+    EXACT = "exact"       # Counted, or cached while no process has written the counted tables since
+    ESTIMATE = "estimate" # Last known count, possibly from before recent writes
+    NONE = "none"         # Skip counting entirely
+
 class PaginatedPoliticianResponse(SQLModel):
     """Wrapper model for returning a paginated list of politicians."""
-    total: int
-    page: int
+    total: Optional[int] # None when total=none
+    total_is_estimate: bool = False
+    page: Optional[int] # None when paging by cursor
     size: int
-    pages: int
+    pages: Optional[int] # None when total=none
     results: List[PoliticianSearchResult]
+    next_cursor: Optional[str] = None # Pass back as `cursor` to fetch the next page in constant time
 
 
 # --- Models for Create/Update Endpoints ---
@@ -136,10 +189,16 @@ class CommitteeMembershipPublic(SQLModel):
     committee: CommitteeDetailPublic # Nested details of the committee itself
 
 class PoliticianFullDetails(SQLModel):
-    """The complete, detailed public profile of a politician."""
+    """
+    The complete, detailed public profile of a politician.
+
+    Everything but `id` is optional because callers can trim the profile with
+    `fields=` and `include=`; fields that were not requested are left out of
+    the response entirely rather than sent as null.
+    """
     id: int
-    first_name: str
-    last_name: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
     date_of_birth: Optional[str] = None
     biography: Optional[str] = None
     official_website_url: Optional[str] = None
@@ -148,21 +207,442 @@ class PoliticianFullDetails(SQLModel):
     source: Optional[SourcePublic] = None 
     
     # Normalized Career History
-    positions: List[PoliticalPositionPublic]
-    party_affiliations: List[PartyAffiliationPublic]
-    committee_memberships: List[CommitteeMembershipPublic]
-    
-    # Legislative Activity
-    votes: List[VotePublic]
+    positions: Optional[List[PoliticalPositionPublic]] = None
+    party_affiliations: Optional[List[PartyAffiliationPublic]] = None
+    committee_memberships: Optional[List[CommitteeMembershipPublic]] = None
     
+    # Legislative Activity (most recent first; the full lists live at /politicians/{id}/votes etc.)
+    votes: Optional[List[VotePublic]] = None
+    vote_count: Optional[int] = None
+
     # Financial and Ethics Data
-    gifts_received: List[GiftPublic]
-    campaign_donations: List[CampaignDonationPublic]
-    financial_disclosures: List[FinancialDisclosurePublic]
-    
+    gifts_received: Optional[List[GiftPublic]] = None
+    gift_count: Optional[int] = None
+    campaign_donations: Optional[List[CampaignDonationPublic]] = None
+    donation_count: Optional[int] = None
+    financial_disclosures: Optional[List[FinancialDisclosurePublic]] = None
+    disclosure_count: Optional[int] = None
+
     # Add other public links
     # social_media_accounts: List[SocialMediaAccountPublic] # (If defined)
 
+# --- Models for the /politicians/{id}/timeline endpoint ---
+
+class TimelineEvent(SQLModel):
+    """One dated entry in a politician's timeline."""
+    kind: str   # position, party_affiliation, committee_membership, vote, gift, donation or disclosure
+    date: str   # When it happened; the start date for positions, affiliations and memberships
+    ref_id: int # Id of the underlying record
+    data: Union[
+        PoliticalPositionPublic, PartyAffiliationPublic, CommitteeMembershipPublic, VotePublic,
+        GiftPublic, CampaignDonationPublic, FinancialDisclosurePublic
+    ] # The record itself, in the same form as in the full profile
+
+class TimelinePage(SQLModel):
+    results: List[TimelineEvent] # Newest first
+    next_cursor: Optional[str] = None # Pass back as `cursor` to fetch the next (older) page
+
+# --- Models for the POST /politicians/batch endpoint ---
+
+# How many of each collection a profile embeds by default
+DETAIL_PREVIEW_SIZE = 10
+
+# A batch response is built in memory, so its size is bounded instead: at
+# most MAX_BATCH_SIZE profiles embedding MAX_BATCH_PREVIEW items of each of
+# their four collections, about as many rows as one page of each collection.
+# Longer histories are read through the paginated collection endpoints.
+MAX_BATCH_SIZE = 25
+MAX_BATCH_PREVIEW = 20
+
+class PoliticianBatchRequest(SQLModel):
+    """Which politicians to fetch, and which parts of their profiles."""
+    ids: List[int] = Field(min_length=1, max_length=MAX_BATCH_SIZE) # Repeated ids are fetched once
+    include: Optional[List[str]] = None # Sections to include, as for GET /politicians/{id}; default all
+    fields: Optional[List[str]] = None  # Profile fields to include; default all
+    preview: int = Field(DETAIL_PREVIEW_SIZE, ge=0, le=MAX_BATCH_PREVIEW) # How many of the most recent votes, gifts, donations and disclosures to embed
+
+class PoliticianBatchResponse(SQLModel):
+    results: List[PoliticianFullDetails] # In the order the ids were requested
+    not_found: List[int]
+
+# --- Models for the /politicians/{id}/votes, /gifts, /donations and /disclosures endpoints ---
+
+class VotePage(SQLModel):
+    results: List[VotePublic]
+    next_cursor: Optional[str] = None # Pass back as `cursor` to fetch the next page
+
+class GiftPage(SQLModel):
+    results: List[GiftPublic]
+    next_cursor: Optional[str] = None
+
+class CampaignDonationPage(SQLModel):
+    results: List[CampaignDonationPublic]
+    next_cursor: Optional[str] = None
+
+class FinancialDisclosurePage(SQLModel):
+    results: List[FinancialDisclosurePublic]
+    next_cursor: Optional[str] = None
+
+# --- Models for the /politicians/{id}/similar endpoint ---
+
+class SimilarPoliticianPublic(SQLModel):
+    politician_id: int
+    full_name: str
+    agreement: float # Share of the roll calls both voted Yes/No on where they voted the same way
+    shared_votes: int
+
+class SimilarPoliticiansResponse(SQLModel):
+    chamber: Optional[Chamber] # The chamber compared in; None if the politician has no votes
+    results: List[SimilarPoliticianPublic] # Most similar first
+
+# --- Models for the /politicians/{id}/donations/summary endpoint ---
+
+class DonationTotal(SQLModel):
+    total_amount: float
+    donation_count: int
+
+class CycleDonationTotal(DonationTotal):
+    cycle: int # Two-year election cycle, named for its (even) election year
+
+class DonorTypeDonationTotal(DonationTotal):
+    donor_type: str
+    share: float # Of the total amount
+
+class MonthDonationTotal(DonationTotal):
+    month: str # "YYYY-MM"
+
+class DonorDonationTotal(DonationTotal):
+    donor_name: str
+    donor_type: str
+    donor_id: Optional[int] # The resolved donor, once server/donors.py has run
+
+class DonationSummary(DonationTotal):
+    cycle: Optional[int] # The cycle summarized; None for all cycles
+    by_cycle: List[CycleDonationTotal] # Every cycle, oldest first, whichever cycle is summarized
+    by_donor_type: List[DonorTypeDonationTotal] # Largest first
+    by_month: List[MonthDonationTotal] # Oldest first
+    top_donors: List[DonorDonationTotal] # Largest first
+
+# --- Models for the /politicians/{id}/financials/series endpoint ---
+
+class SeriesBucket(str, Enum):
+    DAY = "day"
+    WEEK = "week"   # Weeks start on Monday
+    MONTH = "month"
+
+class FinancialSeriesPoint(SQLModel):
+    date: date # Start of the bucket
+    total: float
+    count: int
+
+class FinancialSeriesLine(SQLModel):
+    points: List[FinancialSeriesPoint] # Oldest first; buckets with nothing in them are left out
+    buckets: int # Non-empty buckets before downsampling; more than len(points) when downsampled
+
+class FinancialSeries(SQLModel):
+    bucket: SeriesBucket
+    donations: FinancialSeriesLine # Campaign donation amounts
+    gifts: FinancialSeriesLine     # Reported gift values
+
+# --- Models for the /bills/{id}/roll-calls endpoint ---
+
+class PartyTallyPublic(SQLModel):
+    party_name: str # Members' party on the day of the vote; "Unknown" if none is recorded
+    yes_count: int
+    no_count: int
+    abstain_count: int
+    not_voting_count: int
+
+class RollCallPublic(SQLModel):
+    chamber: Chamber
+    roll_call_number: int
+    vote_date: date
+    yes_count: int
+    no_count: int
+    abstain_count: int
+    not_voting_count: int
+    passed: bool # More Yes than No votes; supermajority requirements are not taken into account
+    parties: List[PartyTallyPublic] # By party name
+
+class BillRollCallsResponse(SQLModel):
+    bill_id: int
+    bill_number: str
+    title: str
+    results: List[RollCallPublic] # Oldest first
+
+# --- Summary helpers ---
+
+# Filtered list totals keyed by (party, jurisdiction); the filters read the
+# current-status projection, which changes with these tables.
+_politician_counts: VersionedCache[int] = VersionedCache(
+    tables=("politicians", "political_positions", "party_affiliations")
+)
+
+# Sort column and direction for each list ordering
+_POLITICIAN_SORT_COLUMNS = {
+    PoliticianSortBy.LAST_NAME_ASC: (Politician.last_name, False),
+    PoliticianSortBy.LAST_NAME_DESC: (Politician.last_name, True),
+    PoliticianSortBy.FIRST_NAME_ASC: (Politician.first_name, False),
+    PoliticianSortBy.FIRST_NAME_DESC: (Politician.first_name, True),
+}
+
+def _summary_query():
+    """Select the columns of a politician summary, reading current status from its projection."""
+    return (
+        select(
+            Politician.id,
+            Politician.first_name,
+            Politician.last_name,
+            PoliticianCurrentStatus.party_name,
+            PoliticianCurrentStatus.position_title,
+            PoliticianCurrentStatus.jurisdiction,
+        )
+        .outerjoin(PoliticianCurrentStatus, col(PoliticianCurrentStatus.politician_id) == Politician.id)
+    )
+
+def _summary_json(row, score: Optional[float] = None) -> dict:
+    """The JSON object of a `PoliticianSearchResult`, built straight from a `_summary_query` row."""
+    return {
+        "id": row.id,
+        "full_name": f"{row.first_name} {row.last_name}",
+        "current_party": row.party_name or "N/A",
+        "current_position_title": row.position_title or "N/A",
+        "jurisdiction": row.jurisdiction or "N/A",
+        "score": score,
+    }
+
+# --- Collection helpers (votes, gifts, donations, disclosures) ---
+
+# Memory budget for cached serialized profiles, in bytes
+PROFILE_CACHE_BYTES = int(os.getenv("PROFILE_CACHE_BYTES", str(64 * 1024 * 1024)))
+
+class _Collection(NamedTuple):
+    """How to list one of a politician's date-ordered collections."""
+    query: Callable[[], Any]        # Builds the SELECT of the columns each item needs
+    owner: Any                      # Column holding the politician's id
+    date: Any                       # Column the list is ordered and filtered by
+    id: Any                         # Tie-breaker, so every item has a unique position
+    is_datetime: bool               # Whether `date` stores a datetime rather than a date
+    to_json: Callable[[Any], dict]  # Builds the JSON object of one row (the shape of its *Public model)
+
+_VOTES = _Collection(
+    query=lambda: (
+        select(Vote.id, Vote.vote_date, Vote.position, Bill.bill_number, Bill.title)
+        .join(Bill, col(Bill.id) == Vote.bill_id)
+    ),
+    owner=Vote.politician_id,
+    date=Vote.vote_date,
+    id=Vote.id,
+    is_datetime=True,
+    to_json=lambda row: {
+        "vote_date": row.vote_date,
+        "position": row.position,
+        "bill_number": row.bill_number,
+        "bill_title": row.title,
+    },
+)
+_GIFTS = _Collection(
+    query=lambda: select(Gift.id, Gift.description, Gift.value, Gift.report_date, Gift.donor),
+    owner=Gift.recipient_id,
+    date=Gift.report_date,
+    id=Gift.id,
+    is_datetime=False,
+    to_json=lambda row: {
+        "description": row.description,
+        "value": row.value,
+        "report_date": row.report_date,
+        "donor": row.donor,
+    },
+)
+_DONATIONS = _Collection(
+    query=lambda: select(
+        CampaignDonation.id, CampaignDonation.donor_name, CampaignDonation.donor_type,
+        CampaignDonation.amount, CampaignDonation.date
+    ),
+    owner=CampaignDonation.recipient_id,
+    date=CampaignDonation.date,
+    id=CampaignDonation.id,
+    is_datetime=False,
+    to_json=lambda row: {
+        "donor_name": row.donor_name,
+        "donor_type": row.donor_type,
+        "amount": row.amount,
+        "date": row.date,
+    },
+)
+_DISCLOSURES = _Collection(
+    query=lambda: select(
+        FinancialDisclosure.id, FinancialDisclosure.report_year,
+        FinancialDisclosure.filing_date, FinancialDisclosure.document_url
+    ),
+    owner=FinancialDisclosure.politician_id,
+    date=FinancialDisclosure.filing_date,
+    id=FinancialDisclosure.id,
+    is_datetime=False,
+    to_json=lambda row: {
+        "report_year": row.report_year,
+        "filing_date": row.filing_date,
+        "document_url": row.document_url,
+    },
+)
+
+# Career history, in the same form, for the timeline
+_POSITIONS = _Collection(
+    query=lambda: select(
+        PoliticalPosition.id, PoliticalPosition.title, PoliticalPosition.jurisdiction,
+        PoliticalPosition.start_date, PoliticalPosition.end_date, PoliticalPosition.is_current
+    ),
+    owner=PoliticalPosition.politician_id,
+    date=PoliticalPosition.start_date,
+    id=PoliticalPosition.id,
+    is_datetime=False,
+    to_json=lambda row: {
+        "title": row.title,
+        "jurisdiction": row.jurisdiction,
+        "start_date": row.start_date,
+        "end_date": row.end_date,
+        "is_current": row.is_current,
+    },
+)
+_PARTY_AFFILIATIONS = _Collection(
+    query=lambda: select(
+        PartyAffiliation.id, PartyAffiliation.party_name, PartyAffiliation.start_date, PartyAffiliation.end_date
+    ),
+    owner=PartyAffiliation.politician_id,
+    date=PartyAffiliation.start_date,
+    id=PartyAffiliation.id,
+    is_datetime=False,
+    to_json=lambda row: {
+        "party_name": row.party_name,
+        "start_date": row.start_date,
+        "end_date": row.end_date,
+    },
+)
+_COMMITTEE_MEMBERSHIPS = _Collection(
+    query=lambda: (
+        select(
+            CommitteeMembership.id, CommitteeMembership.role, CommitteeMembership.start_date,
+            CommitteeMembership.end_date, Committee.name, Committee.chamber
+        )
+        .join(Committee, col(Committee.id) == CommitteeMembership.committee_id)
+    ),
+    owner=CommitteeMembership.politician_id,
+    date=CommitteeMembership.start_date,
+    id=CommitteeMembership.id,
+    is_datetime=False,
+    to_json=lambda row: {
+        "role": row.role,
+        "start_date": row.start_date,
+        "end_date": row.end_date,
+        "committee": {"name": row.name, "chamber": row.chamber},
+    },
+)
+
+def _collection_page(
+    db: Session,
+    collection: _Collection,
+    politician_id: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> Tuple[list, Optional[str]]:
+    """
+    Return one page of a politician's collection, newest first, and the cursor of the next page.
+
+    Ordering, the inclusive date window and the keyset seek all run in SQL on
+    the (politician, date) index, so a page costs the same at any depth.
+    """
+    query = collection.query().where(collection.owner == politician_id)
+
+    if start_date:
+        lower = datetime.combine(start_date, time.min) if collection.is_datetime else start_date
+        query = query.where(collection.date >= lower)
+    if end_date:
+        if collection.is_datetime:
+            query = query.where(collection.date < datetime.combine(end_date + timedelta(days=1), time.min))
+        else:
+            query = query.where(collection.date <= end_date)
+
+    if cursor:
+        last_date, last_id = decode_cursor(cursor, str, int)
+        try:
+            last_date = (datetime if collection.is_datetime else date).fromisoformat(last_date)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor.")
+        query = query.where(tuple_(collection.date, collection.id) < (last_date, last_id))
+
+    # Fetch one extra row to learn whether another page exists
+    query = query.order_by(col(collection.date).desc(), col(collection.id).desc()).limit(limit + 1)
+    rows = db.exec(query).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_row = rows[-1]
+        next_cursor = encode_cursor(getattr(last_row, collection.date.key).isoformat(), last_row.id)
+    return [collection.to_json(row) for row in rows], next_cursor
+
+def _collection_previews(
+    db: Session, collection: _Collection, politician_ids: List[int], limit: int
+) -> Dict[int, List[dict]]:
+    """
+    The ``limit`` newest items of a collection for each of several politicians, in one query.
+
+    Each politician is joined to its own newest item ids through a correlated
+    LIMIT subquery, so only ``limit`` index entries are read per politician
+    however long their history is.
+    """
+    owner = aliased(Politician)
+    newest = (
+        select(collection.id)
+        .where(collection.owner == owner.id)
+        .order_by(col(collection.date).desc(), col(collection.id).desc())
+        .limit(limit)
+        .correlate(owner)
+    )
+    query = (
+        collection.query()
+        .add_columns(owner.id.label("owner_id"))
+        .join(owner, col(collection.id).in_(newest))
+        .where(col(owner.id).in_(politician_ids))
+        .order_by(owner.id, col(collection.date).desc(), col(collection.id).desc())
+    )
+    previews: Dict[int, List[dict]] = {politician_id: [] for politician_id in politician_ids}
+    for row in db.exec(query):
+        previews[row.owner_id].append(collection.to_json(row))
+    return previews
+
+def _collection_counts(db: Session, collection: _Collection, politician_ids: List[int]) -> Dict[int, int]:
+    """Count the items of a collection for each of several politicians, in one query."""
+    query = (
+        select(collection.owner, func.count())
+        .where(col(collection.owner).in_(politician_ids))
+        .group_by(collection.owner)
+    )
+    counts = {politician_id: 0 for politician_id in politician_ids}
+    counts.update(db.exec(query).all())
+    return counts
+
+def _require_politician(db: Session, politician_id: int) -> None:
+    if db.get(Politician, politician_id) is None:
+        raise HTTPException(status_code=404, detail="Politician not found")
+
+class CollectionPageParams:
+    """Query parameters shared by the per-politician collection endpoints."""
+
+    def __init__(
+        self,
+        limit: int = Query(50, ge=1, le=500, description="Maximum number of items to return"),
+        cursor: Optional[str] = Query(None, description="Opaque cursor from a previous response's next_cursor"),
+        start_date: Optional[date] = Query(None, description="Only include items on or after this date"),
+        end_date: Optional[date] = Query(None, description="Only include items on or before this date"),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.start_date = start_date
+        self.end_date = end_date
+
 @router.get("/health/db")
 def test_db_session(db: Session = Depends(get_session)):
     """Health check endpoint to verify database session injection."""
@@ -174,142 +654,172 @@ def test_db_session(db: Session = Depends(get_session)):
 
 
 @router.get("/search", response_model=SearchResponse)
-async def search(
+def search(
     q: str = Query(..., min_length=1, max_length=100, pattern=r"^[a-zA-Z0-9 \\'-.]{1,100}$", description="Alphanumeric search term"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of results to return"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous response's next_cursor"),
     db: Session = Depends(get_session)
 ):
     """
     Search for politicians by name, bill titles they voted on, or committees they serve on.
+
+    Matching runs against the FTS5 search index and results are ordered by relevance.
+    Only one page of `limit` results is ranked and loaded per request; follow
+    `next_cursor` to continue. When nothing matches exactly, a single page of
+    similarly spelled names is returned instead (e.g. "Shumer" finds "Schumer").
+
+    Only the most relevant bills and committees a term matches are expanded to
+    the members who voted on or sit on them; `candidates_truncated` is true
+    when a term matched more than that.
     """
+    after = tuple(decode_cursor(cursor, (int, float), int)) if cursor else None
     try:
-        search_term = f"%{q.lower()}%" # Prepare for LIKE query
-
-        # This query is more complex as it searches across multiple relationships
-        query = (
-            select(Politician)
-            .distinct()
-            .where(
-                or_(
-                    # Search by first, last, or full name
-                    func.lower(Politician.first_name).like(search_term),
-                    func.lower(Politician.last_name).like(search_term),
-                    func.lower(Politician.first_name + ' ' + Politician.last_name).like(search_term),
-                    
-                    # Search by the title of bills they voted on
-                    Politician.votes.any(
-                        Vote.bill.has(func.lower(Bill.title).like(search_term))
-                    ),
-                    
-                    # Search by the name of committees they are a member of
-                    Politician.committee_memberships.any(
-                        CommitteeMembership.committee.has(func.lower(Committee.name).like(search_term))
-                    )
-                )
-            )
-            # Eagerly load the relationships needed for the summary view
-            .options(
-                selectinload(Politician.positions),
-                selectinload(Politician.party_affiliations)
-            )
-            .order_by(Politician.last_name)
-        )
-        
-        politicians = db.exec(query).all()
-        
-        # Process results into the Pydantic response model
-        results_list = []
-        for p in politicians:
-            current_pos = next((pos for pos in p.positions if pos.is_current), None)
-            current_party = next((party for party in p.party_affiliations if party.end_date is None), None)
-
-            results_list.append(
-                PoliticianSearchResult(
-                    id=p.id,
-                    full_name=f"{p.first_name} {p.last_name}",
-                    current_party=current_party.party_name if current_party else "N/A",
-                    current_position_title=current_pos.title if current_pos else "N/A",
-                    jurisdiction=current_pos.jurisdiction if current_pos else "N/A"
-                )
-            )
+        # Fetch one extra row to learn whether another page exists
+        ranked = rank_politicians(db, q, limit=limit + 1, after=after)
+        next_cursor = None
+        if len(ranked) > limit:
+            ranked = ranked[:limit]
+            last_id, last_score = ranked[-1]
+            next_cursor = encode_cursor(last_score, last_id)
+        # bm25 scores are negative with lower being better; flip them for display
+        ranked = [(politician_id, round(-score, 4)) for politician_id, score in ranked]
+        truncated = candidates_truncated(db, q)
 
-        return SearchResponse(results=results_list)
+        if not ranked and after is None:
+            ranked = [
+                (politician_id, round(similarity, 4))
+                for politician_id, similarity in fuzzy_match_politicians(db, q, limit=limit)
+            ]
+        if not ranked:
+            return ORJSONResponse({"results": [], "next_cursor": None, "candidates_truncated": truncated})
 
-    except Exception as e:
-        print(f"Search Error: {e}") # For debugging
+        query = _summary_query().where(col(Politician.id).in_([politician_id for politician_id, _ in ranked]))
+        rows_by_id = {row.id: row for row in db.exec(query).all()}
+
+        # Serialize the rows directly in the SearchResponse shape, keeping the ranked order.
+        # A politician deleted since the index was read has no row and is skipped.
+        results_list = [
+            _summary_json(rows_by_id[politician_id], score)
+            for politician_id, score in ranked if politician_id in rows_by_id
+        ]
+
+        return ORJSONResponse({"results": results_list, "next_cursor": next_cursor, "candidates_truncated": truncated})
+
+    except SQLAlchemyError:
+        logger.exception("Search for %r failed", q)
         raise HTTPException(status_code=500, detail="Internal server error occurred during search.")
 
+@router.get("/search/suggest", response_model=SuggestResponse)
+async def suggest_names(
+    prefix: str = Query(..., min_length=1, max_length=100, description="Beginning of a first, middle or last name"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of suggestions to return")
+):
+    """
+    Autocomplete politician names as the user types.
+
+    Served entirely from the in-memory name index, so it never queries the database.
+    """
+    return SuggestResponse(
+        results=[
+            NameSuggestion(id=politician_id, full_name=full_name)
+            for politician_id, full_name in name_suggester.suggest(prefix, limit)
+        ]
+    )
+
 @router.get("/politicians", response_model=PaginatedPoliticianResponse)
-async def get_politicians(
+def get_politicians(
     db: Session = Depends(get_session),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Page size"),
     sort_by: Optional[PoliticianSortBy] = Query(PoliticianSortBy.LAST_NAME_ASC, description="Sort order"),
     party: Optional[str] = Query(None, description="Filter by current political party (case-insensitive)"),
-    jurisdiction: Optional[str] = Query(None, description="Filter by current jurisdiction (case-insensitive)")
+    jurisdiction: Optional[str] = Query(None, description="Filter by current jurisdiction (case-insensitive)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous response's next_cursor; overrides page"),
+    total: TotalMode = Query(TotalMode.EXACT, description="How to compute the total: exact, estimate or none")
 ):
     """
     Get a paginated list of politicians, with options for sorting and filtering.
+
+    Pages can be addressed by number (`page`) or by following `next_cursor`.
+    Cursor pages seek directly to the last row seen via the (sort column, id)
+    index, so fetching any page costs the same no matter how deep it is.
+
+    Totals are cached per (party, jurisdiction) filter and invalidated by any
+    write to the counted tables, whichever process made it.
+    High-traffic clients can pass `total=estimate` to accept a possibly stale
+    cached count, or `total=none` to skip counting.
     """
-    base_query = select(Politician)
+    base_query = _summary_query()
     
-    # Apply filters by joining to related tables
+    # Apply filters against the current-status projection (one row per politician)
     if party:
-        base_query = base_query.join(PartyAffiliation).where(
-            func.lower(PartyAffiliation.party_name) == party.lower(), 
-            PartyAffiliation.end_date == None
-        ).distinct()
+        base_query = base_query.where(PoliticianCurrentStatus.party_key == party.lower())
 
     if jurisdiction:
-        base_query = base_query.join(PoliticalPosition).where(
-            func.lower(PoliticalPosition.jurisdiction) == jurisdiction.lower(),
-            PoliticalPosition.is_current == True
-        ).distinct()
+        base_query = base_query.where(PoliticianCurrentStatus.jurisdiction_key == jurisdiction.lower())
 
     # Get total count for pagination metadata, using the filtered query as a subquery
-    count_query = select(func.count()).select_from(base_query.subquery())
-    total_count = db.exec(count_query).one()
-
-    # Apply sorting
-    if sort_by == PoliticianSortBy.LAST_NAME_ASC:
-        order_clause = col(Politician.last_name).asc()
-    elif sort_by == PoliticianSortBy.LAST_NAME_DESC:
-        order_clause = col(Politician.last_name).desc()
-    elif sort_by == PoliticianSortBy.FIRST_NAME_ASC:
-        order_clause = col(Politician.first_name).asc()
-    else: # PoliticianSortBy.FIRST_NAME_DESC
-        order_clause = col(Politician.first_name).desc()
-
-    # Apply pagination and eager loading
-    offset = (page - 1) * size
-    paginated_query = base_query.order_by(order_clause).offset(offset).limit(size).options(
-        selectinload(Politician.positions),
-        selectinload(Politician.party_affiliations)
-    )
+    total_count, total_is_estimate = None, False
+    if total != TotalMode.NONE:
+        count_key = (party.lower() if party else None, jurisdiction.lower() if jurisdiction else None)
+        # Taken before counting, so a write that lands mid-count marks the entry stale
+        version = _politician_counts.version(db)
+        cached = _politician_counts.get(count_key, version)
+        if cached is not None and (cached[1] or total == TotalMode.ESTIMATE):
+            total_count, is_current = cached
+            total_is_estimate = not is_current
+        else:
+            count_query = select(func.count()).select_from(base_query.subquery())
+            total_count = db.exec(count_query).one()
+            _politician_counts.put(count_key, total_count, version)
+
+    # Apply sorting; id breaks ties so that every row has a unique position
+    sort_column, descending = _POLITICIAN_SORT_COLUMNS[sort_by]
+    sort_key = tuple_(sort_column, Politician.id)
+    if descending:
+        paginated_query = base_query.order_by(col(sort_column).desc(), col(Politician.id).desc())
+    else:
+        paginated_query = base_query.order_by(col(sort_column).asc(), col(Politician.id).asc())
+
+    # Apply pagination, fetching one extra row to learn whether another page exists
+    if cursor:
+        cursor_sort, last_value, last_id = decode_cursor(cursor, str, str, int)
+        if cursor_sort != sort_by.value:
+            raise HTTPException(status_code=400, detail="Cursor was issued for a different sort order.")
+        after = (last_value, last_id)
+        paginated_query = paginated_query.where(sort_key < after if descending else sort_key > after)
+    else:
+        paginated_query = paginated_query.offset((page - 1) * size)
     
-    politicians = db.exec(paginated_query).all()
+    rows = db.exec(paginated_query.limit(size + 1)).all()
+
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        last_row = rows[-1]
+        next_cursor = encode_cursor(sort_by.value, getattr(last_row, sort_column.key), last_row.id)
     
-    # Process results into the summary response model
-    results_list = [
-        PoliticianSearchResult(
-            id=p.id,
-            full_name=f"{p.first_name} {p.last_name}",
-            current_party=next((pa.party_name for pa in p.party_affiliations if pa.end_date is None), "N/A"),
-            current_position_title=next((pos.title for pos in p.positions if pos.is_current), "N/A"),
-            jurisdiction=next((pos.jurisdiction for pos in p.positions if pos.is_current), "N/A")
-        ) for p in politicians
-    ]
+    # Serialize the rows directly in the summary response shape
+    results_list = [_summary_json(row) for row in rows]
 
-    return PaginatedPoliticianResponse(
-        total=total_count,
-        page=page,
-        size=size,
-        pages=math.ceil(total_count / size) if total_count > 0 else 0,
-        results=results_list
-    )
+    if total_count is None:
+        pages = None
+    else:
+        pages = math.ceil(total_count / size) if total_count > 0 else 0
+
+    return ORJSONResponse({
+        "total": total_count,
+        "total_is_estimate": total_is_estimate,
+        "page": None if cursor else page,
+        "size": size,
+        "pages": pages,
+        "results": results_list,
+        "next_cursor": next_cursor,
+    })
 
 
 @router.post("/politicians", response_model=PoliticianPublic, status_code=201)
-async def create_politician(
+def create_politician(
     politician_data: PoliticianCreate,
     db: Session = Depends(get_session)
 ):
@@ -332,11 +842,12 @@ async def create_politician(
     db.add(db_politician)
     db.commit()
     db.refresh(db_politician)
+    name_suggester.upsert(db_politician)
     return db_politician
 
 
 @router.patch("/politicians/{politician_id}", response_model=PoliticianPublic)
-async def update_politician(
+def update_politician(
     politician_id: int,
     politician_update_data: PoliticianUpdate,
     db: Session = Depends(get_session)
@@ -358,119 +869,616 @@ async def update_politician(
     db.add(db_politician)
     db.commit()
     db.refresh(db_politician)
+    name_suggester.upsert(db_politician)
     return db_politician
 
-@router.get("/politicians/{politician_id}", response_model=PoliticianFullDetails)
-async def get_politician_details(politician_id: int, db: Session = Depends(get_session)):
+# Scalar profile fields selectable with `fields=`
+_DETAIL_FIELDS = ("first_name", "last_name", "date_of_birth", "biography", "official_website_url")
+
+# Sections selectable with `include=`. Relationship sections are eager-loaded
+# with the profile; collection sections are read as a newest-first preview
+# plus a count, reported under the given field.
+_DETAIL_RELATIONSHIPS = {
+    "source": lambda: selectinload(Politician.source),
+    "positions": lambda: selectinload(Politician.positions),
+    "party_affiliations": lambda: selectinload(Politician.party_affiliations),
+    "committee_memberships": lambda: selectinload(Politician.committee_memberships).selectinload(CommitteeMembership.committee),
+}
+_DETAIL_COLLECTIONS = {
+    "votes": (_VOTES, "vote_count"),
+    "gifts_received": (_GIFTS, "gift_count"),
+    "campaign_donations": (_DONATIONS, "donation_count"),
+    "financial_disclosures": (_DISCLOSURES, "disclosure_count"),
+}
+_DETAIL_SECTIONS = (*_DETAIL_RELATIONSHIPS, *_DETAIL_COLLECTIONS)
+
+def _parse_name_list(value: Optional[str], allowed: Tuple[str, ...], parameter: str) -> Tuple[str, ...]:
+    """Parse a comma-separated list of names, defaulting to everything in ``allowed``."""
+    if value is None:
+        return allowed
+    names = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = names.difference(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown {parameter} value(s): {', '.join(sorted(unknown))}. Choose from: {', '.join(allowed)}."
+        )
+    return tuple(name for name in allowed if name in names)
+
+def _serialize_relationship(politician: Politician, section: str):
+    """Convert one eager-loaded relationship section into the JSON shape of its *Public model."""
+    if section == "source":
+        return {
+            "name": politician.source.name,
+            "url": politician.source.url,
+            "retrieval_date": politician.source.retrieval_date
+        } if politician.source else None
+    if section == "positions":
+        return [
+            {
+                "title": pos.title,
+                "jurisdiction": pos.jurisdiction,
+                "start_date": pos.start_date,
+                "end_date": pos.end_date,
+                "is_current": pos.is_current
+            } for pos in sorted(politician.positions, key=lambda x: x.start_date, reverse=True)
+        ]
+    if section == "party_affiliations":
+        return [
+            {
+                "party_name": pa.party_name,
+                "start_date": pa.start_date,
+                "end_date": pa.end_date
+            } for pa in sorted(politician.party_affiliations, key=lambda x: x.start_date, reverse=True)
+        ]
+    if section == "committee_memberships":
+        return [
+            {
+                "role": cm.role,
+                "start_date": cm.start_date,
+                "end_date": cm.end_date,
+                "committee": {
+                    "name": cm.committee.name,
+                    "chamber": cm.committee.chamber
+                }
+            } for cm in sorted(politician.committee_memberships, key=lambda x: x.start_date, reverse=True)
+        ]
+    raise ValueError(f"Unknown relationship section: {section}")
+
+def _build_politician_profiles(
+    db: Session,
+    politician_ids: List[int],
+    sections: Tuple[str, ...],
+    field_names: Tuple[str, ...],
+    preview: int,
+) -> Dict[int, dict]:
     """
-    Retrieve the full, detailed record for a single politician by their ID.
+    Build the JSON objects of several politicians' profiles (the shape of
+    `PoliticianFullDetails`) with only the requested sections and fields.
+
+    Every relationship and collection is loaded with one IN-query shared by
+    the whole id set, so the number of queries does not grow with the number
+    of politicians. Ids that do not exist are left out of the result.
     """
-    # Use selectinload to eagerly load related data and avoid the N+1 query problem.
-    # This fetches the politician and all related items in a few efficient queries.
+    # Load only the requested columns, and eager-load only the requested
+    # relationships with selectinload to avoid the N+1 query problem.
+    columns = [getattr(Politician, name) for name in field_names]
+    if "source" in sections:
+        columns.append(Politician.source_id)
     query = (
         select(Politician)
-        .where(col(Politician.id) == politician_id)
-        .options(
-            selectinload(Politician.source),
-            selectinload(Politician.positions),
-            selectinload(Politician.party_affiliations),
-            selectinload(Politician.gifts_received).selectinload(Gift.source),
-            selectinload(Politician.votes).selectinload(Vote.bill),
-            selectinload(Politician.committee_memberships).selectinload(CommitteeMembership.committee),
-            selectinload(Politician.campaign_donations),
-            selectinload(Politician.financial_disclosures),
-        )
+        .where(col(Politician.id).in_(politician_ids))
+        .options(load_only(Politician.id, *columns))
+        .options(*[_DETAIL_RELATIONSHIPS[section]() for section in sections if section in _DETAIL_RELATIONSHIPS])
     )
     
-    politician = db.exec(query).first()
-    
-    if not politician:
+    politicians = db.exec(query).all()
+    if not politicians:
+        return {}
+
+    # Manually construct the detailed responses as plain JSON data; orjson
+    # formats dates and enums itself, so no model objects are built per item.
+    profiles = {}
+    for politician in politicians:
+        response_data = {"id": politician.id}
+        for name in field_names:
+            response_data[name] = getattr(politician, name)
+        for section in sections:
+            if section in _DETAIL_RELATIONSHIPS:
+                response_data[section] = _serialize_relationship(politician, section)
+        profiles[politician.id] = response_data
+
+    # The large collections are read newest-first straight from their indexes,
+    # skipping the preview query for politicians with nothing to show
+    found_ids = list(profiles)
+    for section in sections:
+        if section not in _DETAIL_COLLECTIONS:
+            continue
+        collection, count_field = _DETAIL_COLLECTIONS[section]
+        counts = _collection_counts(db, collection, found_ids)
+        with_items = [politician_id for politician_id in found_ids if counts[politician_id]]
+        previews = _collection_previews(db, collection, with_items, preview) if with_items and preview else {}
+        for politician_id, response_data in profiles.items():
+            response_data[section] = previews.get(politician_id, [])
+            response_data[count_field] = counts[politician_id]
+
+    return profiles
+
+class _CachedProfile(NamedTuple):
+    etag: str
+    body: bytes
+
+# Serialized profiles keyed by (id, sections, fields, preview). An entry is
+# current while the politician's version (see cache.politician_version) is
+# unchanged, so writes for other politicians leave it alone. Bounded by the
+# total size of the cached bodies.
+_profile_cache: VersionedCache[_CachedProfile] = VersionedCache(
+    max_entries=10_000,
+    max_size=PROFILE_CACHE_BYTES,
+    sizeof=lambda profile: len(profile.body),
+)
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value matches ``etag``."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    opaque_tag = etag.removeprefix("W/")
+    return opaque_tag in (candidate.strip().removeprefix("W/") for candidate in if_none_match.split(","))
+
+@router.get(
+    "/politicians/{politician_id}",
+    response_model=PoliticianFullDetails,
+    response_model_exclude_unset=True
+)
+def get_politician_details(
+    politician_id: int,
+    include: Optional[str] = Query(None, description=f"Comma-separated sections to include (default all): {', '.join(_DETAIL_SECTIONS)}"),
+    fields: Optional[str] = Query(None, description=f"Comma-separated profile fields to include (default all): {', '.join(_DETAIL_FIELDS)}"),
+    preview: int = Query(DETAIL_PREVIEW_SIZE, ge=0, le=100, description="How many of the most recent votes, gifts, donations and disclosures to embed"),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_session)
+):
+    """
+    Retrieve the full, detailed record for a single politician by their ID.
+
+    Votes, gifts, donations and disclosures can run into the tens of thousands,
+    so only the `preview` most recent of each are embedded, alongside their
+    total counts. Page through the rest with /politicians/{id}/votes, /gifts,
+    /donations and /disclosures.
+
+    `include=` and `fields=` trim the profile to what the caller needs, e.g.
+    `?include=positions,party_affiliations&fields=first_name,last_name`.
+    Sections that are not included are never queried.
+
+    Serialized profiles are cached in memory. Every response carries a weak
+    `ETag`, since the same tag covers the gzip and uncompressed encodings of a
+    profile; clients that send it back in `If-None-Match` get `304 Not Modified`
+    while the profile is unchanged.
+    """
+    sections = _parse_name_list(include, _DETAIL_SECTIONS, "include")
+    field_names = _parse_name_list(fields, _DETAIL_FIELDS, "fields")
+
+    # Take the version before reading, so a write that lands mid-build marks the entry stale
+    version = politician_version(db, politician_id)
+    if version is None:
         raise HTTPException(status_code=404, detail="Politician not found")
 
-    # Manually construct the detailed response model. This gives us full control
-    # over formatting (like converting dates to strings).
-    response_data = PoliticianFullDetails(
-        # --- Basic Information ---
-        id=politician.id,
-        first_name=politician.first_name,
-        last_name=politician.last_name,
-        date_of_birth=politician.date_of_birth.isoformat() if politician.date_of_birth else None,
-        biography=politician.biography,
-        official_website_url=politician.official_website_url,
-        
-        # --- Auditing/Source Information ---
-        source=SourcePublic(
-            name=politician.source.name,
-            url=politician.source.url,
-            retrieval_date=politician.source.retrieval_date.isoformat()
-        ) if politician.source else None,
-
-        # --- Career History ---
-        positions=[
-            PoliticalPositionPublic(
-                title=pos.title,
-                jurisdiction=pos.jurisdiction,
-                start_date=pos.start_date.isoformat(),
-                end_date=pos.end_date.isoformat() if pos.end_date else None,
-                is_current=pos.is_current
-            ) for pos in sorted(politician.positions, key=lambda x: x.start_date, reverse=True)
-        ],
-        party_affiliations=[
-            PartyAffiliationPublic(
-                party_name=pa.party_name,
-                start_date=pa.start_date.isoformat(),
-                end_date=pa.end_date.isoformat() if pa.end_date else None
-            ) for pa in sorted(politician.party_affiliations, key=lambda x: x.start_date, reverse=True)
+    key = (politician_id, sections, field_names, preview)
+    cached = _profile_cache.get(key, tuple(version))
+    if cached is not None and cached[1]:
+        profile = cached[0]
+    else:
+        details = _build_politician_profiles(db, [politician_id], sections, field_names, preview)
+        if not details:
+            raise HTTPException(status_code=404, detail="Politician not found")
+        body = orjson.dumps(details[politician_id])
+        profile = _CachedProfile(f'W/"{hashlib.sha256(body).hexdigest()[:32]}"', body)
+        _profile_cache.put(key, profile, tuple(version))
+
+    headers = {"ETag": profile.etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, profile.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=profile.body, media_type="application/json", headers=headers)
+
+@router.post(
+    "/politicians/batch",
+    response_model=PoliticianBatchResponse,
+    response_model_exclude_unset=True
+)
+def get_politicians_batch(
+    batch: PoliticianBatchRequest,
+    db: Session = Depends(get_session)
+):
+    """
+    Fetch the profiles of several politicians in one request.
+
+    Takes the same `include`, `fields` and `preview` options as
+    GET /politicians/{id}, for up to 25 politicians and with `preview` at
+    most 20. Each relationship is loaded with a single IN-query
+    shared by all requested politicians. Unknown ids are listed in `not_found`.
+    """
+    ids = list(dict.fromkeys(batch.ids)) # De-duplicate, keeping the requested order
+
+    sections = _parse_name_list(
+        None if batch.include is None else ",".join(batch.include), _DETAIL_SECTIONS, "include"
+    )
+    field_names = _parse_name_list(
+        None if batch.fields is None else ",".join(batch.fields), _DETAIL_FIELDS, "fields"
+    )
+    profiles = _build_politician_profiles(db, ids, sections, field_names, batch.preview)
+
+    return ORJSONResponse({
+        "results": [profiles[politician_id] for politician_id in ids if politician_id in profiles],
+        "not_found": [politician_id for politician_id in ids if politician_id not in profiles],
+    })
+
+# Timeline event kinds and the collection each is drawn from
+_TIMELINE_SOURCES = {
+    "position": _POSITIONS,
+    "party_affiliation": _PARTY_AFFILIATIONS,
+    "committee_membership": _COMMITTEE_MEMBERSHIPS,
+    "vote": _VOTES,
+    "gift": _GIFTS,
+    "donation": _DONATIONS,
+    "disclosure": _DISCLOSURES,
+}
+
+def _timeline_keys(
+    kind: str,
+    collection: _Collection,
+    politician_id: int,
+    limit: int,
+    after: Optional[Tuple[str, str, int]],
+    start_date: Optional[date],
+    end_date: Optional[date],
+):
+    """
+    The newest ``limit`` (event_date, kind, ref_id) keys of one kind that sort
+    after the cursor key ``after``, as one input of the timeline merge.
+    """
+    # Dates are compared and returned as stored, so dates and datetimes interleave correctly
+    event_date = type_coerce(collection.date, String)
+    query = (
+        select(literal(kind).label("kind"), event_date.label("event_date"), collection.id.label("ref_id"))
+        .where(collection.owner == politician_id)
+    )
+    if start_date:
+        query = query.where(event_date >= start_date.isoformat())
+    if end_date:
+        query = query.where(event_date < (end_date + timedelta(days=1)).isoformat())
+    if after:
+        # The timeline is ordered by (event_date, kind, ref_id) descending. With
+        # the kind fixed per input, the cursor reduces to a condition on this
+        # table's (date, id) index.
+        last_date, last_kind, last_id = after
+        if kind < last_kind:
+            query = query.where(event_date <= last_date)
+        elif kind == last_kind:
+            query = query.where(or_(event_date < last_date, and_(event_date == last_date, collection.id < last_id)))
+        else:
+            query = query.where(event_date < last_date)
+    return query.order_by(col(collection.date).desc(), col(collection.id).desc()).limit(limit).subquery()
+
+@router.get("/politicians/{politician_id}/timeline", response_model=TimelinePage)
+def get_politician_timeline(
+    politician_id: int,
+    kinds: Optional[str] = Query(None, description=f"Comma-separated event kinds to include (default all): {', '.join(_TIMELINE_SOURCES)}"),
+    page: CollectionPageParams = Depends(),
+    db: Session = Depends(get_session)
+):
+    """
+    A politician's positions, party changes, committee terms, votes, gifts,
+    donations and disclosures as one stream of events, newest first.
+
+    The database merges the event tables: each contributes at most one page of
+    its newest events (read from its (politician, date) index), and the union
+    of those short lists is sorted. A page therefore costs the same however
+    long the career is. Use `start_date`/`end_date` to load only a window.
+    """
+    _require_politician(db, politician_id)
+    selected = _parse_name_list(kinds, tuple(_TIMELINE_SOURCES), "kinds")
+    if not selected:
+        return ORJSONResponse({"results": [], "next_cursor": None})
+
+    after = None
+    if page.cursor:
+        last_date, last_kind, last_id = decode_cursor(page.cursor, str, str, int)
+        if last_kind not in _TIMELINE_SOURCES:
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor.")
+        after = (last_date, last_kind, last_id)
+
+    # Fetch one extra row to learn whether another page exists
+    inputs = [
+        _timeline_keys(kind, _TIMELINE_SOURCES[kind], politician_id, page.limit + 1, after, page.start_date, page.end_date)
+        for kind in selected
+    ]
+    merged = union_all(*[select(*keys.c) for keys in inputs]).subquery()
+    query = (
+        select(merged.c.kind, merged.c.event_date, merged.c.ref_id)
+        .order_by(merged.c.event_date.desc(), merged.c.kind.desc(), merged.c.ref_id.desc())
+        .limit(page.limit + 1)
+    )
+    keys = db.exec(query).all()
+
+    next_cursor = None
+    if len(keys) > page.limit:
+        keys = keys[:page.limit]
+        next_cursor = encode_cursor(keys[-1].event_date, keys[-1].kind, keys[-1].ref_id)
+
+    # Load the records behind the page's events, one query per kind present
+    ids_by_kind: Dict[str, List[int]] = {}
+    for key in keys:
+        ids_by_kind.setdefault(key.kind, []).append(key.ref_id)
+    records = {}
+    for kind, ids in ids_by_kind.items():
+        collection = _TIMELINE_SOURCES[kind]
+        for row in db.exec(collection.query().where(col(collection.id).in_(ids))):
+            records[kind, row.id] = collection.to_json(row)
+
+    return ORJSONResponse({
+        "results": [
+            {"kind": key.kind, "date": key.event_date[:10], "ref_id": key.ref_id, "data": records[key.kind, key.ref_id]}
+            for key in keys
         ],
-        
-        # --- Legislative Activity ---
-        committee_memberships=[
-            CommitteeMembershipPublic(
-                role=cm.role,
-                start_date=cm.start_date.isoformat(),
-                end_date=cm.end_date.isoformat() if cm.end_date else None,
-                committee=CommitteeDetailPublic(
-                    name=cm.committee.name,
-                    chamber=cm.committee.chamber.value
-                )
-            ) for cm in sorted(politician.committee_memberships, key=lambda x: x.start_date, reverse=True)
+        "next_cursor": next_cursor,
+    })
+
+@router.get("/politicians/{politician_id}/votes", response_model=VotePage)
+def get_politician_votes(
+    politician_id: int,
+    page: CollectionPageParams = Depends(),
+    db: Session = Depends(get_session)
+):
+    """
+    List a politician's votes, most recent first, optionally within a date range.
+    """
+    _require_politician(db, politician_id)
+    results, next_cursor = _collection_page(
+        db, _VOTES, politician_id, page.limit, page.cursor, page.start_date, page.end_date
+    )
+    return ORJSONResponse({"results": results, "next_cursor": next_cursor})
+
+@router.get("/politicians/{politician_id}/gifts", response_model=GiftPage)
+def get_politician_gifts(
+    politician_id: int,
+    page: CollectionPageParams = Depends(),
+    db: Session = Depends(get_session)
+):
+    """
+    List the gifts a politician has reported, most recent first, optionally within a date range.
+    """
+    _require_politician(db, politician_id)
+    results, next_cursor = _collection_page(
+        db, _GIFTS, politician_id, page.limit, page.cursor, page.start_date, page.end_date
+    )
+    return ORJSONResponse({"results": results, "next_cursor": next_cursor})
+
+@router.get("/politicians/{politician_id}/donations", response_model=CampaignDonationPage)
+def get_politician_donations(
+    politician_id: int,
+    page: CollectionPageParams = Depends(),
+    db: Session = Depends(get_session)
+):
+    """
+    List the campaign donations a politician has received, most recent first, optionally within a date range.
+    """
+    _require_politician(db, politician_id)
+    results, next_cursor = _collection_page(
+        db, _DONATIONS, politician_id, page.limit, page.cursor, page.start_date, page.end_date
+    )
+    return ORJSONResponse({"results": results, "next_cursor": next_cursor})
+
+@router.get("/politicians/{politician_id}/donations/summary", response_model=DonationSummary)
+def get_politician_donation_summary(
+    politician_id: int,
+    cycle: Optional[int] = Query(None, description="Election cycle (even year) to summarize (default: all cycles)"),
+    top: int = Query(10, ge=1, le=100, description="Number of top donors to list"),
+    db: Session = Depends(get_session)
+):
+    """
+    Totals of the campaign donations a politician has received, by cycle, donor type, month and donor.
+    """
+    _require_politician(db, politician_id)
+    # Everything is read from the trigger-maintained rollups, never from campaign_donations
+    amount = func.sum(DonationRollup.total_amount)
+    count = func.sum(DonationRollup.donation_count)
+    recipient = DonationRollup.recipient_id == politician_id
+    summarized = and_(recipient, DonationRollup.cycle == cycle) if cycle is not None else recipient
+
+    def totals(row) -> dict:
+        return {"total_amount": round(row[-2], 2), "donation_count": row[-1]}
+
+    by_cycle = db.execute(
+        select(DonationRollup.cycle, amount, count).where(recipient)
+        .group_by(DonationRollup.cycle).order_by(DonationRollup.cycle)
+    ).all()
+    by_donor_type = db.execute(
+        select(DonationRollup.donor_type, amount, count).where(summarized)
+        .group_by(DonationRollup.donor_type).order_by(amount.desc(), DonationRollup.donor_type)
+    ).all()
+    by_month = db.execute(
+        select(DonationRollup.month, amount, count).where(summarized)
+        .group_by(DonationRollup.month).order_by(DonationRollup.month)
+    ).all()
+    top_donors = db.execute(
+        select(DonationRollup.donor_name, DonationRollup.donor_type, func.max(DonationRollup.donor_id), amount, count)
+        .where(summarized)
+        .group_by(DonationRollup.donor_name, DonationRollup.donor_type)
+        .order_by(amount.desc(), DonationRollup.donor_name).limit(top)
+    ).all()
+
+    total_amount = sum(row[1] for row in by_donor_type)
+    return ORJSONResponse({
+        "cycle": cycle,
+        "total_amount": round(total_amount, 2),
+        "donation_count": sum(row[2] for row in by_donor_type),
+        "by_cycle": [{"cycle": row[0], **totals(row)} for row in by_cycle],
+        "by_donor_type": [
+            {"donor_type": row[0], **totals(row), "share": row[1] / total_amount if total_amount else 0.0}
+            for row in by_donor_type
         ],
-        votes=[
-            VotePublic(
-                vote_date=v.vote_date.isoformat(),
-                position=v.position.value, # Access enum value
-                bill_number=v.bill.bill_number,
-                bill_title=v.bill.title
-            ) for v in sorted(politician.votes, key=lambda x: x.vote_date, reverse=True)
+        "by_month": [{"month": row[0], **totals(row)} for row in by_month],
+        "top_donors": [
+            {"donor_name": row[0], "donor_type": row[1], "donor_id": row[2], **totals(row)} for row in top_donors
         ],
+    })
 
-        # --- Financial and Ethics Data ---
-        gifts_received=[
-            GiftPublic(
-                description=g.description,
-                value=g.value,
-                report_date=g.report_date.isoformat(),
-                donor=g.donor
-            ) for g in sorted(politician.gifts_received, key=lambda x: x.report_date, reverse=True)
-        ],
-        campaign_donations=[
-            CampaignDonationPublic(
-                donor_name=cd.donor_name,
-                donor_type=cd.donor_type,
-                amount=cd.amount,
-                date=cd.date.isoformat()
-            ) for cd in sorted(politician.campaign_donations, key=lambda x: x.date, reverse=True)
+# SQL for the first day of the bucket holding a date column, as "YYYY-MM-DD"
+_SERIES_BUCKET_STARTS: Dict[SeriesBucket, Callable[[Any], Any]] = {
+    SeriesBucket.DAY: lambda column: func.date(column),
+    SeriesBucket.WEEK: lambda column: func.date(column, "-6 days", "weekday 1"),
+    SeriesBucket.MONTH: lambda column: func.strftime("%Y-%m-01", column),
+}
+
+def _financial_series_line(db: Session, owner, day, value, politician_id: int, bucket: SeriesBucket, points: int) -> dict:
+    """Bucket a politician's amounts in SQL and downsample the buckets to at most ``points``."""
+    start = _SERIES_BUCKET_STARTS[bucket](day)
+    rows = db.execute(
+        select(start, func.sum(value), func.count())
+        .where(owner == politician_id)
+        .group_by(start)
+        .order_by(start)
+    ).all()
+    kept = range(len(rows))
+    if len(rows) > points:
+        days = np.array([date.fromisoformat(row[0]).toordinal() for row in rows])
+        kept = lttb(days, np.array([row[1] for row in rows]), points)
+    return {
+        "points": [
+            {"date": rows[i][0], "total": round(rows[i][1], 2), "count": rows[i][2]}
+            for i in kept
         ],
-        financial_disclosures=[
-            FinancialDisclosurePublic(
-                report_year=fd.report_year,
-                filing_date=fd.filing_date.isoformat(),
-                document_url=fd.document_url
-            ) for fd in sorted(politician.financial_disclosures, key=lambda x: x.filing_date, reverse=True)
-        ]
+        "buckets": len(rows),
+    }
+
+@router.get("/politicians/{politician_id}/financials/series", response_model=FinancialSeries)
+def get_politician_financial_series(
+    politician_id: int,
+    bucket: SeriesBucket = Query(SeriesBucket.MONTH, description="Length of the buckets amounts are summed over"),
+    points: int = Query(200, ge=3, le=2000, description="Maximum number of points per series; longer series are downsampled"),
+    db: Session = Depends(get_session)
+):
+    """
+    Donation and gift totals over time for charts.
+
+    Series with more buckets than `points` are downsampled with
+    Largest-Triangle-Three-Buckets, which keeps the peaks and dips of the
+    series; the points kept still hold their bucket's own total.
+    """
+    _require_politician(db, politician_id)
+    return ORJSONResponse({
+        "bucket": bucket,
+        "donations": _financial_series_line(
+            db, CampaignDonation.recipient_id, CampaignDonation.date, CampaignDonation.amount,
+            politician_id, bucket, points
+        ),
+        "gifts": _financial_series_line(
+            db, Gift.recipient_id, Gift.report_date, Gift.value, politician_id, bucket, points
+        ),
+    })
+
+@router.get("/politicians/{politician_id}/disclosures", response_model=FinancialDisclosurePage)
+def get_politician_disclosures(
+    politician_id: int,
+    page: CollectionPageParams = Depends(),
+    db: Session = Depends(get_session)
+):
+    """
+    List a politician's financial disclosure filings, most recent first, optionally within a date range.
+    """
+    _require_politician(db, politician_id)
+    results, next_cursor = _collection_page(
+        db, _DISCLOSURES, politician_id, page.limit, page.cursor, page.start_date, page.end_date
     )
+    return ORJSONResponse({"results": results, "next_cursor": next_cursor})
+
+@router.get("/politicians/{politician_id}/similar", response_model=SimilarPoliticiansResponse)
+def get_similar_politicians(
+    politician_id: int,
+    k: int = Query(10, ge=1, le=100, description="Number of politicians to return"),
+    chamber: Optional[Chamber] = Query(None, description="Chamber to compare in (default: where the politician cast the most votes)"),
+    min_shared_votes: int = Query(MIN_SHARED_VOTES, ge=1, description="Ignore politicians with fewer roll calls in common"),
+    db: Session = Depends(get_session)
+):
+    """
+    The politicians who vote most like this one, by agreement over shared roll calls.
+    """
+    _require_politician(db, politician_id)
+    # Applies any votes recorded since the last request; usually a no-op
+    similarity_index.refresh(db)
+    used_chamber, matches = similarity_index.most_similar(politician_id, k, chamber, min_shared_votes)
 
-    return response_data
+    names = {}
+    if matches:
+        names = {
+            row.id: f"{row.first_name} {row.last_name}"
+            for row in db.exec(
+                select(Politician.id, Politician.first_name, Politician.last_name)
+                .where(col(Politician.id).in_([match.politician_id for match in matches]))
+            )
+        }
+    return ORJSONResponse({
+        "chamber": used_chamber,
+        "results": [
+            {
+                "politician_id": match.politician_id,
+                "full_name": names.get(match.politician_id, ""),
+                "agreement": match.agreement,
+                "shared_votes": match.shared_votes,
+            }
+            for match in matches
+        ],
+    })
+
+_TALLY_FIELDS = ("yes_count", "no_count", "abstain_count", "not_voting_count")
+
+@router.get("/bills/{bill_id}/roll-calls", response_model=BillRollCallsResponse)
+def get_bill_roll_calls(bill_id: int, db: Session = Depends(get_session)):
+    """
+    The outcome and party breakdown of every roll call on a bill.
+    """
+    bill = db.exec(select(Bill.bill_number, Bill.title).where(Bill.id == bill_id)).first()
+    if bill is None:
+        raise HTTPException(status_code=404, detail="Bill not found")
+
+    # Both reads are primary-key range scans of the trigger-maintained tallies
+    tallies = [getattr(RollCall, field) for field in _TALLY_FIELDS]
+    party_tallies = [getattr(RollCallPartyTally, field) for field in _TALLY_FIELDS]
+    parties: Dict[tuple, List[dict]] = {}
+    for row in db.execute(
+        select(
+            RollCallPartyTally.vote_date, RollCallPartyTally.chamber, RollCallPartyTally.roll_call_number,
+            RollCallPartyTally.party_name, *party_tallies
+        )
+        .where(RollCallPartyTally.bill_id == bill_id)
+        .order_by(col(RollCallPartyTally.party_name))
+    ):
+        parties.setdefault(tuple(row[:3]), []).append({"party_name": row[3], **dict(zip(_TALLY_FIELDS, row[4:]))})
+
+    results = [
+        {
+            "chamber": row.chamber,
+            "roll_call_number": row.roll_call_number,
+            "vote_date": row.vote_date,
+            **dict(zip(_TALLY_FIELDS, row[3:])),
+            "passed": row.yes_count > row.no_count,
+            "parties": parties.get(tuple(row[:3]), []),
+        }
+        for row in db.execute(
+            select(RollCall.vote_date, RollCall.chamber, RollCall.roll_call_number, *tallies)
+            .where(RollCall.bill_id == bill_id)
+            .order_by(RollCall.vote_date, RollCall.chamber, RollCall.roll_call_number)
+        )
+    ]
+    return ORJSONResponse({
+        "bill_id": bill_id,
+        "bill_number": bill.bill_number,
+        "title": bill.title,
+        "results": results,
+    })
 
 class DataIssue(SQLModel):
     """Describes a single data quality issue for a record."""
@@ -487,13 +1495,27 @@ class PoliticianDataHealth(SQLModel):
 class DataHealthResponse(SQLModel):
     """The response model for the data health endpoint."""
     politicians_with_issues: List[PoliticianDataHealth]
+    checked_at: str # When the stored issues were last refreshed
+    next_cursor: Optional[str] = None # Pass back as `cursor` to fetch the next page
+
+class DataHealthRefreshResponse(SQLModel):
+    checked_at: str
+    politicians_checked: int # How many politicians were re-evaluated
+
+class DonorResolutionResponse(SQLModel):
+    names_resolved: int # Distinct donor names given a donor
+    donors_created: int
 
 @router.get("/management/data-health", response_model=DataHealthResponse, tags=["Management"])
-async def get_data_health_report(
+def get_data_health_report(
+    field: Optional[str] = Query(None, description=f"Only politicians with an issue on this field: {', '.join(ISSUE_FIELDS)}"),
+    jurisdiction: Optional[str] = Query(None, description="Filter by current jurisdiction (case-insensitive)"),
+    size: int = Query(100, ge=1, le=1000, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous response's next_cursor"),
     db: Session = Depends(get_session)
 ):
     """
-    Scans the database to find politicians with outdated or missing information.
+    Lists politicians with outdated or missing information.
     
     This endpoint is designed for internal database management to identify records
     that require updates.
@@ -501,75 +1523,74 @@ async def get_data_health_report(
     - **Outdated** is defined as records not updated within the last 365 days.
     - **Missing** refers to key fields that are empty/null or required related records
     that are not present.
+
+    Issues are read from the `data_issues` table, which POST
+    /management/data-health/refresh brings up to date by re-checking only the
+    politicians that changed. If the checks have never run, this request runs them first.
     """
-    OUTDATED_THRESHOLD_DAYS = 365
-    cutoff_date = datetime.utcnow() - timedelta(days=OUTDATED_THRESHOLD_DAYS)
-    
-    # Eagerly load relationships to avoid N+1 query problems during the check loop
+    if field is not None and field not in ISSUE_FIELDS:
+        raise HTTPException(status_code=400, detail=f"Unknown field: {field}. Choose from: {', '.join(ISSUE_FIELDS)}.")
+
+    run = latest_run(db) or refresh_data_issues(db)
+
+    has_issue = select(DataHealthIssue.id).where(DataHealthIssue.politician_id == Politician.id)
+    if field:
+        has_issue = has_issue.where(DataHealthIssue.field == field)
     query = (
-        select(Politician)
-        .options(
-            selectinload(Politician.positions),
-            selectinload(Politician.party_affiliations),
-            selectinload(Politician.financial_disclosures)
-        )
-        .order_by(Politician.last_name, Politician.first_name) # For consistent ordering
+        select(Politician.id, Politician.first_name, Politician.last_name, PoliticianCurrentStatus.jurisdiction)
+        .outerjoin(PoliticianCurrentStatus, col(PoliticianCurrentStatus.politician_id) == Politician.id)
+        .where(has_issue.exists())
     )
-    politicians = db.exec(query).all()
-    
-    politicians_with_issues = []
-    
-    for p in politicians:
-        issues = []
-        
-        # --- CHECK 1: Missing Core Information ---
-        if not p.date_of_birth:
-            issues.append(DataIssue(field="date_of_birth", message="Missing date of birth."))
-        if not p.biography:
-            issues.append(DataIssue(field="biography", message="Missing biography."))
-        if not p.official_website_url:
-            issues.append(DataIssue(field="official_website_url", message="Missing official website URL."))
-            
-        # --- CHECK 2: Missing or Incomplete Relational Information ---
-        if not p.positions:
-            issues.append(DataIssue(field="positions", message="No political positions on record."))
-        elif not any(pos.is_current for pos in p.positions):
-            issues.append(DataIssue(field="positions", message="No position is marked as 'current'."))
-            
-        if not p.party_affiliations:
-            issues.append(DataIssue(field="party_affiliations", message="No party affiliations on record."))
-        elif not any(pa.end_date is None for pa in p.party_affiliations):
-            issues.append(DataIssue(field="party_affiliations", message="No current party affiliation found (all have an end_date)."))
-            
-        # --- CHECK 3: Outdated Record Checks ---
-        if p.updated_at < cutoff_date:
-            issues.append(DataIssue(
-                field="updated_at",
-                message=f"Core record is stale; last updated on {p.updated_at.date()}."
-            ))
-            
-        if p.financial_disclosures:
-            latest_disclosure = max(p.financial_disclosures, key=lambda fd: fd.filing_date, default=None)
-            if latest_disclosure and latest_disclosure.filing_date < cutoff_date.date():
-                issues.append(DataIssue(
-                    field="financial_disclosures",
-                    message=f"Latest financial disclosure is from {latest_disclosure.filing_date}, which is over a year old."
-                ))
-        else:
-            issues.append(DataIssue(field="financial_disclosures", message="No financial disclosures on record."))
-
-        # If any issues were found for this politician, add them to the results
-        if issues:
-            current_pos = next((pos for pos in p.positions if pos.is_current), None)
-            jurisdiction = current_pos.jurisdiction if current_pos else "N/A"
-            
-            politicians_with_issues.append(
-                PoliticianDataHealth(
-                    id=p.id,
-                    full_name=f"{p.first_name} {p.last_name}",
-                    jurisdiction=jurisdiction,
-                    issues=issues
-                )
-            )
-            
-    return DataHealthResponse(politicians_with_issues=politicians_with_issues)
+    if jurisdiction:
+        query = query.where(PoliticianCurrentStatus.jurisdiction_key == jurisdiction.lower())
+    if cursor:
+        last_name, last_id = decode_cursor(cursor, str, int)
+        query = query.where(tuple_(Politician.last_name, Politician.id) > (last_name, last_id))
+
+    # Fetch one extra row to learn whether another page exists
+    query = query.order_by(Politician.last_name, Politician.id).limit(size + 1) # For consistent ordering
+    rows = db.exec(query).all()
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        next_cursor = encode_cursor(rows[-1].last_name, rows[-1].id)
+
+    issues_query = (
+        select(DataHealthIssue.politician_id, DataHealthIssue.field, DataHealthIssue.message)
+        .where(col(DataHealthIssue.politician_id).in_([row.id for row in rows]))
+        .order_by(DataHealthIssue.id)
+    )
+    if field:
+        issues_query = issues_query.where(DataHealthIssue.field == field)
+    issues_by_politician: Dict[int, List[dict]] = {row.id: [] for row in rows}
+    for issue in db.exec(issues_query):
+        issues_by_politician[issue.politician_id].append({"field": issue.field, "message": issue.message})
+
+    return ORJSONResponse({
+        "politicians_with_issues": [
+            {
+                "id": row.id,
+                "full_name": f"{row.first_name} {row.last_name}",
+                "jurisdiction": row.jurisdiction or "N/A",
+                "issues": issues_by_politician[row.id],
+            }
+            for row in rows
+        ],
+        "checked_at": run.ran_at,
+        "next_cursor": next_cursor,
+    })
+
+@router.post("/management/data-health/refresh", response_model=DataHealthRefreshResponse, tags=["Management"])
+def refresh_data_health(db: Session = Depends(get_session)):
+    """
+    Re-check the politicians whose records changed, or became outdated, since the last run.
+    """
+    run = refresh_data_issues(db)
+    return ORJSONResponse({"checked_at": run.ran_at, "politicians_checked": run.politicians_checked})
+
+@router.post("/management/donors/resolve", response_model=DonorResolutionResponse, tags=["Management"])
+def resolve_donor_names(db: Session = Depends(get_session)):
+    """
+    Match the donor names of new campaign donations and gifts to donors, creating donors as needed.
+    """
+    return ORJSONResponse(resolve_donors(db)._asdict())
@@ -0,0 +1,199 @@
+"""
+In-process caches for derived API data, invalidated by table write versions.
+
+Every write to a versioned table bumps that table's counter in
+``table_versions``, from database triggers, so writes made through raw SQL,
+by other triggers or by other worker processes count as well as this
+process's ORM writes. A cached value records the versions of the tables it
+was computed from and is treated as stale as soon as any of them moves on.
+
+Profiles are versioned per politician instead, in ``politician_versions``:
+a write to one politician's rows leaves every other cached profile current.
+
+The cached values themselves are per process; only the versions are shared.
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel, col, select
+
+from server.models import Politician, PoliticianVersion, TableVersion
+
+V = TypeVar("V")
+
+# Tables whose writes are counted; caches may only depend on these
+VERSIONED_TABLES = (
+    "politicians", "sources", "political_positions", "party_affiliations", "committee_memberships",
+    "committees", "votes", "bills", "gifts", "campaign_donations", "financial_disclosures",
+)
+
+
+def _bump_version(table: str) -> str:
+    return f"""
+        INSERT INTO table_versions (table_name, version) VALUES ('{table}', 1)
+        ON CONFLICT (table_name) DO UPDATE SET version = version + 1;
+    """
+
+
+VERSION_TRIGGERS: List[str] = [
+    f"""CREATE TRIGGER IF NOT EXISTS table_versions_{_table}_{_suffix}
+        AFTER {_event} ON {_table}
+        BEGIN {_bump_version(_table)} END"""
+    for _table in VERSIONED_TABLES
+    for _suffix, _event in (("ai", "INSERT"), ("au", "UPDATE"), ("ad", "DELETE"))
+]
+
+
+def _bump_politicians(select_ids: str) -> str:
+    """SQL that bumps the version of every politician id ``select_ids`` selects."""
+    return f"""
+        INSERT INTO politician_versions (politician_id, version) {select_ids}
+        ON CONFLICT (politician_id) DO UPDATE SET version = version + 1;
+    """
+
+
+# Tables holding a politician's own rows, and the column naming the politician
+_PROFILE_TABLES = (
+    ("politicians", "id"), ("political_positions", "politician_id"), ("party_affiliations", "politician_id"),
+    ("committee_memberships", "politician_id"), ("votes", "politician_id"), ("gifts", "recipient_id"),
+    ("campaign_donations", "recipient_id"), ("financial_disclosures", "politician_id"),
+)
+# Shared rows a profile shows, and how to find the politicians showing them.
+# Inserting one cannot change an existing profile, so only edits and deletes count.
+_PROFILE_REFERENCES = (
+    ("bills", "SELECT DISTINCT politician_id, 1 FROM votes WHERE bill_id = OLD.id"),
+    ("committees", "SELECT DISTINCT politician_id, 1 FROM committee_memberships WHERE committee_id = OLD.id"),
+    ("sources", "SELECT id, 1 FROM politicians WHERE source_id = OLD.id"),
+)
+
+POLITICIAN_VERSION_TRIGGERS: List[str] = [
+    *(
+        f"""CREATE TRIGGER IF NOT EXISTS politician_versions_{_table}_{_suffix}
+            AFTER {_event} ON {_table}
+            BEGIN {"".join(_bump_politicians(f"VALUES ({_row}.{_owner}, 1)") for _row in _rows)} END"""
+        for _table, _owner in _PROFILE_TABLES
+        for _suffix, _event, _rows in (("ai", "INSERT", ("NEW",)), ("au", "UPDATE", ("OLD", "NEW")), ("ad", "DELETE", ("OLD",)))
+    ),
+    *(
+        # "WHERE true" tells SQLite's parser the ON CONFLICT clause is not a join constraint
+        f"""CREATE TRIGGER IF NOT EXISTS politician_versions_{_table}_{_suffix}
+            AFTER {_event} ON {_table}
+            BEGIN {_bump_politicians(f"SELECT * FROM ({_select_ids}) WHERE true")} END"""
+        for _table, _select_ids in _PROFILE_REFERENCES
+        for _suffix, _event in (("au", "UPDATE"), ("ad", "DELETE"))
+    ),
+]
+
+
+def create_version_triggers(target, connection, **kw):
+    """Install the write-counting triggers; registered as an ``after_create`` hook."""
+    if connection.dialect.name != "sqlite":
+        return
+    for statement in (*VERSION_TRIGGERS, *POLITICIAN_VERSION_TRIGGERS):
+        connection.exec_driver_sql(statement)
+
+
+event.listen(SQLModel.metadata, "after_create", create_version_triggers)
+
+
+def table_versions(db: Session, tables: Tuple[str, ...]) -> Tuple[int, ...]:
+    """Return the current versions of ``tables``, in the given order."""
+    versions = dict(db.execute(
+        select(TableVersion.table_name, TableVersion.version).where(col(TableVersion.table_name).in_(tables))
+    ).all())
+    return tuple(versions.get(table, 0) for table in tables)
+
+
+def politician_version(db: Session, politician_id: int) -> Optional[Tuple]:
+    """
+    Return the version of one politician's profile: their row's ``updated_at``
+    and their write counter. None if the politician does not exist.
+    """
+    return db.execute(
+        select(Politician.updated_at, PoliticianVersion.version)
+        .outerjoin(PoliticianVersion, col(PoliticianVersion.politician_id) == Politician.id)
+        .where(col(Politician.id) == politician_id)
+    ).first()
+
+
+class VersionedCache(Generic[V]):
+    """
+    A bounded mapping whose entries are tagged with the table versions they
+    were computed from. Least recently used entries are evicted first.
+
+    Besides the entry limit, a cache can be bounded by total size: pass a
+    ``sizeof`` function (e.g. the length of a cached byte string) and
+    ``max_size`` in the same unit. Values larger than ``max_size`` are not cached.
+
+    A cache versioned some other way (e.g. by `politician_version`) passes no
+    tables and hands its own versions to `get` and `put`.
+    """
+
+    def __init__(
+        self,
+        tables: Tuple[str, ...] = (),
+        max_entries: int = 1024,
+        max_size: Optional[int] = None,
+        sizeof: Optional[Callable[[V], int]] = None,
+    ):
+        unversioned = set(tables) - set(VERSIONED_TABLES)
+        if unversioned:
+            raise ValueError(f"Writes to {sorted(unversioned)} are not versioned")
+        self.tables = tables
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self._sizeof = sizeof or (lambda value: 0)
+        self._size = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Tuple[int, ...], V]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        """Total ``sizeof`` of the cached values."""
+        return self._size
+
+    def version(self, db: Session) -> Tuple[int, ...]:
+        """The current versions of the source tables, as read through ``db``."""
+        return table_versions(db, self.tables)
+
+    def get(self, key: Hashable, version: Tuple[int, ...]) -> Optional[Tuple[V, bool]]:
+        """
+        Return ``(value, is_current)`` for ``key``, or None if nothing is cached.
+
+        ``is_current`` is False when the current ``version`` (from `version`)
+        differs from the one the value was computed at, i.e. a source table has
+        been written since; callers decide whether a stale value is acceptable.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            cached_version, value = entry
+            return value, cached_version == version
+
+    def put(self, key: Hashable, value: V, version: Tuple[int, ...]) -> None:
+        """Store ``value`` as computed at ``version`` (taken *before* computing it)."""
+        value_size = self._sizeof(value)
+        with self._lock:
+            self._discard(key)
+            if self.max_size is not None and value_size > self.max_size:
+                return
+            self._entries[key] = (version, value)
+            self._size += value_size
+            while len(self._entries) > self.max_entries or (
+                self.max_size is not None and self._size > self.max_size
+            ):
+                self._discard(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= self._sizeof(entry[1])
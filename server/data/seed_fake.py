@@ -3,6 +3,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from server.models import Politician, VoteRecord, Gift
+from server.analytics.industries import INDUSTRIES
 from faker import Faker
 import random
 from datetime import date
@@ -90,14 +91,7 @@ def seed_db(session: Session):
     
     # Define mapping of voting keywords to related industries for gift sources
     keyword_to_industry = {
-        "energy": ["ExxonMobil", "Chevron", "Shell", "BP", "ConocoPhillips"],
-        "environment": ["NextEra Energy", "Vestas", "First Solar", "Orsted", "Siemens Gamesa"],
-        "health": ["Johnson & Johnson", "Pfizer", "Merck", "AbbVie", "Amgen"],
-        "defense": ["Lockheed Martin", "Raytheon", "Boeing Defense", "Northrop Grumman", "General Dynamics"],
-        "technology": ["Google", "Microsoft", "Amazon", "Meta", "Apple"],
-        "finance": ["JPMorgan Chase", "Goldman Sachs", "Morgan Stanley", "Citigroup", "Bank of America"],
-        "agriculture": ["Cargill", "Archer Daniels Midland", "Pilgrim's Pride", "Tyson Foods", "Land O'Lakes"],
-        "transportation": ["Union Pacific", "FedEx", "United Airlines", "Delta Air Lines", "Caterpillar"]
+        industry: list(details.organizations) for industry, details in INDUSTRIES.items()
     }
     
     # Create gifts for all politicians
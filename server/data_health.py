@@ -0,0 +1,165 @@
+"""
+Incremental data-health checks.
+
+The checks that flag politicians with missing or outdated information are
+plain set-based SQL statements whose results are stored in the
+``data_issues`` table, so reading the report is an indexed table read.
+
+A run only re-evaluates politicians that may have changed:
+
+* politicians whose own rows, positions, party affiliations or financial
+  disclosures were written since the last run. Triggers on those tables queue
+  them in ``data_health_pending``, whichever client did the write;
+* politicians whose record or latest disclosure crossed the one-year
+  staleness cutoff since the previous run's cutoff.
+
+The first run evaluates every politician.
+"""
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import event, text
+from sqlmodel import SQLModel, Session, col, func, select
+
+from server.models import DataHealthRun
+
+# Records not updated for this long are reported as outdated
+OUTDATED_THRESHOLD_DAYS = 365
+
+# The order in which issues are checked, and listed for each politician
+ISSUE_FIELDS = (
+    "date_of_birth", "biography", "official_website_url", "positions",
+    "party_affiliations", "updated_at", "financial_disclosures",
+)
+
+
+# --- Change tracking ---
+
+PENDING_TRIGGERS: List[str] = []
+for _table, _ref in (
+    ("politicians", "id"),
+    ("political_positions", "politician_id"),
+    ("party_affiliations", "politician_id"),
+    ("financial_disclosures", "politician_id"),
+):
+    PENDING_TRIGGERS += [
+        f"""CREATE TRIGGER IF NOT EXISTS data_health_pending_{_table}_ai
+            AFTER INSERT ON {_table}
+            BEGIN INSERT OR IGNORE INTO data_health_pending (politician_id) VALUES (NEW.{_ref}); END""",
+        f"""CREATE TRIGGER IF NOT EXISTS data_health_pending_{_table}_au
+            AFTER UPDATE ON {_table}
+            BEGIN
+                INSERT OR IGNORE INTO data_health_pending (politician_id) VALUES (OLD.{_ref});
+                INSERT OR IGNORE INTO data_health_pending (politician_id) VALUES (NEW.{_ref});
+            END""",
+        f"""CREATE TRIGGER IF NOT EXISTS data_health_pending_{_table}_ad
+            AFTER DELETE ON {_table}
+            BEGIN INSERT OR IGNORE INTO data_health_pending (politician_id) VALUES (OLD.{_ref}); END""",
+    ]
+
+
+def create_data_health_triggers(target, connection, **kw):
+    """Install the change-tracking triggers; registered as an ``after_create`` hook."""
+    if connection.dialect.name != "sqlite":
+        return
+    for statement in PENDING_TRIGGERS:
+        connection.exec_driver_sql(statement)
+
+
+event.listen(SQLModel.metadata, "after_create", create_data_health_triggers)
+
+
+# --- Checks ---
+
+# Each check inserts the issues of every pending politician it applies to.
+# Messages match the ones the report has always used.
+_PENDING = "p.id IN (SELECT politician_id FROM data_health_pending)"
+
+_CHECKS = [
+    f"""SELECT p.id, 'date_of_birth', 'Missing date of birth.'
+        FROM politicians AS p WHERE {_PENDING} AND p.date_of_birth IS NULL""",
+    f"""SELECT p.id, 'biography', 'Missing biography.'
+        FROM politicians AS p WHERE {_PENDING} AND coalesce(p.biography, '') = ''""",
+    f"""SELECT p.id, 'official_website_url', 'Missing official website URL.'
+        FROM politicians AS p WHERE {_PENDING} AND coalesce(p.official_website_url, '') = ''""",
+    f"""SELECT p.id, 'positions',
+               CASE WHEN NOT EXISTS (SELECT 1 FROM political_positions WHERE politician_id = p.id)
+                    THEN 'No political positions on record.'
+                    ELSE 'No position is marked as ''current''.' END
+        FROM politicians AS p
+        LEFT JOIN politician_current_status AS s ON s.politician_id = p.id
+        WHERE {_PENDING} AND s.position_title IS NULL""",
+    f"""SELECT p.id, 'party_affiliations',
+               CASE WHEN NOT EXISTS (SELECT 1 FROM party_affiliations WHERE politician_id = p.id)
+                    THEN 'No party affiliations on record.'
+                    ELSE 'No current party affiliation found (all have an end_date).' END
+        FROM politicians AS p
+        LEFT JOIN politician_current_status AS s ON s.politician_id = p.id
+        WHERE {_PENDING} AND s.party_name IS NULL""",
+    f"""SELECT p.id, 'updated_at', 'Core record is stale; last updated on ' || date(p.updated_at) || '.'
+        FROM politicians AS p WHERE {_PENDING} AND p.updated_at < :cutoff""",
+    f"""SELECT id, 'financial_disclosures',
+               CASE WHEN latest IS NULL THEN 'No financial disclosures on record.'
+                    ELSE 'Latest financial disclosure is from ' || latest || ', which is over a year old.' END
+        FROM (SELECT p.id,
+                     (SELECT max(filing_date) FROM financial_disclosures WHERE politician_id = p.id) AS latest
+              FROM politicians AS p WHERE {_PENDING})
+        WHERE latest IS NULL OR latest < :cutoff_date""",
+]
+
+
+def _format_datetime(value: datetime) -> str:
+    """Format a datetime the way SQLAlchemy stores it in SQLite, for comparisons in raw SQL."""
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def latest_run(db: Session) -> Optional[DataHealthRun]:
+    """The most recent data-health run, or None if the checks have never run."""
+    latest_id = select(func.max(DataHealthRun.id)).scalar_subquery()
+    return db.exec(select(DataHealthRun).where(col(DataHealthRun.id) == latest_id)).first()
+
+
+def refresh_data_issues(db: Session, now: Optional[datetime] = None) -> DataHealthRun:
+    """
+    Re-evaluate the politicians that may have changed since the last run and
+    store their issues. Commits, and returns the record of this run.
+    """
+    now = now or datetime.utcnow()
+    cutoff = now - timedelta(days=OUTDATED_THRESHOLD_DAYS)
+    params = {"cutoff": _format_datetime(cutoff), "cutoff_date": cutoff.date().isoformat()}
+
+    previous = latest_run(db)
+    if previous is None:
+        db.execute(text("INSERT OR IGNORE INTO data_health_pending (politician_id) SELECT id FROM politicians"))
+    else:
+        # Nothing was written, but time moved on: queue the records that have
+        # become stale since the previous cutoff.
+        window = {
+            **params,
+            "previous_cutoff": _format_datetime(previous.stale_cutoff),
+            "previous_cutoff_date": previous.stale_cutoff.date().isoformat(),
+        }
+        db.execute(text("""
+            INSERT OR IGNORE INTO data_health_pending (politician_id)
+            SELECT id FROM politicians WHERE updated_at >= :previous_cutoff AND updated_at < :cutoff
+        """), window)
+        db.execute(text("""
+            INSERT OR IGNORE INTO data_health_pending (politician_id)
+            SELECT politician_id FROM financial_disclosures
+            WHERE filing_date >= :previous_cutoff_date AND filing_date < :cutoff_date
+        """), window)
+
+    checked = db.execute(text("SELECT count(*) FROM data_health_pending")).scalar_one()
+    db.execute(text(
+        "DELETE FROM data_issues WHERE politician_id IN (SELECT politician_id FROM data_health_pending)"
+    ))
+    # Checks run in ISSUE_FIELDS order, so each politician's issues get ids in that order
+    for check in _CHECKS:
+        db.execute(text(f"INSERT INTO data_issues (politician_id, field, message) {check}"), params)
+    db.execute(text("DELETE FROM data_health_pending"))
+
+    run = DataHealthRun(ran_at=now, stale_cutoff=cutoff, politicians_checked=checked)
+    db.add(run)
+    db.commit()
+    db.refresh(run)
+    return run
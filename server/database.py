@@ -1,23 +1,45 @@
 # database.py
 from typing import Generator
 from sqlalchemy import create_engine, event
-from sqlalchemy.orm import sessionmaker, Session
-from sqlmodel import SQLModel
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel, Session
 import os
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 db_path = os.path.join(current_dir, "../politics.db")
 db_abs_path = os.path.abspath(db_path)
 
-engine = create_engine(f"sqlite:///{db_abs_path}", echo=True)
+# Number of request handlers that may run database work at once. Sync route
+# handlers run in a worker thread pool of this size (see main.py), so requests
+# queue for a thread rather than blocking the event loop or piling up on SQLite.
+DB_CONCURRENCY = int(os.getenv("DB_CONCURRENCY", "16"))
+
+# Connections opened beyond the pool, and closed again when returned. A
+# request's session is only closed after its response has been sent, so more
+# sessions than worker threads can be open at once, and background work such
+# as the similarity index warm-up holds connections of its own; neither
+# should make a handler wait for a connection.
+DB_POOL_OVERFLOW = int(os.getenv("DB_POOL_OVERFLOW", str(DB_CONCURRENCY)))
+
+engine = create_engine(
+    f"sqlite:///{db_abs_path}",
+    echo=True,
+    # Sessions are opened by a dependency and used by the handler, which
+    # FastAPI may run on different worker threads.
+    connect_args={"check_same_thread": False},
+    pool_size=DB_CONCURRENCY,
+    max_overflow=DB_POOL_OVERFLOW,
+)
 
 @event.listens_for(engine, "connect")
 def set_sqlite_pragma(dbapi_connection, connection_record):
     cursor = dbapi_connection.cursor()
     cursor.execute("PRAGMA journal_mode=WAL")
+    # With WAL, readers run concurrently; writers wait for each other instead of failing
+    cursor.execute("PRAGMA busy_timeout=5000")
     cursor.close()
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=Session)
 
 def get_session() -> Generator[Session, None, None]:
     session = SessionLocal()
@@ -0,0 +1,216 @@
+"""
+Donor entity resolution: one ``donors`` row per real-world donor.
+
+Donor names on campaign donations and gifts are free text, so "ExxonMobil",
+"Exxon Mobil Corp" and "EXXON MOBIL PAC" are spelled differently. Each run of
+`resolve_donors` takes the names not yet resolved (rows whose ``donor_id`` is
+NULL) and:
+
+1. normalizes them: lowercased, accents and punctuation stripped, legal and
+   committee suffixes ("Inc", "Corp", "PAC", ...) dropped;
+2. puts every normalized name, new and already resolved, into blocks that
+   share a key: the sorted tokens, the sorted Soundex codes of the tokens,
+   or the first letters of the name with spaces removed;
+3. compares names pairwise only within a block, so the work grows with the
+   block sizes rather than with the square of the number of names, and
+   links the ones whose trigram similarity (ignoring spaces) reaches
+   MATCH_THRESHOLD, with union-find;
+4. gives each group of linked names the id of the known donor it contains
+   (the lowest, if it links several) or a new donor named after its most
+   common spelling (the first alphabetically, on a tie), and writes that id
+   to the rows' ``donor_id``.
+
+Known donors are never merged or renamed, so a donor id is stable once
+handed out. The rollups in server/projections.py stay keyed by name, since a
+donation needs a rollup row as soon as it is inserted, before any run has
+resolved it: resolved donations are filed under their donor's name and carry
+its id alongside, and unresolved ones under their own spelling.
+
+Run ``python -m server.donors`` to resolve new names.
+"""
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, NamedTuple
+
+from sqlalchemy import text
+from sqlmodel import Session, col, func, select
+
+from server.models import CampaignDonation, Donor, Gift
+from server.search import _fold, trigrams
+
+# Words that say what kind of organization a donor is rather than which one
+NOISE_WORDS = frozenset({
+    "the", "and", "of", "inc", "incorporated", "corp", "corporation", "co", "company", "companies",
+    "llc", "ltd", "limited", "lp", "llp", "plc", "pac", "political", "action", "committee",
+})
+
+# Share of trigrams (Dice coefficient) two normalized names must have in common to match
+MATCH_THRESHOLD = 0.8
+
+# Length of the squashed-name prefix used as a blocking key
+PREFIX_LENGTH = 6
+
+# Blocks larger than this (a very common key) are not compared pairwise
+MAX_BLOCK_SIZE = 200
+
+
+class ResolutionResult(NamedTuple):
+    names_resolved: int
+    donors_created: int
+
+
+def normalize_donor_name(name: str) -> str:
+    """Lowercase ``name``, strip accents and punctuation, and drop NOISE_WORDS (unless nothing else is left)."""
+    tokens = _fold(name.replace("&", " and "))
+    meaningful = [token for token in tokens if token not in NOISE_WORDS]
+    return " ".join(meaningful or tokens)
+
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"), **dict.fromkeys("cgjkqsxz", "2"), **dict.fromkeys("dt", "3"),
+    "l": "4", **dict.fromkeys("mn", "5"), "r": "6",
+}
+
+
+def soundex(word: str) -> str:
+    """American Soundex code of a lowercase word ("robert" -> "R163"); digits are kept as they are."""
+    if not word or not word[0].isalpha():
+        return word
+    code, previous = word[0].upper(), _SOUNDEX_CODES.get(word[0], "")
+    for ch in word[1:]:
+        digit = _SOUNDEX_CODES.get(ch, "")
+        if digit and digit != previous:
+            code += digit
+        # "h" and "w" do not separate letters with the same code; vowels do
+        if ch not in "hw":
+            previous = digit
+    return (code + "000")[:4]
+
+
+def blocking_keys(normalized: str) -> List[str]:
+    """The blocks a normalized name goes into; names are only compared within a shared block."""
+    tokens = normalized.split()
+    return [
+        "tokens:" + " ".join(sorted(tokens)),
+        "soundex:" + " ".join(sorted(soundex(token) for token in tokens)),
+        "prefix:" + "".join(tokens)[:PREFIX_LENGTH],
+    ]
+
+
+def name_similarity(a: str, b: str) -> float:
+    """Dice coefficient of the trigrams of two normalized names, ignoring spaces."""
+    # Spaces are removed so that "exxon mobil" and "exxonmobil" compare equal
+    grams_a, grams_b = trigrams(a.replace(" ", "")), trigrams(b.replace(" ", ""))
+    if not grams_a or not grams_b:
+        return float(a == b)
+    return 2 * len(grams_a & grams_b) / (len(grams_a) + len(grams_b))
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, node: int) -> int:
+        while self.parent[node] != node:
+            self.parent[node] = self.parent[self.parent[node]]
+            node = self.parent[node]
+        return node
+
+    def union(self, a: int, b: int) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+def cluster_names(names: List[str], is_new: List[bool]) -> List[int]:
+    """
+    Link matching normalized ``names`` (distinct) and return each name's
+    cluster root. Pairs of names that are both known (``is_new`` False) were
+    compared on an earlier run and are skipped.
+    """
+    blocks: Dict[str, List[int]] = defaultdict(list)
+    for node, name in enumerate(names):
+        for key in blocking_keys(name):
+            blocks[key].append(node)
+
+    clusters = _UnionFind(len(names))
+    compared = set()
+    for members in blocks.values():
+        if len(members) < 2 or len(members) > MAX_BLOCK_SIZE:
+            continue
+        for i, a in enumerate(members):
+            for b in members[i + 1:]:
+                if not (is_new[a] or is_new[b]) or (a, b) in compared:
+                    continue
+                compared.add((a, b))
+                if name_similarity(names[a], names[b]) >= MATCH_THRESHOLD:
+                    clusters.union(a, b)
+    return [clusters.find(node) for node in range(len(names))]
+
+
+def _donor_name_counts(db: Session, resolved: bool) -> Iterable[tuple]:
+    """(raw name, donor_id, rows) over donations and gifts, for the resolved or the unresolved rows."""
+    for name_column, id_column in ((CampaignDonation.donor_name, CampaignDonation.donor_id), (Gift.donor, Gift.donor_id)):
+        condition = col(id_column).is_not(None) if resolved else col(id_column).is_(None)
+        yield from db.execute(
+            select(name_column, id_column, func.count()).where(condition).group_by(name_column, id_column)
+        ).all()
+
+
+def resolve_donors(db: Session) -> ResolutionResult:
+    """Resolve every donor name without a donor_id yet. Commits."""
+    new_counts: Counter = Counter()
+    for name, _, rows in _donor_name_counts(db, resolved=False):
+        new_counts[name] += rows
+    if not new_counts:
+        return ResolutionResult(0, 0)
+
+    # One node per distinct normalized name, remembering the donor already behind it (if any)
+    nodes: Dict[str, int] = {}
+    known_donor: Dict[int, int] = {}
+    for name, donor_id, _ in _donor_name_counts(db, resolved=True):
+        node = nodes.setdefault(normalize_donor_name(name), len(nodes))
+        known_donor[node] = min(donor_id, known_donor.get(node, donor_id))
+    new_nodes = {name: nodes.setdefault(normalize_donor_name(name), len(nodes)) for name in new_counts}
+
+    roots = cluster_names(list(nodes), [node not in known_donor for node in range(len(nodes))])
+    cluster_donor: Dict[int, int] = {}
+    for node, donor_id in known_donor.items():
+        root = roots[node]
+        cluster_donor[root] = min(donor_id, cluster_donor.get(root, donor_id))
+
+    # Clusters of new names only become new donors, named after their most common spelling
+    spellings: Dict[int, Counter] = defaultdict(Counter)
+    for name, node in new_nodes.items():
+        if roots[node] not in cluster_donor:
+            spellings[roots[node]][name] += new_counts[name]
+    for root, counts in spellings.items():
+        name = min(counts, key=lambda spelling: (-counts[spelling], spelling))
+        donor = Donor(name=name, normalized_name=normalize_donor_name(name))
+        db.add(donor)
+        db.flush()
+        cluster_donor[root] = donor.id
+
+    # Assign through a temporary table: one pass over the unresolved rows of each table
+    db.execute(text("CREATE TEMP TABLE IF NOT EXISTS donor_resolutions (name TEXT PRIMARY KEY, donor_id INTEGER)"))
+    db.execute(text("DELETE FROM donor_resolutions"))
+    db.execute(
+        text("INSERT INTO donor_resolutions (name, donor_id) VALUES (:name, :donor_id)"),
+        [{"name": name, "donor_id": cluster_donor[roots[node]]} for name, node in new_nodes.items()],
+    )
+    for table, name_column in (("campaign_donations", "donor_name"), ("gifts", "donor")):
+        db.execute(text(
+            f"UPDATE {table} SET donor_id = "
+            f"(SELECT donor_id FROM donor_resolutions WHERE name = {table}.{name_column}) "
+            "WHERE donor_id IS NULL"
+        ))
+    db.execute(text("DROP TABLE donor_resolutions"))
+    db.commit()
+    return ResolutionResult(len(new_nodes), len(spellings))
+
+
+if __name__ == "__main__":
+    from server.database import engine
+
+    with Session(engine) as session:
+        result = resolve_donors(session)
+    print(f"Resolved {result.names_resolved} donor names; created {result.donors_created} donors")
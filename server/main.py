@@ -1,9 +1,18 @@
+import threading
+
+import anyio
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from api.routes import router
-from server.database import engine, SQLModel
-from server.models import Politician, VoteRecord, Gift
+from fastapi.middleware.gzip import GZipMiddleware
+from server.api.routes import router
+from server.api.analytics import router as analytics_router
+from server.database import engine, SQLModel, DB_CONCURRENCY
+from server.search import name_suggester
+from server.analytics.similarity import similarity_index
+import server.projections  # registers the projection triggers with create_all
+import server.migrations  # registers the in-place upgrade of existing databases with create_all
+from sqlmodel import Session
 
 # Create the FastAPI application
 app = FastAPI(
@@ -24,17 +33,36 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress responses for clients that accept gzip. Small bodies are sent as-is,
+# where compression costs more than it saves.
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Include the search router
 app.include_router(router)
+app.include_router(analytics_router)
 
 def create_db_and_tables():
     """Create database tables"""
     SQLModel.metadata.create_all(engine)
 
+def warm_similarity_index(bind):
+    """Build the voting similarity index from every vote recorded so far"""
+    with Session(bind) as session:
+        similarity_index.refresh(session)
+
 @app.on_event("startup")
 def on_startup():
-    """Create database tables when the application starts"""
+    """Create database tables and warm in-memory indexes when the application starts"""
+    # Sync route handlers run in anyio's worker thread pool; bound it to the
+    # number of pooled database connections.
+    anyio.to_thread.current_default_thread_limiter().total_tokens = DB_CONCURRENCY
     create_db_and_tables()
+    with Session(engine) as session:
+        name_suggester.load(session)
+    # Reading every vote takes a while on a full database, so build the index
+    # in the background. Similarity requests that arrive first wait for it on
+    # the index's lock, or build it themselves if they get there first.
+    threading.Thread(target=warm_similarity_index, args=(engine,), name="similarity-warmup", daemon=True).start()
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,54 @@
+"""
+In-place upgrades of an existing database to the current models.
+
+``create_all`` only creates tables that are missing: columns and indexes
+declared on a table that already exists are never added. Importing this
+module registers metadata hooks that add them whenever ``create_all`` runs, as
+it does at startup, so an existing database gets the same schema and query
+plans as a new one.
+
+Only nullable columns can be added in place. Any other change to an existing
+table needs a migration step of its own.
+"""
+from sqlalchemy import event
+from sqlalchemy.schema import CreateColumn
+from sqlmodel import SQLModel
+
+
+def add_missing_columns(target, connection, **kw):
+    """
+    Add every declared column that an existing table lacks; registered as a
+    ``before_create`` hook, so triggers and backfills installed after
+    ``create_all`` can rely on the new columns.
+    """
+    if connection.dialect.name != "sqlite":
+        return
+    preparer = connection.dialect.identifier_preparer
+    for table in target.sorted_tables:
+        table_name = preparer.format_table(table)
+        existing = {row[1] for row in connection.exec_driver_sql(f"PRAGMA table_info({table_name})")}
+        if not existing:
+            continue # Not created yet; create_all creates it whole
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            if not column.nullable:
+                raise RuntimeError(f"Cannot add NOT NULL column {table.name}.{column.name} to an existing table")
+            definition = str(CreateColumn(column).compile(dialect=connection.dialect))
+            for foreign_key in column.foreign_keys:
+                referenced = foreign_key.column
+                definition += (
+                    f" REFERENCES {preparer.format_table(referenced.table)} ({preparer.quote(referenced.name)})"
+                )
+            connection.exec_driver_sql(f"ALTER TABLE {table_name} ADD COLUMN {definition}")
+
+
+def create_missing_indexes(target, connection, **kw):
+    """Create every declared index that does not exist yet; registered as an ``after_create`` hook."""
+    for table in target.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
+event.listen(SQLModel.metadata, "before_create", add_missing_columns)
+event.listen(SQLModel.metadata, "after_create", create_missing_indexes)
@@ -1,6 +1,7 @@
 from typing import List, Optional
 from datetime import date, datetime
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index, text
 from enum import Enum
 
 # Using an Enum for fixed choices is good practice
@@ -24,20 +25,28 @@ class Source(SQLModel, table=True):
     id: int = Field(default=None, primary_key=True)
     name: str = Field(index=True)  # e.g., "ProPublica Congress API", "FEC Bulk Data"
     url: Optional[str] = None      # URL for the API endpoint or webpage where data was found
-    retrieval_date: datetime = Field(default_f=datetime.utcnow)
+    retrieval_date: datetime = Field(default_factory=datetime.utcnow)
     description: Optional[str] = None
 
 class AuditableBase(SQLModel):
     """A base model to add auditing fields to other models."""
-    created_at: datetime = Field(default_f=datetime.utcnow, nullable=False)
-    updated_at: datetime = Field(default_f=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow}, nullable=False)
+    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow}, nullable=False)
     
+    # SQLModel only maps relationships declared on table models, so tables
+    # that load their source declare ``source`` themselves (see Politician and Gift)
     source_id: Optional[int] = Field(default=None, foreign_key="sources.id")
-    source: Optional[Source] = Relationship()
 
 class Politician(AuditableBase, table=True):
     """Core, relatively static information about a public servant."""
     __tablename__ = "politicians"
+    # Composite (sort column, id) indexes back keyset pagination of the list view
+    __table_args__ = (
+        Index("ix_politicians_last_name_id", "last_name", "id"),
+        Index("ix_politicians_first_name_id", "first_name", "id"),
+        # Finds records that became stale between data-health runs
+        Index("ix_politicians_updated_at", "updated_at"),
+    )
     
     id: int = Field(default=None, primary_key=True)
     first_name: str
@@ -50,6 +59,8 @@ class Politician(AuditableBase, table=True):
     biography: Optional[str] = None
     official_website_url: Optional[str] = None
     
+    source: Optional[Source] = Relationship()
+
     # --- Relationships to dynamic career info ---
     positions: List["PoliticalPosition"] = Relationship(back_populates="politician")
     party_affiliations: List["PartyAffiliation"] = Relationship(back_populates="politician")
@@ -64,6 +75,11 @@ class Politician(AuditableBase, table=True):
 class PoliticalPosition(AuditableBase, table=True):
     """Tracks each office held by a politician over their career."""
     __tablename__ = "political_positions"
+    __table_args__ = (
+        Index("ix_political_positions_politician_start", "politician_id", "start_date"),
+        # Partial index over current positions only, used to resolve "the" current position
+        Index("ix_political_positions_current", "politician_id", "start_date", sqlite_where=text("is_current")),
+    )
     
     id: int = Field(default=None, primary_key=True)
     title: str  # e.g., "Senator", "Representative", "Governor"
@@ -79,6 +95,11 @@ class PoliticalPosition(AuditableBase, table=True):
 class PartyAffiliation(AuditableBase, table=True):
     """Tracks a politician's party history, as they can change parties."""
     __tablename__ = "party_affiliations"
+    __table_args__ = (
+        Index("ix_party_affiliations_politician_start", "politician_id", "start_date"),
+        # Partial index over open-ended (current) affiliations only
+        Index("ix_party_affiliations_current", "politician_id", "start_date", sqlite_where=text("end_date IS NULL")),
+    )
     
     id: int = Field(default=None, primary_key=True)
     party_name: str  # e.g., "Democratic", "Republican", "Independent"
@@ -96,11 +117,11 @@ class Bill(AuditableBase, table=True):
     bill_number: str = Field(index=True) # e.g., "H.R. 3233"
     title: str
     summary: Optional[str] = None
-    congress_session: int # e.g., 117 for the 117th Congress
+    congress_session: int = Field(index=True) # e.g., 117 for the 117th Congress
     introduced_date: date
     status: str # e.g., "Introduced", "Passed House", "Became Law"
     
-    sponsor_id: Optional[int] = Field(default=None, foreign_key="politicians.id")
+    sponsor_id: Optional[int] = Field(default=None, foreign_key="politicians.id", index=True)
     sponsor: Optional[Politician] = Relationship(back_populates="sponsored_bills")
     
     votes: List["Vote"] = Relationship(back_populates="bill")
@@ -108,6 +129,10 @@ class Bill(AuditableBase, table=True):
 class Vote(AuditableBase, table=True):
     """Records a specific politician's vote on a specific bill."""
     __tablename__ = "votes"
+    __table_args__ = (
+        Index("ix_votes_politician_date", "politician_id", "vote_date"),
+        Index("ix_votes_roll_call", "chamber", "roll_call_number"),
+    )
     
     id: int = Field(default=None, primary_key=True)
     vote_date: datetime
@@ -118,29 +143,50 @@ class Vote(AuditableBase, table=True):
     politician_id: int = Field(foreign_key="politicians.id")
     politician: Politician = Relationship(back_populates="votes")
     
-    bill_id: int = Field(foreign_key="bills.id")
+    bill_id: int = Field(foreign_key="bills.id", index=True)
     bill: Bill = Relationship(back_populates="votes")
 
+class Donor(SQLModel, table=True):
+    """
+    A donor of campaign donations and gifts, whatever the spelling of its
+    name on the individual records. Written by the entity resolution job in
+    server/donors.py.
+    """
+    __tablename__ = "donors"
+
+    id: int = Field(default=None, primary_key=True)
+    name: str # The most common spelling when the donor was created
+    normalized_name: str = Field(index=True)
+
 class Gift(AuditableBase, table=True):
     """A reported gift received by a politician."""
     __tablename__ = "gifts"
+    __table_args__ = (
+        Index("ix_gifts_recipient_date", "recipient_id", "report_date"),
+    )
     
     id: int = Field(default=None, primary_key=True)
     description: str
     value: float
     report_date: date
     donor: str  # The source of the gift itself
+    donor_id: Optional[int] = Field(default=None, foreign_key="donors.id", index=True) # Set by server/donors.py
     
     recipient_id: int = Field(foreign_key="politicians.id")
     recipient: Politician = Relationship(back_populates="gifts_received")
+    source: Optional[Source] = Relationship()
 
 class CampaignDonation(AuditableBase, table=True):
     """A single campaign finance donation."""
     __tablename__ = "campaign_donations"
+    __table_args__ = (
+        Index("ix_campaign_donations_recipient_date", "recipient_id", "date"),
+    )
 
     id: int = Field(default=None, primary_key=True)
     donor_name: str
     donor_type: str  # e.g., "Individual", "PAC", "Corporation"
+    donor_id: Optional[int] = Field(default=None, foreign_key="donors.id", index=True) # Set by server/donors.py
     amount: float
     date: date
     
@@ -150,6 +196,10 @@ class CampaignDonation(AuditableBase, table=True):
 class FinancialDisclosure(AuditableBase, table=True):
     """Links to a personal financial disclosure report (e.g., assets, liabilities)."""
     __tablename__ = "financial_disclosures"
+    __table_args__ = (
+        Index("ix_financial_disclosures_politician_filing", "politician_id", "filing_date"),
+        Index("ix_financial_disclosures_filing_date", "filing_date"),
+    )
 
     id: int = Field(default=None, primary_key=True)
     report_year: int
@@ -174,6 +224,9 @@ class Committee(AuditableBase, table=True):
 class CommitteeMembership(AuditableBase, table=True):
     """Association table linking politicians to committees over time."""
     __tablename__ = "committee_memberships"
+    __table_args__ = (
+        Index("ix_committee_memberships_politician_start", "politician_id", "start_date"),
+    )
     
     id: int = Field(default=None, primary_key=True)
     role: str # e.g., "Chair", "Ranking Member", "Member"
@@ -183,7 +236,7 @@ class CommitteeMembership(AuditableBase, table=True):
     politician_id: int = Field(foreign_key="politicians.id")
     politician: Politician = Relationship(back_populates="committee_memberships")
     
-    committee_id: int = Field(foreign_key="committees.id")
+    committee_id: int = Field(foreign_key="committees.id", index=True)
     committee: Committee = Relationship(back_populates="members")
 
 class SocialMediaAccount(AuditableBase, table=True):
@@ -193,5 +246,244 @@ class SocialMediaAccount(AuditableBase, table=True):
     platform: str  # "Twitter", "Facebook", "Instagram"
     handle_or_url: str
     
-    politician_id: int = Field(foreign_key="politicians.id")
+    politician_id: int = Field(foreign_key="politicians.id", index=True)
     politician: Politician = Relationship(back_populates="social_media_accounts")
+
+# --- Read Projections ---
+
+class PoliticianCurrentStatus(SQLModel, table=True):
+    """
+    One row per politician with their current party and position, so summary
+    views do not need to load career history. Maintained by the database
+    triggers in server/projections.py; not meant to be written directly.
+    """
+    __tablename__ = "politician_current_status"
+
+    politician_id: int = Field(primary_key=True, foreign_key="politicians.id")
+    party_name: Optional[str] = None
+    position_title: Optional[str] = None
+    jurisdiction: Optional[str] = None
+    chamber: Optional[Chamber] = None
+
+    # Lower-cased copies for case-insensitive filtering through an index
+    party_key: Optional[str] = Field(default=None, index=True)
+    jurisdiction_key: Optional[str] = Field(default=None, index=True)
+
+class DonationRollup(SQLModel, table=True):
+    """
+    Campaign donations summed per recipient, donor and month. Donations of a
+    resolved donor are filed under its name, whatever their own spelling.
+    Maintained by the database triggers in server/projections.py; not meant
+    to be written directly.
+    """
+    __tablename__ = "donation_rollups"
+
+    recipient_id: int = Field(primary_key=True, foreign_key="politicians.id")
+    cycle: int = Field(primary_key=True) # Two-year election cycle, named for its (even) election year
+    month: str = Field(primary_key=True) # "YYYY-MM"
+    donor_type: str = Field(primary_key=True)
+    donor_name: str = Field(primary_key=True)
+    donor_id: Optional[int] = Field(default=None, foreign_key="donors.id")
+    total_amount: float
+    donation_count: int
+
+class DonorTotal(SQLModel, table=True):
+    """
+    Campaign donations summed per donor and election cycle, across recipients.
+    Rows with cycle 0 hold all-time totals; resolved donors are filed as in
+    DonationRollup. Maintained by the database triggers in
+    server/projections.py; not meant to be written directly.
+    """
+    __tablename__ = "donor_totals"
+    __table_args__ = (
+        Index("ix_donor_totals_cycle_amount", "cycle", "total_amount"),
+        Index("ix_donor_totals_cycle_type_amount", "cycle", "donor_type", "total_amount"),
+    )
+
+    donor_name: str = Field(primary_key=True)
+    donor_type: str = Field(primary_key=True)
+    cycle: int = Field(primary_key=True)
+    donor_id: Optional[int] = Field(default=None, foreign_key="donors.id")
+    total_amount: float
+    donation_count: int
+
+class RollCall(SQLModel, table=True):
+    """
+    Vote tallies of one roll call on a bill. Maintained by the database
+    triggers in server/projections.py; not meant to be written directly.
+    """
+    __tablename__ = "roll_calls"
+
+    bill_id: int = Field(primary_key=True, foreign_key="bills.id")
+    chamber: Chamber = Field(primary_key=True)
+    roll_call_number: int = Field(primary_key=True)
+    vote_date: date = Field(primary_key=True)
+    yes_count: int
+    no_count: int
+    abstain_count: int
+    not_voting_count: int
+
+class RollCallPartyTally(SQLModel, table=True):
+    """
+    Vote tallies of one party's members on one roll call, by each member's
+    party on the day of the vote. Maintained by the database triggers in
+    server/projections.py; not meant to be written directly.
+    """
+    __tablename__ = "roll_call_party_tallies"
+
+    bill_id: int = Field(primary_key=True, foreign_key="bills.id")
+    chamber: Chamber = Field(primary_key=True)
+    roll_call_number: int = Field(primary_key=True)
+    vote_date: date = Field(primary_key=True)
+    party_name: str = Field(primary_key=True) # "Unknown" for members without a party on that day
+    yes_count: int
+    no_count: int
+    abstain_count: int
+    not_voting_count: int
+
+# --- Search Support ---
+
+class PoliticianNameTrigram(SQLModel, table=True):
+    """
+    Trigram postings over a politician's name parts, used for typo-tolerant
+    name search. Maintained by server/search.py and its database triggers
+    whenever a politician is written; not meant to be edited directly.
+    """
+    __tablename__ = "politician_name_trigrams"
+    # The primary key serves lookups by trigram; this covering index serves
+    # re-counting the candidates' trigrams without touching the table.
+    __table_args__ = (
+        Index("ix_politician_name_trigrams_politician", "politician_id", "trigram", "gram_count"),
+    )
+
+    trigram: str = Field(primary_key=True)
+    politician_id: int = Field(primary_key=True, foreign_key="politicians.id")
+    gram_count: int # Number of distinct trigrams in the politician's full name
+
+class PoliticianNamePending(SQLModel, table=True):
+    """
+    Politicians whose name was written without their trigrams being rewritten
+    (e.g. by raw SQL). Filled by the triggers in server/search.py and emptied
+    as their trigrams are written.
+    """
+    __tablename__ = "politician_name_pending"
+
+    politician_id: int = Field(primary_key=True)
+
+# --- Cache Support ---
+
+class TableVersion(SQLModel, table=True):
+    """
+    A write counter per table, shared by every process using the database.
+    Maintained by the database triggers in server/cache.py; not meant to be
+    written directly.
+    """
+    __tablename__ = "table_versions"
+
+    table_name: str = Field(primary_key=True)
+    version: int
+
+class PoliticianVersion(SQLModel, table=True):
+    """
+    A write counter per politician, bumped by every write that can change
+    their profile. Maintained by the database triggers in server/cache.py;
+    not meant to be written directly.
+    """
+    __tablename__ = "politician_versions"
+
+    politician_id: int = Field(primary_key=True)
+    version: int
+
+# --- Data Health ---
+
+class DataHealthIssue(SQLModel, table=True):
+    """
+    A missing or outdated piece of information on a politician's record.
+    Computed by server/data_health.py; not meant to be written directly.
+    """
+    __tablename__ = "data_issues"
+    __table_args__ = (
+        Index("ix_data_issues_politician_field", "politician_id", "field"),
+        Index("ix_data_issues_field_politician", "field", "politician_id"),
+    )
+
+    id: int = Field(default=None, primary_key=True) # Issues of one politician are listed in id order
+    politician_id: int = Field(foreign_key="politicians.id")
+    field: str # e.g., "biography", "positions", "financial_disclosures"
+    message: str
+
+class DataHealthPending(SQLModel, table=True):
+    """
+    Politicians whose records changed since the last data-health run. Filled
+    by the triggers in server/data_health.py and emptied by each run.
+    """
+    __tablename__ = "data_health_pending"
+
+    politician_id: int = Field(primary_key=True)
+
+class DataHealthRun(SQLModel, table=True):
+    """One completed data-health run."""
+    __tablename__ = "data_health_runs"
+
+    id: int = Field(default=None, primary_key=True)
+    ran_at: datetime
+    stale_cutoff: datetime # Records last updated before this were reported as stale
+    politicians_checked: int
+
+# --- Analytics ---
+
+class PartyUnityScore(SQLModel, table=True):
+    """
+    How often a member voted with their party's majority over one congress.
+    Computed in batch by server/analytics/party_unity.py.
+    """
+    __tablename__ = "party_unity_scores"
+    __table_args__ = (
+        Index("ix_party_unity_scores_session_score", "congress_session", "unity_score"),
+    )
+
+    congress_session: int = Field(primary_key=True)
+    politician_id: int = Field(primary_key=True, foreign_key="politicians.id")
+    party_name: str # The member's party at their last vote of the session
+    votes_counted: int # Roll calls where the member voted Yes/No and their party had a majority position
+    votes_with_party: int
+    unity_score: float # votes_with_party / votes_counted
+    computed_at: datetime
+
+class IdealPoint(SQLModel, table=True):
+    """
+    A member's ideological placement within one chamber over one congress.
+    Computed in batch by server/analytics/ideal_points.py.
+    """
+    __tablename__ = "ideal_points"
+    __table_args__ = (
+        Index("ix_ideal_points_session_chamber_dim1", "congress_session", "chamber", "dim1"),
+    )
+
+    congress_session: int = Field(primary_key=True)
+    chamber: Chamber = Field(primary_key=True)
+    politician_id: int = Field(primary_key=True, foreign_key="politicians.id")
+    party_name: Optional[str] = None # The member's party at their last vote of the session
+    dim1: float # First (main) dimension, in [-1, 1]
+    dim2: float # Second dimension; dim1 and dim2 lie within the unit circle
+    votes_scaled: int # Yes/No votes on the roll calls used for the placement
+    computed_at: datetime
+
+class MoneyVoteStat(SQLModel, table=True):
+    """
+    How money from one industry lines up with votes on its bills over one
+    congress. Computed in batch by server/analytics/money_votes.py.
+    """
+    __tablename__ = "money_vote_stats"
+
+    congress_session: int = Field(primary_key=True)
+    industry: str = Field(primary_key=True) # A key of server.analytics.industries.INDUSTRIES
+    bills_classified: int # Bills of the congress about this industry
+    members_counted: int # Members with enough Yes/No votes on those bills
+    members_funded: int # ... of whom received money from the industry's donors
+    total_amount: float # Donations and gifts from the industry to the counted members
+    correlation: Optional[float] = None # Pearson correlation of log(1 + money) and support across members
+    support_funded: Optional[float] = None # Mean share of Yes votes among funded members
+    support_unfunded: Optional[float] = None
+    lift: Optional[float] = None # P(support > 1/2 | funded) / P(support > 1/2)
+    computed_at: datetime
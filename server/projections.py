@@ -0,0 +1,332 @@
+"""
+Read projections maintained by SQLite triggers.
+
+Each projection is a plain table (declared in server/models.py) that the
+database keeps up to date from triggers on its source tables. Because triggers
+run inside the writing statement's transaction, a projection can never be seen
+out of step with its sources, whichever client did the write.
+
+Importing this module registers an ``after_create`` hook on the SQLModel
+metadata that installs the triggers and backfills newly created projections.
+"""
+import re
+from typing import List
+
+from sqlalchemy import event
+from sqlmodel import SQLModel
+
+
+# --- politician_current_status ---
+
+def _refresh_current_status(politician_ref: str) -> str:
+    """SQL that recomputes the current-status row of the politician ``politician_ref``."""
+    return f"""
+        INSERT OR REPLACE INTO politician_current_status
+            (politician_id, party_name, party_key, position_title, jurisdiction, jurisdiction_key, chamber)
+        SELECT p.id,
+               pa.party_name, lower(pa.party_name),
+               pos.title, pos.jurisdiction, lower(pos.jurisdiction), pos.chamber
+        FROM politicians AS p
+        LEFT JOIN party_affiliations AS pa ON pa.id = (
+            SELECT id FROM party_affiliations
+            WHERE politician_id = p.id AND end_date IS NULL
+            ORDER BY start_date DESC, id DESC LIMIT 1
+        )
+        LEFT JOIN political_positions AS pos ON pos.id = (
+            SELECT id FROM political_positions
+            WHERE politician_id = p.id AND is_current
+            ORDER BY start_date DESC, id DESC LIMIT 1
+        )
+        WHERE {politician_ref};
+    """
+
+
+CURRENT_STATUS_TRIGGERS: List[str] = [
+    f"""CREATE TRIGGER IF NOT EXISTS politician_current_status_politician_ai
+        AFTER INSERT ON politicians
+        BEGIN {_refresh_current_status("p.id = NEW.id")} END""",
+    """CREATE TRIGGER IF NOT EXISTS politician_current_status_politician_ad
+        AFTER DELETE ON politicians
+        BEGIN DELETE FROM politician_current_status WHERE politician_id = OLD.id; END""",
+]
+for _table, _columns in (
+    ("political_positions", "politician_id, title, jurisdiction, chamber, start_date, is_current"),
+    ("party_affiliations", "politician_id, party_name, start_date, end_date"),
+):
+    CURRENT_STATUS_TRIGGERS += [
+        f"""CREATE TRIGGER IF NOT EXISTS politician_current_status_{_table}_ai
+            AFTER INSERT ON {_table}
+            BEGIN {_refresh_current_status("p.id = NEW.politician_id")} END""",
+        f"""CREATE TRIGGER IF NOT EXISTS politician_current_status_{_table}_au
+            AFTER UPDATE OF {_columns} ON {_table}
+            BEGIN
+                {_refresh_current_status("p.id = OLD.politician_id")}
+                {_refresh_current_status("p.id = NEW.politician_id")}
+            END""",
+        f"""CREATE TRIGGER IF NOT EXISTS politician_current_status_{_table}_ad
+            AFTER DELETE ON {_table}
+            BEGIN {_refresh_current_status("p.id = OLD.politician_id")} END""",
+    ]
+
+
+# --- donation_rollups and donor_totals ---
+
+# All-time rows of donor_totals use this in place of an election cycle
+ALL_CYCLES = 0
+
+
+def _election_cycle(date_ref: str) -> str:
+    """SQL for the two-year election cycle of the date ``date_ref``, named for its (even) election year."""
+    year = f"CAST(strftime('%Y', {date_ref}) AS INTEGER)"
+    return f"({year} + {year} % 2)"
+
+
+def _donor_name(row: str) -> str:
+    """SQL for the name a donation ``row`` is filed under: its donor's name once resolved, else its own."""
+    return f"COALESCE((SELECT name FROM donors WHERE id = {row}.donor_id), {row}.donor_name)"
+
+
+def _add_donation(row: str, sign: str) -> str:
+    """
+    SQL that adds (``sign`` "+") or removes ("-") the donation ``row`` (NEW or
+    OLD) to or from the rollups, dropping rollup rows that reach zero donations.
+    """
+    statement = f"""
+        INSERT INTO donation_rollups
+            (recipient_id, cycle, month, donor_type, donor_name, donor_id, total_amount, donation_count)
+        VALUES ({row}.recipient_id, {_election_cycle(f"{row}.date")}, strftime('%Y-%m', {row}.date),
+                {row}.donor_type, {_donor_name(row)}, {row}.donor_id, {sign}{row}.amount, {sign}1)
+        ON CONFLICT (recipient_id, cycle, month, donor_type, donor_name) DO UPDATE SET
+            donor_id = COALESCE(excluded.donor_id, donor_id),
+            total_amount = total_amount + excluded.total_amount,
+            donation_count = donation_count + excluded.donation_count;
+    """
+    for cycle in (_election_cycle(f"{row}.date"), str(ALL_CYCLES)):
+        statement += f"""
+            INSERT INTO donor_totals (donor_name, donor_type, cycle, donor_id, total_amount, donation_count)
+            VALUES ({_donor_name(row)}, {row}.donor_type, {cycle}, {row}.donor_id, {sign}{row}.amount, {sign}1)
+            ON CONFLICT (donor_name, donor_type, cycle) DO UPDATE SET
+                donor_id = COALESCE(excluded.donor_id, donor_id),
+                total_amount = total_amount + excluded.total_amount,
+                donation_count = donation_count + excluded.donation_count;
+        """
+    if sign == "-":
+        statement += f"""
+            DELETE FROM donation_rollups
+            WHERE recipient_id = {row}.recipient_id AND cycle = {_election_cycle(f"{row}.date")}
+              AND month = strftime('%Y-%m', {row}.date) AND donor_type = {row}.donor_type
+              AND donor_name = {_donor_name(row)} AND donation_count = 0;
+            DELETE FROM donor_totals
+            WHERE donor_name = {_donor_name(row)} AND donor_type = {row}.donor_type
+              AND cycle IN ({_election_cycle(f"{row}.date")}, {ALL_CYCLES}) AND donation_count = 0;
+        """
+    return statement
+
+
+DONATION_ROLLUP_TRIGGERS: List[str] = [
+    f"""CREATE TRIGGER IF NOT EXISTS donation_rollups_ai
+        AFTER INSERT ON campaign_donations
+        BEGIN {_add_donation("NEW", "+")} END""",
+    f"""CREATE TRIGGER IF NOT EXISTS donation_rollups_au
+        AFTER UPDATE OF recipient_id, donor_name, donor_type, donor_id, amount, date ON campaign_donations
+        BEGIN
+            {_add_donation("OLD", "-")}
+            {_add_donation("NEW", "+")}
+        END""",
+    f"""CREATE TRIGGER IF NOT EXISTS donation_rollups_ad
+        AFTER DELETE ON campaign_donations
+        BEGIN {_add_donation("OLD", "-")} END""",
+]
+
+# Rebuild the rollups from scratch, for when they are first created
+_BACKFILL_DONATION_ROLLUPS = [
+    "DELETE FROM donation_rollups",
+    f"""INSERT INTO donation_rollups
+            (recipient_id, cycle, month, donor_type, donor_name, donor_id, total_amount, donation_count)
+        SELECT d.recipient_id, {_election_cycle("d.date")}, strftime('%Y-%m', d.date), d.donor_type,
+               COALESCE(donors.name, d.donor_name), max(d.donor_id), sum(d.amount), count(*)
+        FROM campaign_donations AS d
+        LEFT JOIN donors ON donors.id = d.donor_id
+        GROUP BY 1, 2, 3, 4, 5""",
+    "DELETE FROM donor_totals",
+    """INSERT INTO donor_totals (donor_name, donor_type, cycle, donor_id, total_amount, donation_count)
+        SELECT donor_name, donor_type, cycle, max(donor_id), sum(total_amount), sum(donation_count)
+        FROM donation_rollups
+        GROUP BY 1, 2, 3""",
+    f"""INSERT INTO donor_totals (donor_name, donor_type, cycle, donor_id, total_amount, donation_count)
+        SELECT donor_name, donor_type, {ALL_CYCLES}, max(donor_id), sum(total_amount), sum(donation_count)
+        FROM donation_rollups
+        GROUP BY 1, 2""",
+]
+
+
+# --- roll_calls and roll_call_party_tallies ---
+
+# Party of members without a party affiliation on the day of a vote
+UNKNOWN_PARTY = "Unknown"
+
+_ROLL_CALL_KEY = "bill_id, chamber, roll_call_number, vote_date"
+_TALLY_COLUMNS = "yes_count, no_count, abstain_count, not_voting_count"
+_ADD_TALLIES = ", ".join(f"{column} = {column} + excluded.{column}" for column in _TALLY_COLUMNS.split(", "))
+_NO_TALLIES = " AND ".join(f"{column} = 0" for column in _TALLY_COLUMNS.split(", "))
+
+
+def party_on_date(politician_id: str, day: str) -> str:
+    """SQL subquery for the party of ``politician_id`` on ``day`` (both SQL expressions); NULL if none."""
+    return f"""(
+        SELECT pa.party_name FROM party_affiliations AS pa
+        WHERE pa.politician_id = {politician_id} AND pa.start_date <= {day}
+          AND (pa.end_date IS NULL OR pa.end_date >= {day})
+        ORDER BY pa.start_date DESC, pa.id DESC LIMIT 1
+    )"""
+
+
+def _party_at_vote(vote: str) -> str:
+    """SQL for the party of the member who cast ``vote`` on the day they cast it."""
+    return f"COALESCE({party_on_date(f'{vote}.politician_id', f'date({vote}.vote_date)')}, '{UNKNOWN_PARTY}')"
+
+
+def _position_counts(vote: str, aggregate: str = "") -> str:
+    """SQL for the four tally values of ``vote`` (summed with ``aggregate`` "sum")."""
+    return ", ".join(
+        f"{aggregate}({vote}.position = '{position}')"
+        for position in ("YES", "NO", "ABSTAIN", "NOT_VOTING")
+    )
+
+
+def _tally_vote(row: str, sign: str) -> str:
+    """SQL that adds (``sign`` "+") or removes ("-") the vote ``row`` (NEW or OLD) to or from the tallies."""
+    key = f"{row}.bill_id, {row}.chamber, {row}.roll_call_number, date({row}.vote_date)"
+    counts = ", ".join(f"{sign}{count}" for count in _position_counts(row).split(", "))
+    statement = f"""
+        INSERT INTO roll_calls ({_ROLL_CALL_KEY}, {_TALLY_COLUMNS})
+        VALUES ({key}, {counts})
+        ON CONFLICT ({_ROLL_CALL_KEY}) DO UPDATE SET {_ADD_TALLIES};
+        INSERT INTO roll_call_party_tallies ({_ROLL_CALL_KEY}, party_name, {_TALLY_COLUMNS})
+        VALUES ({key}, {_party_at_vote(row)}, {counts})
+        ON CONFLICT ({_ROLL_CALL_KEY}, party_name) DO UPDATE SET {_ADD_TALLIES};
+    """
+    if sign == "-":
+        for table in ("roll_calls", "roll_call_party_tallies"):
+            statement += f"""
+                DELETE FROM {table}
+                WHERE ({_ROLL_CALL_KEY}) = ({key}) AND {_NO_TALLIES};
+            """
+    return statement
+
+
+def _tally_member_votes(politician_ref: str, since_ref: str, sign: str) -> str:
+    """
+    SQL that adds (``sign`` "+") or removes ("-") the party tallies of the
+    votes ``politician_ref`` cast on or after ``since_ref``, by their party as
+    currently recorded.
+    """
+    statement = f"""
+        INSERT INTO roll_call_party_tallies ({_ROLL_CALL_KEY}, party_name, {_TALLY_COLUMNS})
+        SELECT v.bill_id, v.chamber, v.roll_call_number, date(v.vote_date), {_party_at_vote("v")},
+               {", ".join(f"{sign}{count}" for count in _position_counts("v", "sum").split(", "))}
+        FROM votes AS v
+        WHERE v.politician_id = {politician_ref} AND v.vote_date >= {since_ref}
+        GROUP BY 1, 2, 3, 4, 5
+        ON CONFLICT ({_ROLL_CALL_KEY}, party_name) DO UPDATE SET {_ADD_TALLIES};
+    """
+    if sign == "+":
+        statement += f"""
+            DELETE FROM roll_call_party_tallies
+            WHERE {_NO_TALLIES} AND ({_ROLL_CALL_KEY}) IN (
+                SELECT v.bill_id, v.chamber, v.roll_call_number, date(v.vote_date)
+                FROM votes AS v
+                WHERE v.politician_id = {politician_ref} AND v.vote_date >= {since_ref}
+            );
+        """
+    return statement
+
+
+# A change to a member's party affiliations can move their votes on or after
+# the affiliation's start between parties: take those votes out of the party
+# tallies before the change and put them back after it.
+_AFFILIATION_CHANGES = {
+    "INSERT": [("NEW.politician_id", "NEW.start_date")],
+    "DELETE": [("OLD.politician_id", "OLD.start_date")],
+    "UPDATE": [
+        ("OLD.politician_id", "min(OLD.start_date, NEW.start_date)"),
+        ("NEW.politician_id", "NEW.start_date"),
+    ],
+}
+
+ROLL_CALL_TRIGGERS: List[str] = [
+    f"""CREATE TRIGGER IF NOT EXISTS roll_calls_votes_ai
+        AFTER INSERT ON votes
+        BEGIN {_tally_vote("NEW", "+")} END""",
+    f"""CREATE TRIGGER IF NOT EXISTS roll_calls_votes_au
+        AFTER UPDATE OF bill_id, chamber, roll_call_number, vote_date, position, politician_id ON votes
+        BEGIN
+            {_tally_vote("OLD", "-")}
+            {_tally_vote("NEW", "+")}
+        END""",
+    f"""CREATE TRIGGER IF NOT EXISTS roll_calls_votes_ad
+        AFTER DELETE ON votes
+        BEGIN {_tally_vote("OLD", "-")} END""",
+]
+for _event, _members in _AFFILIATION_CHANGES.items():
+    # An update that moves the affiliation to another member touches both members' votes
+    _guard = "WHEN OLD.politician_id <> NEW.politician_id" if _event == "UPDATE" else ""
+    _of = "OF politician_id, party_name, start_date, end_date " if _event == "UPDATE" else ""
+    for _timing, _sign in (("BEFORE", "-"), ("AFTER", "+")):
+        ROLL_CALL_TRIGGERS.append(
+            f"""CREATE TRIGGER IF NOT EXISTS roll_call_party_tallies_{_event.lower()}_{_timing.lower()}
+                {_timing} {_event} {_of}ON party_affiliations
+                BEGIN {_tally_member_votes(*_members[0], _sign)} END"""
+        )
+        if len(_members) > 1:
+            ROLL_CALL_TRIGGERS.append(
+                f"""CREATE TRIGGER IF NOT EXISTS roll_call_party_tallies_{_event.lower()}_moved_{_timing.lower()}
+                    {_timing} {_event} {_of}ON party_affiliations {_guard}
+                    BEGIN {_tally_member_votes(*_members[1], _sign)} END"""
+            )
+
+# Rebuild the tallies from scratch, for when they are first created
+_BACKFILL_ROLL_CALLS = [
+    "DELETE FROM roll_calls",
+    f"""INSERT INTO roll_calls ({_ROLL_CALL_KEY}, {_TALLY_COLUMNS})
+        SELECT v.bill_id, v.chamber, v.roll_call_number, date(v.vote_date), {_position_counts("v", "sum")}
+        FROM votes AS v
+        GROUP BY 1, 2, 3, 4""",
+    "DELETE FROM roll_call_party_tallies",
+    f"""INSERT INTO roll_call_party_tallies ({_ROLL_CALL_KEY}, party_name, {_TALLY_COLUMNS})
+        SELECT v.bill_id, v.chamber, v.roll_call_number, date(v.vote_date), {_party_at_vote("v")},
+               {_position_counts("v", "sum")}
+        FROM votes AS v
+        GROUP BY 1, 2, 3, 4, 5""",
+]
+
+
+_TRIGGER_NAME = re.compile(r"CREATE TRIGGER IF NOT EXISTS (\w+)")
+
+
+def create_projections(target, connection, tables=(), **kw):
+    """
+    Install projection triggers and backfill projections created by this ``create_all``.
+
+    Registered as an ``after_create`` hook on the SQLModel metadata, so the
+    source tables are guaranteed to exist by the time the triggers are created.
+    """
+    if connection.dialect.name != "sqlite":
+        return
+    created = {table.name for table in tables}
+    for statement in (*CURRENT_STATUS_TRIGGERS, *DONATION_ROLLUP_TRIGGERS, *ROLL_CALL_TRIGGERS):
+        # Replace any existing trigger, so a database created by an older
+        # version picks up the current definitions
+        connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {_TRIGGER_NAME.search(statement).group(1)}")
+        connection.exec_driver_sql(statement)
+    if "politician_current_status" in created:
+        connection.exec_driver_sql(_refresh_current_status("1"))
+    if created & {"donation_rollups", "donor_totals"}:
+        for statement in _BACKFILL_DONATION_ROLLUPS:
+            connection.exec_driver_sql(statement)
+    if created & {"roll_calls", "roll_call_party_tallies"}:
+        for statement in _BACKFILL_ROLL_CALLS:
+            connection.exec_driver_sql(statement)
+
+
+event.listen(SQLModel.metadata, "after_create", create_projections)
@@ -0,0 +1,459 @@
+"""
+Full-text search support backed by SQLite FTS5.
+
+Three external-content FTS5 tables index politician names, bill titles/summaries
+and committee names. Triggers on the source tables keep them in sync, so any
+writer (the API, the seed script, raw sqlite3) updates the index in the same
+transaction as the row itself.
+
+Typo-tolerant name matching uses a separate trigram postings table
+(``politician_name_trigrams``). Folding names into trigrams takes Python, so
+ORM writes index a politician's name as they go, while triggers drop the
+postings of any changed name and queue the politician in
+``politician_name_pending``, whichever client did the write. Fuzzy search
+scores queued names directly, and startup indexes them.
+
+Name autocomplete is served from ``name_suggester``, an in-process sorted index
+that never touches the database once loaded.
+"""
+import bisect
+import math
+import re
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import delete, event, insert, inspect, text
+from sqlmodel import SQLModel, Session, select, func, col
+
+from server.models import Politician, PoliticianNamePending, PoliticianNameTrigram
+
+
+class FtsIndex(NamedTuple):
+    """Describes an FTS5 index over the text columns of a content table."""
+    name: str
+    content_table: str
+    columns: Tuple[str, ...]
+
+
+POLITICIAN_INDEX = FtsIndex("politicians_fts", "politicians", ("first_name", "middle_name", "last_name", "suffix"))
+BILL_INDEX = FtsIndex("bills_fts", "bills", ("title", "summary"))
+COMMITTEE_INDEX = FtsIndex("committees_fts", "committees", ("name",))
+
+SEARCH_INDEXES = (POLITICIAN_INDEX, BILL_INDEX, COMMITTEE_INDEX)
+
+# bm25() returns negative numbers where lower is better, so a weight above 1
+# pulls matches from that source towards the top of the ranking.
+NAME_MATCH_WEIGHT = 4.0
+COMMITTEE_MATCH_WEIGHT = 1.5
+BILL_MATCH_WEIGHT = 1.0
+
+
+def _index_ddl(index: FtsIndex) -> List[str]:
+    """Build the CREATE statements for an FTS5 table and its sync triggers."""
+    cols = ", ".join(index.columns)
+    new_values = ", ".join(f"new.{c}" for c in index.columns)
+    old_values = ", ".join(f"old.{c}" for c in index.columns)
+    insert_new = (
+        f"INSERT INTO {index.name}(rowid, {cols}) VALUES (new.id, {new_values});"
+    )
+    delete_old = (
+        f"INSERT INTO {index.name}({index.name}, rowid, {cols}) "
+        f"VALUES ('delete', old.id, {old_values});"
+    )
+    return [
+        f"CREATE VIRTUAL TABLE {index.name} USING fts5("
+        f"{cols}, content='{index.content_table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER {index.name}_ai AFTER INSERT ON {index.content_table} BEGIN {insert_new} END",
+        f"CREATE TRIGGER {index.name}_ad AFTER DELETE ON {index.content_table} BEGIN {delete_old} END",
+        f"CREATE TRIGGER {index.name}_au AFTER UPDATE OF {cols} ON {index.content_table} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def create_search_indexes(target, connection, **kw):
+    """
+    Create any missing FTS5 tables and triggers, then backfill them.
+
+    Registered as an ``after_create`` hook on the SQLModel metadata, so it runs
+    on every ``create_all`` and upgrades databases that predate the index.
+    """
+    if connection.dialect.name != "sqlite":
+        return
+    for index in SEARCH_INDEXES:
+        exists = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (index.name,)
+        ).first()
+        if exists:
+            continue
+        for statement in _index_ddl(index):
+            connection.exec_driver_sql(statement)
+        connection.exec_driver_sql(f"INSERT INTO {index.name}({index.name}) VALUES ('rebuild')")
+
+
+event.listen(SQLModel.metadata, "after_create", create_search_indexes)
+
+
+def build_match_query(q: str) -> Optional[str]:
+    """
+    Turn free user input into an FTS5 MATCH expression.
+
+    Every token is quoted (so FTS5 operators in the input are inert) and made a
+    prefix match, which keeps results useful while the user is still typing.
+    """
+    tokens = re.findall(r"\w+", q.lower())
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+# Caps on how many bills and committees a term may expand to. A popular term
+# such as "act" matches thousands of bills, and every bill fans out to hundreds
+# of votes, so only the most relevant ones take part in the ranking. This keeps
+# the cost of a search bounded by these caps and the page size rather than by
+# how common the term is. `candidates_truncated` tells when a cap was reached.
+MAX_BILL_CANDIDATES = 100
+MAX_COMMITTEE_CANDIDATES = 50
+
+# Stops reading each index one match past its cap, whatever the term
+_CANDIDATES_TRUNCATED_SQL = text(f"""
+    SELECT (
+        SELECT count(*) FROM (
+            SELECT 1 FROM {BILL_INDEX.name} WHERE {BILL_INDEX.name} MATCH :match LIMIT :bill_candidates + 1
+        )
+    ) > :bill_candidates OR (
+        SELECT count(*) FROM (
+            SELECT 1 FROM {COMMITTEE_INDEX.name} WHERE {COMMITTEE_INDEX.name} MATCH :match
+            LIMIT :committee_candidates + 1
+        )
+    ) > :committee_candidates
+""")
+
+_RANKED_POLITICIANS_SQL = text(f"""
+    WITH hits(politician_id, score) AS (
+        SELECT rowid, bm25({POLITICIAN_INDEX.name}) * :name_weight
+        FROM {POLITICIAN_INDEX.name}
+        WHERE {POLITICIAN_INDEX.name} MATCH :match
+        UNION ALL
+        SELECT votes.politician_id, matched.score * :bill_weight
+        FROM (
+            SELECT rowid AS bill_id, bm25({BILL_INDEX.name}) AS score
+            FROM {BILL_INDEX.name}
+            WHERE {BILL_INDEX.name} MATCH :match
+            ORDER BY score
+            LIMIT :bill_candidates
+        ) AS matched
+        JOIN votes ON votes.bill_id = matched.bill_id
+        UNION ALL
+        SELECT committee_memberships.politician_id, matched.score * :committee_weight
+        FROM (
+            SELECT rowid AS committee_id, bm25({COMMITTEE_INDEX.name}) AS score
+            FROM {COMMITTEE_INDEX.name}
+            WHERE {COMMITTEE_INDEX.name} MATCH :match
+            ORDER BY score
+            LIMIT :committee_candidates
+        ) AS matched
+        JOIN committee_memberships ON committee_memberships.committee_id = matched.committee_id
+    )
+    SELECT politician_id, MIN(score) AS score
+    FROM hits
+    GROUP BY politician_id
+    HAVING (MIN(score), politician_id) > (:after_score, :after_id)
+    ORDER BY score, politician_id
+    LIMIT :limit
+""")
+
+
+def rank_politicians(
+    db: Session,
+    q: str,
+    limit: int,
+    after: Optional[Tuple[float, int]] = None,
+) -> List[Tuple[int, float]]:
+    """
+    Return up to ``limit`` ``(politician_id, score)`` pairs matching ``q``, best match first.
+
+    A politician matches on their own name, the title or summary of a bill they
+    voted on, or the name of a committee they sit on; their score is the best
+    bm25 score across those sources (lower is more relevant). ``after`` is the
+    ``(score, politician_id)`` of the last row of the previous page.
+    """
+    match = build_match_query(q)
+    if match is None:
+        return []
+    after_score, after_id = after if after is not None else (float("-inf"), 0)
+    rows = db.execute(
+        _RANKED_POLITICIANS_SQL,
+        {
+            "match": match,
+            "name_weight": NAME_MATCH_WEIGHT,
+            "bill_weight": BILL_MATCH_WEIGHT,
+            "committee_weight": COMMITTEE_MATCH_WEIGHT,
+            "bill_candidates": MAX_BILL_CANDIDATES,
+            "committee_candidates": MAX_COMMITTEE_CANDIDATES,
+            "after_score": after_score,
+            "after_id": after_id,
+            "limit": limit,
+        },
+    ).all()
+    return [(row.politician_id, row.score) for row in rows]
+
+
+def candidates_truncated(db: Session, q: str) -> bool:
+    """
+    Whether ``q`` matches more bills or committees than `rank_politicians`
+    expands (MAX_BILL_CANDIDATES, MAX_COMMITTEE_CANDIDATES). If so, members
+    linked to the term only through the less relevant ones are not ranked.
+    """
+    match = build_match_query(q)
+    if match is None:
+        return False
+    return bool(db.execute(
+        _CANDIDATES_TRUNCATED_SQL,
+        {"match": match, "bill_candidates": MAX_BILL_CANDIDATES, "committee_candidates": MAX_COMMITTEE_CANDIDATES},
+    ).scalar())
+
+
+# --- Typo-tolerant name matching ---
+
+NAME_FIELDS = ("first_name", "middle_name", "last_name", "suffix")
+
+# Minimum share of the query's trigrams a name must contain to be returned.
+# "Shumer" shares 5 of its 7 trigrams with "Schumer".
+FUZZY_MATCH_THRESHOLD = 0.5
+
+
+def _fold(value: str) -> List[str]:
+    """Lowercase ``value``, strip accents and split it into alphanumeric words."""
+    folded = unicodedata.normalize("NFKD", value.lower())
+    folded = "".join(ch for ch in folded if not unicodedata.combining(ch))
+    return re.findall(r"[a-z0-9]+", folded)
+
+
+def trigrams(value: str) -> Set[str]:
+    """
+    Split ``value`` into the set of trigrams of its words.
+
+    Text is lowercased and stripped of accents, and each word is padded with
+    two leading spaces and one trailing space (as PostgreSQL's pg_trgm does), so
+    word starts weigh more than word middles.
+    """
+    grams = set()
+    for word in _fold(value):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _name_trigrams(names: Iterable[Optional[str]]) -> Set[str]:
+    return trigrams(" ".join(name for name in names if name))
+
+
+def _write_name_trigrams(connection, politician_id: int, names: Iterable[Optional[str]]) -> None:
+    connection.execute(
+        delete(PoliticianNameTrigram).where(col(PoliticianNameTrigram.politician_id) == politician_id)
+    )
+    grams = _name_trigrams(names)
+    if grams:
+        connection.execute(
+            insert(PoliticianNameTrigram),
+            [{"trigram": gram, "politician_id": politician_id, "gram_count": len(grams)} for gram in grams],
+        )
+    connection.execute(
+        delete(PoliticianNamePending).where(col(PoliticianNamePending.politician_id) == politician_id)
+    )
+
+
+_NAME_COLUMNS = ", ".join(NAME_FIELDS)
+
+NAME_TRIGRAM_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS politician_name_trigrams_ai AFTER INSERT ON politicians
+        BEGIN INSERT OR IGNORE INTO politician_name_pending (politician_id) VALUES (NEW.id); END""",
+    f"""CREATE TRIGGER IF NOT EXISTS politician_name_trigrams_au AFTER UPDATE OF id, {_NAME_COLUMNS} ON politicians
+        BEGIN
+            DELETE FROM politician_name_trigrams WHERE politician_id = OLD.id;
+            INSERT OR IGNORE INTO politician_name_pending (politician_id) VALUES (NEW.id);
+        END""",
+    """CREATE TRIGGER IF NOT EXISTS politician_name_trigrams_ad AFTER DELETE ON politicians
+        BEGIN
+            DELETE FROM politician_name_trigrams WHERE politician_id = OLD.id;
+            DELETE FROM politician_name_pending WHERE politician_id = OLD.id;
+        END""",
+]
+
+
+def _pending_names_query():
+    """Select the id and name parts of every queued politician."""
+    return select(Politician.id, *(getattr(Politician, f) for f in NAME_FIELDS)).where(
+        col(Politician.id).in_(select(PoliticianNamePending.politician_id))
+    )
+
+
+@event.listens_for(Politician, "after_insert")
+def _index_new_politician_name(mapper, connection, target):
+    _write_name_trigrams(connection, target.id, (getattr(target, f) for f in NAME_FIELDS))
+
+
+@event.listens_for(Politician, "after_update")
+def _reindex_politician_name(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[f].history.has_changes() for f in NAME_FIELDS):
+        _write_name_trigrams(connection, target.id, (getattr(target, f) for f in NAME_FIELDS))
+
+
+def index_pending_names(target, connection, tables=(), **kw):
+    """
+    Install the name triggers and index every queued name; registered as an
+    ``after_create`` hook, so startup catches up on names written outside the
+    ORM. When the trigram table is new, every existing politician is queued.
+    """
+    if connection.dialect.name != "sqlite":
+        return
+    for statement in NAME_TRIGRAM_TRIGGERS:
+        connection.exec_driver_sql(statement)
+    if PoliticianNameTrigram.__table__ in tables:
+        connection.exec_driver_sql(
+            "INSERT OR IGNORE INTO politician_name_pending (politician_id) SELECT id FROM politicians"
+        )
+    for row in connection.execute(_pending_names_query()).all():
+        _write_name_trigrams(connection, row[0], row[1:])
+
+
+event.listen(SQLModel.metadata, "after_create", index_pending_names)
+
+
+def fuzzy_match_politicians(db: Session, q: str, limit: int) -> List[Tuple[int, float]]:
+    """
+    Return up to ``limit`` ``(politician_id, similarity)`` pairs for names resembling ``q``.
+
+    Similarity is the share of the query's trigrams found in the name, with
+    shorter names winning ties, and a name must reach ``FUZZY_MATCH_THRESHOLD``.
+
+    Candidates come from the trigram index. A name sharing at least
+    ``min_shared`` of the query's ``n`` trigrams must contain one of any
+    ``n - min_shared + 1`` of them, so only the postings of the rarest grams are
+    used to find candidates and the common ones ("  s", "er ") are just counted.
+    Names still queued in ``politician_name_pending`` are scored directly.
+    """
+    grams = trigrams(q)
+    if not grams:
+        return []
+    min_shared = max(1, math.ceil(FUZZY_MATCH_THRESHOLD * len(grams)))
+
+    frequencies = dict(db.exec(
+        select(PoliticianNameTrigram.trigram, func.count())
+        .where(col(PoliticianNameTrigram.trigram).in_(grams))
+        .group_by(PoliticianNameTrigram.trigram)
+    ).all())
+    rarest = sorted(grams, key=lambda gram: frequencies.get(gram, 0))[:len(grams) - min_shared + 1]
+    rarest = [gram for gram in rarest if gram in frequencies]
+
+    # (politician_id, shared trigrams, trigrams in the name)
+    matches: List[Tuple[int, int, int]] = []
+    if rarest:
+        candidates = (
+            select(PoliticianNameTrigram.politician_id)
+            .where(col(PoliticianNameTrigram.trigram).in_(rarest))
+        )
+        shared = func.count().label("shared")
+        gram_count = func.max(PoliticianNameTrigram.gram_count).label("gram_count")
+        query = (
+            select(PoliticianNameTrigram.politician_id, shared, gram_count)
+            .where(
+                col(PoliticianNameTrigram.politician_id).in_(candidates),
+                col(PoliticianNameTrigram.trigram).in_(grams),
+            )
+            .group_by(PoliticianNameTrigram.politician_id)
+            .having(shared >= min_shared)
+            .order_by(shared.desc(), gram_count, PoliticianNameTrigram.politician_id)
+            .limit(limit)
+        )
+        matches = [(row.politician_id, row.shared, row.gram_count) for row in db.exec(query).all()]
+
+    # Queued names have no postings yet (a changed name's old ones are dropped)
+    for row in db.execute(_pending_names_query()).all():
+        name_grams = _name_trigrams(row[1:])
+        if len(grams & name_grams) >= min_shared:
+            matches.append((row[0], len(grams & name_grams), len(name_grams)))
+
+    matches.sort(key=lambda match: (-match[1], match[2], match[0]))
+    return [(politician_id, shared / len(grams)) for politician_id, shared, _ in matches[:limit]]
+
+
+# --- In-memory name autocomplete ---
+
+class NameSuggester:
+    """
+    Sorted in-memory index of normalized politician names for prefix lookups.
+
+    Every politician is indexed under each word-boundary suffix of their full
+    name, so "alexandria ocasio cortez" is found by "alex", "ocasio c" and
+    "cort". Lookups are a binary search plus a short walk, so they cost
+    microseconds and never touch the database.
+
+    The index is per process: it is loaded at startup and kept current by the
+    API's own create/update handlers, so rows written by other processes only
+    appear after a restart.
+    """
+
+    def __init__(self):
+        self._keys: List[Tuple[str, int]] = []
+        self._keys_by_id: Dict[int, List[Tuple[str, int]]] = {}
+        self._names: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _index_keys(politician_id: int, names: Iterable[Optional[str]]) -> List[Tuple[str, int]]:
+        words = _fold(" ".join(name for name in names if name))
+        return sorted({(" ".join(words[i:]), politician_id) for i in range(len(words))})
+
+    def load(self, db: Session) -> None:
+        """Rebuild the index from every politician in the database."""
+        rows = db.exec(select(Politician.id, *(getattr(Politician, f) for f in NAME_FIELDS))).all()
+        keys_by_id = {row[0]: self._index_keys(row[0], row[1:]) for row in rows}
+        names = {row.id: f"{row.first_name} {row.last_name}" for row in rows}
+        keys = sorted(key for politician_keys in keys_by_id.values() for key in politician_keys)
+        with self._lock:
+            self._keys, self._keys_by_id, self._names = keys, keys_by_id, names
+
+    def _remove_locked(self, politician_id: int) -> None:
+        for key in self._keys_by_id.pop(politician_id, []):
+            index = bisect.bisect_left(self._keys, key)
+            if index < len(self._keys) and self._keys[index] == key:
+                del self._keys[index]
+        self._names.pop(politician_id, None)
+
+    def upsert(self, politician: Politician) -> None:
+        """Add a politician to the index, replacing any previous entry for them."""
+        keys = self._index_keys(politician.id, (getattr(politician, f) for f in NAME_FIELDS))
+        with self._lock:
+            self._remove_locked(politician.id)
+            for key in keys:
+                bisect.insort(self._keys, key)
+            self._keys_by_id[politician.id] = keys
+            self._names[politician.id] = f"{politician.first_name} {politician.last_name}"
+
+    def remove(self, politician_id: int) -> None:
+        """Drop a politician from the index."""
+        with self._lock:
+            self._remove_locked(politician_id)
+
+    def suggest(self, prefix: str, limit: int) -> List[Tuple[int, str]]:
+        """Return up to ``limit`` ``(politician_id, full_name)`` pairs whose name has a word starting with ``prefix``."""
+        needle = " ".join(_fold(prefix))
+        if not needle:
+            return []
+        results: Dict[int, str] = {}
+        with self._lock:
+            index = bisect.bisect_left(self._keys, (needle, 0))
+            while index < len(self._keys) and len(results) < limit:
+                key, politician_id = self._keys[index]
+                if not key.startswith(needle):
+                    break
+                results.setdefault(politician_id, self._names[politician_id])
+                index += 1
+        return list(results.items())
+
+
+name_suggester = NameSuggester()
@@ -0,0 +1,51 @@
+"""
+Shared fixtures: an in-memory database per test, and an API client bound to it.
+
+Modules seed the database through their own fixtures on top of ``engine``.
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session, create_engine
+
+import server.migrations  # noqa: F401 (registers the in-place schema upgrade)
+import server.projections  # noqa: F401 (registers the projection triggers)
+from server.analytics.similarity import similarity_index
+from server.api import analytics, routes
+from server.database import get_session
+
+
+@pytest.fixture
+def engine():
+    # A single shared connection, so the client's worker threads see the test's database
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def session(engine):
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def client(engine):
+    # Cached totals and profiles, and the similarity index, outlive each
+    # test's database, so start from clean ones
+    routes._politician_counts.clear()
+    routes._profile_cache.clear()
+    similarity_index.reset()
+    app = FastAPI()
+    app.include_router(routes.router)
+    app.include_router(analytics.router)
+
+    def get_test_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_test_session
+    return TestClient(app)
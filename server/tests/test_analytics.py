@@ -0,0 +1,340 @@
+"""
+Tests for the batch analytics over roll-call votes and their API, run against
+an in-memory database seeded per test.
+"""
+import time
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+from sqlalchemy import text
+from sqlmodel import Session
+
+from server.analytics.downsample import lttb
+from server.analytics.industries import classify
+from server.analytics.money_votes import money_vote_statistics
+from server.analytics.matrix import NO, YES, build_vote_matrix, fetch_int_rows, load_vote_matrix
+from server.analytics import ideal_points as ideal_points_module
+from server.analytics.ideal_points import ideal_points
+from server.analytics.party_unity import member_parties, party_unity
+from server.analytics.similarity import SimilarityIndex
+from server.api import routes
+from server.models import Politician, PartyAffiliation, Bill, Vote, VotePosition, Chamber, CampaignDonation, Gift
+
+Y, N, A = VotePosition.YES, VotePosition.NO, VotePosition.NOT_VOTING
+
+# Senate roll calls 1-4 of the 117th Congress, one column per roll call
+VOTES = {
+    ("Dana", "Democratic"): [Y, Y, N, Y],
+    ("Dale", "Democratic"): [Y, Y, N, N],
+    ("Dora", "Democratic"): [Y, N, Y, A],
+    ("Rita", "Republican"): [N, N, Y, N],
+    ("Rick", "Republican"): [N, Y, Y, N],
+}
+
+
+@pytest.fixture
+def members(engine):
+    with Session(engine) as session:
+        bill = Bill(bill_number="S. 1", title="A Bill", congress_session=117,
+                    introduced_date=date(2021, 1, 4), status="Introduced")
+        session.add(bill)
+        session.commit()
+        ids = {}
+        for (name, party), positions in VOTES.items():
+            member = Politician(first_name=name, last_name="Member")
+            session.add(member)
+            session.commit()
+            session.add(PartyAffiliation(party_name=party, start_date=date(2000, 1, 1), politician_id=member.id))
+            for roll_call, position in enumerate(positions, start=1):
+                session.add(Vote(vote_date=datetime(2021, 2, roll_call, 15), position=position,
+                                 roll_call_number=roll_call, chamber=Chamber.SENATE,
+                                 politician_id=member.id, bill_id=bill.id))
+            ids[name] = member.id
+        session.commit()
+        return ids
+
+
+def test_vote_matrix_has_one_column_per_roll_call(engine, members):
+    with Session(engine) as session:
+        matrix = load_vote_matrix(session, congress_session=117)
+    assert list(matrix.politician_ids) == sorted(members.values())
+    assert matrix.votes.shape == (5, 4)
+    assert list(matrix.roll_calls[:, 2]) == [1, 2, 3, 4]
+    dora = list(matrix.politician_ids).index(members["Dora"])
+    assert list(matrix.votes[dora]) == [YES, NO, YES, 0]
+
+
+def test_fetch_int_rows_reads_a_million_votes_quickly(session):
+    # Shaped like vote_rows_query rows; converting them as Row objects took ~20 s
+    votes = text(
+        "WITH RECURSIVE n(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM n WHERE i < 999999)"
+        " SELECT i % 535, 117, i % 2, i / 535, 2459000 + i % 300, i % 3 - 1 FROM n"
+    )
+    started = time.perf_counter()
+    rows = fetch_int_rows(session, votes, 6)
+    assert time.perf_counter() - started < 8
+    assert rows.shape == (1_000_000, 6) and rows.dtype == np.int64
+    assert list(rows[536]) == [1, 117, 0, 1, 2459236, 1]
+
+
+def test_build_vote_matrix_keeps_same_numbered_roll_calls_of_different_chambers_apart():
+    rows = np.array([
+        [1, 117, 0, 5, 2459000, YES],
+        [1, 117, 1, 5, 2459000, NO],
+        [2, 117, 0, 5, 2459000, NO],
+    ])
+    matrix = build_vote_matrix(rows)
+    assert matrix.votes.tolist() == [[YES, NO], [NO, 0]]
+
+
+def test_lttb_keeps_the_ends_and_the_peaks():
+    x = np.arange(1000)
+    y = np.sin(x / 50.0)
+    y[437] = 25.0 # A lone spike
+    kept = lttb(x, y, 50)
+    assert len(kept) == 50 and kept[0] == 0 and kept[-1] == 999
+    assert (np.diff(kept) > 0).all()
+    assert 437 in kept
+    assert list(lttb(x[:10], y[:10], 50)) == list(range(10))
+
+
+def test_party_unity_counts_only_decided_party_positions():
+    votes = np.array([[YES, YES], [YES, NO], [NO, 0]], dtype=np.int8)
+    counted, with_party = party_unity(votes, np.array([0, 0, 1]), party_count=2)
+    # Party 0 split 1-1 on the second roll call, so it has no position there
+    assert counted.tolist() == [1, 1, 1]
+    assert with_party.tolist() == [1, 1, 1]
+
+
+def test_party_unity_endpoint_ranks_members(client, members):
+    refresh = client.post("/analytics/party-unity/refresh").json()
+    assert refresh["scores_per_session"] == {"117": 5}
+
+    report = client.get("/analytics/party-unity").json()
+    assert report["congress_session"] == 117
+    scores = {row["full_name"]: row for row in report["results"]}
+    # Democratic majority: Y, Y, N, tie on roll call 4 (Y vs N, Dora not voting)
+    assert (scores["Dora Member"]["votes_with_party"], scores["Dora Member"]["votes_counted"]) == (1, 3)
+    assert scores["Dana Member"]["unity_score"] == 1.0
+    assert report["results"][0]["full_name"] == "Dora Member"
+
+    republicans = client.get("/analytics/party-unity", params={"party": "republican", "order": "highest"}).json()
+    assert [row["full_name"] for row in republicans["results"]] == ["Rita Member", "Rick Member"]
+
+
+def test_member_parties_ignore_ended_affiliations(engine, members):
+    with Session(engine) as session:
+        session.exec(text("UPDATE party_affiliations SET end_date = '2021-01-31' WHERE politician_id = :id"),
+                     params={"id": members["Rick"]})
+        session.add(PartyAffiliation(party_name="Independent", start_date=date(2021, 2, 1), end_date=date(2021, 2, 2),
+                                     politician_id=members["Rita"]))
+        session.commit()
+        parties = member_parties(session, 117)
+    # Rick's only affiliation ended before his votes; Rita's Independent spell ended before her last vote
+    assert parties[members["Rick"]] is None
+    assert parties[members["Rita"]] == "Republican"
+    assert parties[members["Dana"]] == "Democratic"
+
+
+def test_similar_politicians_ranked_by_agreement(client, members):
+    response = client.get(f"/politicians/{members['Dana']}/similar", params={"k": 3, "min_shared_votes": 1}).json()
+    assert response["chamber"] == "Senate"
+    assert [(row["full_name"], row["agreement"], row["shared_votes"]) for row in response["results"]] == [
+        ("Dale Member", 0.75, 4), ("Dora Member", 1 / 3, 3), ("Rick Member", 0.25, 4)
+    ]
+    # Dora did not vote on roll call 4, so shares only three roll calls with anyone
+    response = client.get(f"/politicians/{members['Dana']}/similar", params={"min_shared_votes": 4}).json()
+    assert [row["full_name"] for row in response["results"]] == ["Dale Member", "Rick Member", "Rita Member"]
+
+
+def test_similar_politicians_requires_known_politician(client, members):
+    assert client.get("/politicians/999/similar").status_code == 404
+
+
+def test_similarity_index_applies_new_votes_incrementally(engine, members):
+    index = SimilarityIndex()
+    with Session(engine) as session:
+        index.refresh(session)
+        bill = session.get(Bill, 1)
+        house_bill = Bill(bill_number="H.R. 1", title="Another Bill", congress_session=118,
+                          introduced_date=date(2023, 1, 9), status="Introduced")
+        newcomer = Politician(first_name="Nate", last_name="Member")
+        session.add_all([house_bill, newcomer])
+        session.commit()
+        # A late vote on an already indexed roll call, a new roll call, and a
+        # House roll call with the same number in another session
+        session.add(Vote(vote_date=datetime(2021, 2, 2, 15), position=N, roll_call_number=2,
+                         chamber=Chamber.SENATE, politician_id=newcomer.id, bill_id=bill.id))
+        for politician_id, position in [(members["Dana"], Y), (members["Rita"], N), (newcomer.id, Y)]:
+            session.add(Vote(vote_date=datetime(2021, 2, 5, 15), position=position, roll_call_number=5,
+                             chamber=Chamber.SENATE, politician_id=politician_id, bill_id=bill.id))
+            session.add(Vote(vote_date=datetime(2023, 2, 5, 15), position=position, roll_call_number=5,
+                             chamber=Chamber.HOUSE, politician_id=politician_id, bill_id=house_bill.id))
+        session.commit()
+        newcomer_id = newcomer.id
+
+        index.refresh(session)
+        rebuilt = SimilarityIndex()
+        rebuilt.rebuild(session)
+
+    for politician_id in [*members.values(), newcomer_id]:
+        for chamber in (Chamber.SENATE, Chamber.HOUSE):
+            assert index.most_similar(politician_id, 10, chamber, 1) == rebuilt.most_similar(politician_id, 10, chamber, 1)
+    # Nate voted No on roll call 2 and Yes on roll call 5
+    best = index.most_similar(newcomer_id, 2, Chamber.SENATE, 1)[1]
+    assert [(match.politician_id, match.shared_votes) for match in best] == [(members["Dora"], 1), (members["Dana"], 2)]
+
+
+def test_ideal_points_separate_opposed_blocs_and_ignore_chunking():
+    rng = np.random.default_rng(0)
+    bloc = np.where(rng.random(40) < 0.5, YES, NO).astype(np.int8)
+    votes = np.vstack([np.tile(bloc, (5, 1)), np.tile(-bloc, (5, 1))])
+    votes[0, :10] = 0 # Missed votes
+    coordinates = ideal_points(votes)
+    assert coordinates.shape == (10, 2)
+    assert np.linalg.norm(coordinates, axis=1).max() == pytest.approx(1.0)
+    assert len(set(np.sign(coordinates[:5, 0]))) == 1
+    assert (np.sign(coordinates[:5, 0]) == -np.sign(coordinates[5:, 0])).all()
+    np.testing.assert_allclose(np.abs(ideal_points(votes, chunk_size=7)), np.abs(coordinates), atol=1e-5)
+
+
+def test_ideal_points_endpoint_serves_stored_placements(client, members, monkeypatch):
+    assert client.get("/analytics/ideal-points").json() == {"congress_session": None, "results": []}
+    monkeypatch.setattr(ideal_points_module, "MIN_VOTES", 1)
+    assert client.post("/analytics/ideal-points/refresh").json() == {"members_per_session": {"117": 5}}
+
+    report = client.get("/analytics/ideal-points", params={"chamber": "Senate"}).json()
+    assert report["congress_session"] == 117
+    placements = {row["full_name"]: row for row in report["results"]}
+    assert [row["dim1"] for row in report["results"]] == sorted(row["dim1"] for row in report["results"])
+    # Republicans are oriented to the positive side
+    assert max(placements[name]["dim1"] for name in ("Dana Member", "Dale Member")) < 0
+    assert min(placements[name]["dim1"] for name in ("Rita Member", "Rick Member")) > 0
+    assert placements["Dora Member"]["votes_scaled"] == 3
+
+    democrats = client.get("/analytics/ideal-points", params={"party": "democratic"}).json()
+    assert {row["full_name"] for row in democrats["results"]} == {"Dana Member", "Dale Member", "Dora Member"}
+
+
+def test_top_donors_rank_across_recipients(client, engine, members):
+    with Session(engine) as session:
+        session.add_all([
+            CampaignDonation(donor_name=donor, donor_type=donor_type, amount=amount,
+                             date=donated, recipient_id=members[recipient])
+            for donor, donor_type, amount, donated, recipient in [
+                ("Acme PAC", "PAC", 500.0, date(2022, 5, 1), "Dana"),
+                ("Acme PAC", "PAC", 700.0, date(2022, 6, 1), "Rita"),
+                ("Jane Doe", "Individual", 1000.0, date(2022, 6, 1), "Dana"),
+                ("Jane Doe", "Individual", 2500.0, date(2024, 1, 1), "Dale"),
+            ]
+        ])
+        session.commit()
+
+    everything = client.get("/analytics/top-donors").json()
+    assert everything["cycle"] is None
+    assert [(row["donor_name"], row["total_amount"], row["donation_count"]) for row in everything["results"]] == [
+        ("Jane Doe", 3500.0, 2), ("Acme PAC", 1200.0, 2)
+    ]
+    cycle = client.get("/analytics/top-donors", params={"cycle": 2022, "limit": 1}).json()
+    assert [(row["donor_name"], row["total_amount"]) for row in cycle["results"]] == [("Acme PAC", 1200.0)]
+    pacs = client.get("/analytics/top-donors", params={"donor_type": "PAC", "cycle": 2024}).json()
+    assert pacs["results"] == []
+
+
+
+def test_resolved_donors_merge_in_donation_summaries(client, engine, members):
+    with Session(engine) as session:
+        session.add_all([
+            CampaignDonation(donor_name=donor, donor_type="Corporation", amount=amount,
+                             date=date(2022, 5, 1), recipient_id=members["Dana"])
+            for donor, amount in [("ExxonMobil", 400.0), ("Exxon Mobil Corp", 300.0), ("Pfizer", 500.0)]
+        ])
+        session.commit()
+
+    summary = client.get(f"/politicians/{members['Dana']}/donations/summary").json()
+    assert [row["donor_name"] for row in summary["top_donors"]] == ["Pfizer", "ExxonMobil", "Exxon Mobil Corp"]
+    assert client.post("/management/donors/resolve").json() == {"names_resolved": 3, "donors_created": 2}
+
+    summary = client.get(f"/politicians/{members['Dana']}/donations/summary").json()
+    assert [(row["donor_name"], row["total_amount"]) for row in summary["top_donors"]] == [
+        ("Exxon Mobil Corp", 700.0), ("Pfizer", 500.0)
+    ]
+    ranked = client.get("/analytics/top-donors").json()["results"]
+    assert [row["donor_id"] for row in ranked] == [row["donor_id"] for row in summary["top_donors"]]
+    assert None not in {row["donor_id"] for row in ranked}
+
+def test_industry_classification_matches_keywords_and_organizations():
+    assert classify("Pipeline Safety and Clean Air Act") == ["energy", "environment"]
+    assert classify("An act to expand rural broadband") == ["technology", "agriculture"]
+    assert classify("ExxonMobil Corp. PAC") == ["energy"]
+    assert classify("Jane Doe") == []
+    # Organizations match whole words only
+    assert classify("Metalworkers Union") == []
+
+
+def test_money_vote_statistics():
+    money = np.array([[100.0], [0.0], [50.0], [0.0], [10.0]])
+    yes = np.array([[3.0], [0.0], [3.0], [1.0], [1.0]])
+    no = np.array([[0.0], [3.0], [0.0], [2.0], [0.0]])
+    stats = money_vote_statistics(money, yes, no)
+    # The last member cast too few votes on the industry's bills to count
+    assert (stats["members_counted"][0], stats["members_funded"][0], stats["total_amount"][0]) == (4, 2, 150.0)
+    assert stats["support_funded"][0] == 1.0
+    assert stats["support_unfunded"][0] == pytest.approx(1 / 6)
+    assert stats["lift"][0] == pytest.approx(1 / (2 / 4))
+    assert stats["correlation"][0] > 0.9
+
+
+def test_money_votes_endpoint_ties_industry_money_to_votes(client, engine, members):
+    with Session(engine) as session:
+        bill = Bill(bill_number="S. 2", title="Pipeline Safety Act", congress_session=117,
+                    introduced_date=date(2021, 3, 1), status="Introduced")
+        session.add(bill)
+        session.commit()
+        for name, position in [("Rita", Y), ("Rick", Y), ("Dana", N), ("Dale", N), ("Dora", N)]:
+            for roll_call in (10, 11, 12):
+                session.add(Vote(vote_date=datetime(2021, 3, roll_call, 15), position=position,
+                                 roll_call_number=roll_call, chamber=Chamber.SENATE,
+                                 politician_id=members[name], bill_id=bill.id))
+        session.add_all([
+            CampaignDonation(donor_name="ExxonMobil PAC", donor_type="PAC", amount=1000.0,
+                             date=date(2022, 5, 1), recipient_id=members["Rita"]),
+            CampaignDonation(donor_name="ExxonMobil PAC", donor_type="PAC", amount=500.0,
+                             date=date(2021, 5, 1), recipient_id=members["Rick"]),
+            # Outside the 117th Congress
+            CampaignDonation(donor_name="ExxonMobil PAC", donor_type="PAC", amount=900.0,
+                             date=date(2023, 5, 1), recipient_id=members["Dale"]),
+            Gift(description="Tickets", value=200.0, report_date=date(2021, 7, 1), donor="Chevron",
+                 recipient_id=members["Dana"]),
+        ])
+        session.commit()
+
+    assert client.post("/analytics/money-votes/refresh").json() == {"industries_per_session": {"117": 8}}
+    report = client.get("/analytics/money-votes").json()
+    assert report["congress_session"] == 117
+    energy = next(row for row in report["results"] if row["industry"] == "energy")
+    assert (energy["bills_classified"], energy["members_counted"], energy["members_funded"]) == (1, 5, 3)
+    assert energy["total_amount"] == 1700.0
+    assert (energy["support_funded"], energy["support_unfunded"]) == (pytest.approx(2 / 3), 0.0)
+    assert energy["lift"] == pytest.approx((2 / 3) / (2 / 5))
+    assert energy["correlation"] > 0
+    health = next(row for row in report["results"] if row["industry"] == "health")
+    assert (health["members_counted"], health["correlation"], health["lift"]) == (0, None, None)
+
+
+def test_bill_roll_calls_show_outcome_and_party_breakdown(client, members):
+    response = client.get("/bills/1/roll-calls").json()
+    assert routes.BillRollCallsResponse.model_validate(response).model_dump(mode="json") == response
+    assert (response["bill_number"], len(response["results"])) == ("S. 1", 4)
+    first, _, third, fourth = response["results"]
+    assert (first["roll_call_number"], first["vote_date"], first["chamber"]) == (1, "2021-02-01", "Senate")
+    assert (first["yes_count"], first["no_count"], first["passed"]) == (3, 2, True)
+    assert first["parties"] == [
+        {"party_name": "Democratic", "yes_count": 3, "no_count": 0, "abstain_count": 0, "not_voting_count": 0},
+        {"party_name": "Republican", "yes_count": 0, "no_count": 2, "abstain_count": 0, "not_voting_count": 0},
+    ]
+    assert (third["yes_count"], third["no_count"], third["passed"]) == (3, 2, True)
+    assert (fourth["yes_count"], fourth["no_count"], fourth["not_voting_count"], fourth["passed"]) == (1, 3, 1, False)
+
+    assert client.get("/bills/999/roll-calls").status_code == 404
@@ -0,0 +1,81 @@
+"""
+Unit tests for the table-versioned LRU cache.
+"""
+import pytest
+from sqlalchemy import text
+from sqlmodel import SQLModel, Session, create_engine
+
+from datetime import date
+
+from server.cache import VersionedCache, politician_version
+from server.models import Chamber, Committee, CommitteeMembership, Politician
+
+
+def test_entries_go_stale_when_a_source_table_is_written(session):
+    cache = VersionedCache(tables=("politicians", "votes"))
+    cache.put("key", 1, cache.version(session))
+    assert cache.get("key", cache.version(session)) == (1, True)
+
+    session.add(Politician(first_name="Ann", last_name="Adams"))
+    session.commit()
+    assert cache.get("key", cache.version(session)) == (1, False)
+    assert cache.get("missing", cache.version(session)) is None
+
+
+def test_writes_from_other_connections_and_raw_sql_count(tmp_path):
+    # Two engines on one file stand in for two worker processes
+    url = f"sqlite:///{tmp_path / 'shared.db'}"
+    ours, theirs = create_engine(url), create_engine(url)
+    SQLModel.metadata.create_all(ours)
+    cache = VersionedCache(tables=("politicians",))
+    with Session(ours) as session:
+        cache.put("key", 1, cache.version(session))
+
+        with theirs.begin() as connection:
+            connection.execute(text(
+                "INSERT INTO politicians (first_name, last_name, created_at, updated_at)"
+                " VALUES ('Bob', 'Brown', '2024-01-01', '2024-01-01')"
+            ))
+        assert cache.get("key", cache.version(session)) == (1, False)
+
+
+def test_politician_versions_move_only_with_that_politicians_rows(session):
+    ann, bob = Politician(first_name="Ann", last_name="Adams"), Politician(first_name="Bob", last_name="Brown")
+    committee = Committee(name="Finance", chamber=Chamber.SENATE)
+    session.add_all([ann, bob, committee])
+    session.commit()
+    assert politician_version(session, 9999) is None
+
+    session.add(CommitteeMembership(role="Member", start_date=date(2021, 1, 3),
+                                    politician_id=ann.id, committee_id=committee.id))
+    session.commit()
+    ann_version, bob_version = politician_version(session, ann.id), politician_version(session, bob.id)
+
+    # A committee is shown on its members' profiles only
+    committee.name = "Finance and Budget"
+    session.add(committee)
+    session.commit()
+    assert politician_version(session, ann.id) != ann_version
+    assert politician_version(session, bob.id) == bob_version
+
+
+def test_caches_may_only_depend_on_versioned_tables():
+    with pytest.raises(ValueError):
+        VersionedCache(tables=("politicians", "donation_rollups"))
+
+
+def test_size_bound_evicts_least_recently_used():
+    cache = VersionedCache(tables=(), max_size=10, sizeof=len)
+    version = ()
+    cache.put("a", b"aaaa", version)
+    cache.put("b", b"bbbb", version)
+    cache.get("a", version)
+    cache.put("c", b"cccc", version)
+
+    assert cache.get("b", version) is None
+    assert cache.get("a", version) is not None and cache.get("c", version) is not None
+    assert cache.size == 8
+
+    # A value larger than the whole budget is not cached at all
+    cache.put("d", b"d" * 11, version)
+    assert cache.get("d", version) is None and cache.size == 8
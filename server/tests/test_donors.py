@@ -0,0 +1,96 @@
+"""
+Tests for donor entity resolution in server/donors.py.
+"""
+from datetime import date
+
+from sqlmodel import select
+
+import server.donors
+from server.donors import blocking_keys, cluster_names, name_similarity, normalize_donor_name, resolve_donors, soundex
+from server.models import CampaignDonation, Donor, DonorTotal, Gift, Politician
+
+
+def test_normalization_drops_case_punctuation_and_legal_suffixes():
+    assert normalize_donor_name("EXXON MOBIL PAC") == "exxon mobil"
+    assert normalize_donor_name("Exxon Mobil Corp.") == "exxon mobil"
+    assert normalize_donor_name("Nestlé USA, Inc.") == "nestle usa"
+    assert normalize_donor_name("Johnson & Johnson") == "johnson johnson"
+    # A name made only of suffixes is kept rather than emptied
+    assert normalize_donor_name("The Company") == "the company"
+
+
+def test_soundex_and_blocking_keys():
+    assert [soundex(word) for word in ("robert", "rupert", "ashcraft", "tymczak", "pfister")] == [
+        "R163", "R163", "A261", "T522", "P236"
+    ]
+    # Word order and spelling variants share a block
+    assert blocking_keys("mobil exxon")[0] == blocking_keys("exxon mobil")[0]
+    assert blocking_keys("jon smith")[1] == blocking_keys("john smith")[1]
+    assert blocking_keys("exxonmobil")[2] == blocking_keys("exxon mobil")[2]
+
+
+def test_names_are_only_compared_within_blocks(monkeypatch):
+    compared = []
+
+    def similarity(a, b):
+        compared.append((a, b))
+        return name_similarity(a, b)
+
+    monkeypatch.setattr(server.donors, "name_similarity", similarity)
+    names = ["exxon mobil", "exxonmobil", "goldman sachs", "goldmann sachs", "pfizer", "lockheed martin"]
+    roots = cluster_names(names, [True] * len(names))
+
+    assert roots[0] == roots[1] and roots[2] == roots[3]
+    assert len(set(roots)) == 4
+    assert ("pfizer", "lockheed martin") not in compared
+    assert len(compared) < len(names) * (len(names) - 1) / 2
+
+
+def test_resolution_maps_spellings_to_one_donor(session):
+    politician = Politician(first_name="Ted", last_name="Cruz")
+    session.add(politician)
+    session.commit()
+    donations = [
+        ("ExxonMobil", "Corporation", 300.0),
+        ("Exxon Mobil Corp", "Corporation", 200.0),
+        ("Exxon Mobil Corp", "Corporation", 100.0),
+        ("EXXON MOBIL PAC", "PAC", 50.0),
+        ("Pfizer Inc", "Corporation", 75.0),
+    ]
+    session.add_all([
+        CampaignDonation(donor_name=name, donor_type=donor_type, amount=amount,
+                         date=date(2022, 3, 1), recipient_id=politician.id)
+        for name, donor_type, amount in donations
+    ])
+    session.add(Gift(description="Dinner", value=80.0, report_date=date(2022, 4, 1),
+                     donor="Exxon-Mobil", recipient_id=politician.id))
+    session.commit()
+
+    assert resolve_donors(session) == (5, 2)
+    donors = {donor.name: donor.id for donor in session.exec(select(Donor))}
+    assert set(donors) == {"Exxon Mobil Corp", "Pfizer Inc"}
+    exxon = donors["Exxon Mobil Corp"]
+    assert {row.donor_name: row.donor_id for row in session.exec(select(CampaignDonation))} == {
+        "ExxonMobil": exxon, "Exxon Mobil Corp": exxon, "EXXON MOBIL PAC": exxon, "Pfizer Inc": donors["Pfizer Inc"]
+    }
+    assert session.exec(select(Gift.donor_id)).one() == exxon
+
+    # The rollups now file every spelling under the donor
+    totals = {
+        (row.donor_name, row.donor_type): (row.donor_id, row.total_amount)
+        for row in session.exec(select(DonorTotal).where(DonorTotal.cycle == 2022))
+    }
+    assert totals == {
+        ("Exxon Mobil Corp", "Corporation"): (exxon, 600.0),
+        ("Exxon Mobil Corp", "PAC"): (exxon, 50.0),
+        ("Pfizer Inc", "Corporation"): (donors["Pfizer Inc"], 75.0),
+    }
+
+    # Later spellings join the existing donor; nothing left means nothing to do
+    session.add(CampaignDonation(donor_name="Exxon Mobil Corporation", donor_type="Corporation", amount=25.0,
+                                 date=date(2022, 5, 1), recipient_id=politician.id))
+    session.commit()
+    assert resolve_donors(session) == (1, 0)
+    assert session.exec(select(CampaignDonation.donor_id).where(CampaignDonation.amount == 25.0)).one() == exxon
+    assert resolve_donors(session) == (0, 0)
+
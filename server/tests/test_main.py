@@ -0,0 +1,52 @@
+"""
+Tests for the application's startup in server/main.py.
+"""
+import threading
+
+import anyio
+from fastapi.testclient import TestClient
+from sqlalchemy import inspect
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, create_engine
+
+import server.main
+from server.database import get_session
+from server.analytics.similarity import similarity_index
+from server.main import app
+
+
+def test_startup_creates_tables_and_bounds_the_worker_pool(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    monkeypatch.setattr(server.main, "engine", engine)
+    monkeypatch.setattr(server.main, "DB_CONCURRENCY", 3)
+
+    def get_test_session():
+        with Session(engine) as session:
+            yield session
+
+    monkeypatch.setitem(app.dependency_overrides, get_session, get_test_session)
+
+    with TestClient(app) as client:
+        limiter_tokens = client.portal.call(lambda: anyio.to_thread.current_default_thread_limiter().total_tokens)
+        assert limiter_tokens == 3
+        assert client.get("/politicians").json()["total"] == 0
+
+    assert inspect(engine).has_table("politicians")
+
+
+def test_startup_builds_the_similarity_index_in_the_background(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    monkeypatch.setattr(server.main, "engine", engine)
+    release, refreshed = threading.Event(), threading.Event()
+
+    def slow_refresh(db):
+        release.wait(5)
+        refreshed.set()
+
+    monkeypatch.setattr(similarity_index, "refresh", slow_refresh)
+
+    # Startup completes while the index is still being built
+    with TestClient(app):
+        assert not refreshed.is_set()
+        release.set()
+        assert refreshed.wait(5)
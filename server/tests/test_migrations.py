@@ -0,0 +1,79 @@
+"""
+Tests for the in-place schema upgrade in server/migrations.py.
+"""
+from datetime import date
+
+from sqlalchemy import inspect, text
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session, create_engine, select
+
+from server.donors import resolve_donors
+from server.models import CampaignDonation, DonorTotal, Politician
+from server.projections import ALL_CYCLES
+
+
+def _index_names(engine, table):
+    return {index["name"] for index in inspect(engine).get_indexes(table)}
+
+
+def test_indexes_declared_after_a_table_was_created_are_added(engine):
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_votes_politician_date"))
+        connection.execute(text("DROP INDEX ix_votes_roll_call"))
+    assert not {"ix_votes_politician_date", "ix_votes_roll_call"} & _index_names(engine, "votes")
+
+    # The votes table already exists, so only the upgrade hook can add its indexes
+    SQLModel.metadata.create_all(engine)
+    assert {"ix_votes_politician_date", "ix_votes_roll_call"} <= _index_names(engine, "votes")
+
+
+# The donation tables as created before donors were resolved, with triggers
+# that know nothing of donor_id
+_PRE_DONOR_SCHEMA = [
+    """CREATE TABLE campaign_donations (
+        created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL, source_id INTEGER REFERENCES sources (id),
+        id INTEGER NOT NULL PRIMARY KEY, donor_name VARCHAR NOT NULL, donor_type VARCHAR NOT NULL,
+        amount FLOAT NOT NULL, date DATE NOT NULL, recipient_id INTEGER NOT NULL REFERENCES politicians (id))""",
+    """CREATE TABLE gifts (
+        created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL, source_id INTEGER REFERENCES sources (id),
+        id INTEGER NOT NULL PRIMARY KEY, description VARCHAR NOT NULL, value FLOAT NOT NULL,
+        report_date DATE NOT NULL, donor VARCHAR NOT NULL, recipient_id INTEGER NOT NULL REFERENCES politicians (id))""",
+    """CREATE TABLE donation_rollups (
+        recipient_id INTEGER NOT NULL REFERENCES politicians (id), cycle INTEGER NOT NULL, month VARCHAR NOT NULL,
+        donor_type VARCHAR NOT NULL, donor_name VARCHAR NOT NULL, total_amount FLOAT NOT NULL,
+        donation_count INTEGER NOT NULL, PRIMARY KEY (recipient_id, cycle, month, donor_type, donor_name))""",
+    """CREATE TABLE donor_totals (
+        donor_name VARCHAR NOT NULL, donor_type VARCHAR NOT NULL, cycle INTEGER NOT NULL,
+        total_amount FLOAT NOT NULL, donation_count INTEGER NOT NULL, PRIMARY KEY (donor_name, donor_type, cycle))""",
+    *(f"CREATE TRIGGER donation_rollups_{suffix} AFTER {event} ON campaign_donations BEGIN SELECT 1; END"
+      for suffix, event in (("ai", "INSERT"), ("au", "UPDATE OF amount"), ("ad", "DELETE"))),
+]
+
+
+def test_database_created_before_donor_resolution_is_upgraded():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    with engine.begin() as connection:
+        for statement in _PRE_DONOR_SCHEMA:
+            connection.execute(text(statement))
+
+    SQLModel.metadata.create_all(engine)
+    columns = {table: {column["name"] for column in inspect(engine).get_columns(table)}
+               for table in ("campaign_donations", "gifts", "donation_rollups", "donor_totals")}
+    assert all("donor_id" in names for names in columns.values())
+    assert "ix_campaign_donations_donor_id" in _index_names(engine, "campaign_donations")
+    assert "ix_gifts_donor_id" in _index_names(engine, "gifts")
+
+    # The current rollup triggers replaced the old ones, so resolved donors are filed together
+    with Session(engine) as session:
+        politician = Politician(first_name="Nancy", last_name="Pelosi")
+        session.add(politician)
+        session.commit()
+        session.add_all([
+            CampaignDonation(donor_name=name, donor_type="PAC", amount=100.0, date=date(2021, 3, 4),
+                             recipient_id=politician.id)
+            for name in ("Acme Corp PAC", "ACME CORP. PAC")
+        ])
+        session.commit()
+        resolve_donors(session)
+        totals = session.exec(select(DonorTotal).where(DonorTotal.cycle == ALL_CYCLES)).all()
+        assert [(total.donation_count, total.donor_id is not None) for total in totals] == [(2, True)]
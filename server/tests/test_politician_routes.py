@@ -0,0 +1,456 @@
+"""
+Route tests for the politician list and detail endpoints, run against an
+in-memory database seeded per test.
+"""
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi.middleware.gzip import GZipMiddleware
+from sqlalchemy import event, text
+from sqlmodel import Session
+
+from server.api import routes
+from server.api.pagination import encode_cursor
+from server.data_health import refresh_data_issues
+from server.models import (
+    Politician, PartyAffiliation, PoliticalPosition, Bill, Vote, VotePosition, Chamber, CampaignDonation,
+    FinancialDisclosure
+)
+
+
+@pytest.fixture
+def politicians(engine):
+    names = [("Ann", "Adams"), ("Bob", "Brown"), ("Cat", "Brown"), ("Dan", "Clark"), ("Eve", "Davis"),
+             ("Fay", "Evans"), ("Gus", "Brown")]
+    with Session(engine) as session:
+        rows = [Politician(first_name=first, last_name=last) for first, last in names]
+        session.add_all(rows)
+        session.commit()
+        for i, politician in enumerate(rows):
+            session.add(PartyAffiliation(party_name="Democratic" if i % 2 else "Republican",
+                                         start_date=date(2010, 1, 1), politician_id=politician.id))
+        session.commit()
+        return [politician.id for politician in rows]
+
+
+def _follow_cursor(client, **params):
+    response = client.get("/politicians", params=params).json()
+    ids = [row["id"] for row in response["results"]]
+    while response["next_cursor"]:
+        response = client.get("/politicians", params={**params, "cursor": response["next_cursor"]}).json()
+        assert response["page"] is None
+        ids += [row["id"] for row in response["results"]]
+    return ids
+
+
+@pytest.mark.parametrize("sort_by", ["last_name_asc", "last_name_desc", "first_name_asc", "first_name_desc"])
+def test_cursor_pages_match_offset_order(client, politicians, sort_by):
+    everything = client.get("/politicians", params={"size": 100, "sort_by": sort_by}).json()
+    assert everything["next_cursor"] is None
+    expected = [row["id"] for row in everything["results"]]
+
+    assert _follow_cursor(client, size=2, sort_by=sort_by) == expected
+
+
+def test_cursor_respects_filters(client, politicians):
+    ids = _follow_cursor(client, size=1, party="democratic")
+    assert len(ids) == 3
+
+
+def test_cursor_for_another_sort_order_is_rejected(client, politicians):
+    cursor = client.get("/politicians", params={"size": 2}).json()["next_cursor"]
+    response = client.get("/politicians", params={"cursor": cursor, "sort_by": "first_name_desc"})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("path, values", [
+    ("/politicians", ("last_name_asc", {"a": 1}, 1)),
+    ("/politicians", ("last_name_asc", "Adams", "1")),
+    ("/search?q=ann", ("x", 1)),
+    ("/politicians/1/votes", ("2021-01-01", [1])),
+    ("/politicians/1/votes", (20210101, 1)),
+    ("/politicians/1/timeline", ("2021-01-01", "vote", None)),
+    ("/management/data-health", ("Adams", True)),
+])
+def test_cursors_holding_values_of_the_wrong_type_are_rejected(client, politicians, path, values):
+    response = client.get(path, params={"cursor": encode_cursor(*values)})
+    assert response.status_code == 400
+
+
+def test_totals_are_cached_until_a_write(client, engine, politicians):
+    assert client.get("/politicians", params={"party": "republican"}).json()["total"] == 4
+
+    with Session(engine) as session:
+        newcomer = Politician(first_name="Hal", last_name="Hughes")
+        session.add(newcomer)
+        session.commit()
+        session.add(PartyAffiliation(party_name="Republican", start_date=date(2020, 1, 1), politician_id=newcomer.id))
+        session.commit()
+
+    estimate = client.get("/politicians", params={"party": "republican", "total": "estimate"}).json()
+    assert estimate["total"] == 4 and estimate["total_is_estimate"] is True
+
+    exact = client.get("/politicians", params={"party": "republican", "total": "exact"}).json()
+    assert exact["total"] == 5 and exact["total_is_estimate"] is False
+
+
+def test_total_none_skips_counting(client, politicians):
+    response = client.get("/politicians", params={"size": 2, "total": "none"}).json()
+    assert response["total"] is None and response["pages"] is None
+    assert len(response["results"]) == 2
+
+
+@pytest.fixture
+def voter(engine):
+    with Session(engine) as session:
+        politician = Politician(first_name="Vic", last_name="Voter")
+        bill = Bill(bill_number="S. 1", title="A Bill", congress_session=117,
+                    introduced_date=date(2021, 1, 1), status="Introduced")
+        session.add_all([politician, bill])
+        session.commit()
+        # Two votes share each day so that ties on the date are broken by id
+        for day in range(1, 13):
+            for roll_call in (1, 2):
+                session.add(Vote(vote_date=datetime(2021, 3, day, 12), position=VotePosition.YES,
+                                 roll_call_number=day * 10 + roll_call, chamber=Chamber.SENATE,
+                                 politician_id=politician.id, bill_id=bill.id))
+        for month in range(1, 7):
+            session.add(CampaignDonation(donor_name=f"Donor {month}", donor_type="Individual", amount=10.0 * month,
+                                         date=date(2022, month, 1), recipient_id=politician.id))
+        session.commit()
+        return politician.id
+
+
+def _follow_collection(client, path, **params):
+    response = client.get(path, params=params).json()
+    items = response["results"]
+    while response["next_cursor"]:
+        response = client.get(path, params={**params, "cursor": response["next_cursor"]}).json()
+        items += response["results"]
+    return items
+
+
+def test_collection_pages_cover_every_item_newest_first(client, voter):
+    votes = _follow_collection(client, f"/politicians/{voter}/votes", limit=5)
+    assert len(votes) == 24
+    assert [vote["vote_date"] for vote in votes] == sorted((vote["vote_date"] for vote in votes), reverse=True)
+    assert votes == client.get(f"/politicians/{voter}/votes", params={"limit": 100}).json()["results"]
+
+
+def test_collection_date_range_is_inclusive(client, voter):
+    votes = _follow_collection(client, f"/politicians/{voter}/votes", limit=3,
+                               start_date="2021-03-02", end_date="2021-03-04")
+    assert len(votes) == 6
+    assert {vote["vote_date"][:10] for vote in votes} == {"2021-03-02", "2021-03-03", "2021-03-04"}
+
+    donations = client.get(f"/politicians/{voter}/donations",
+                           params={"start_date": "2022-02-01", "end_date": "2022-04-01"}).json()["results"]
+    assert [donation["donor_name"] for donation in donations] == ["Donor 4", "Donor 3", "Donor 2"]
+
+
+def test_collection_of_unknown_politician_is_404(client, voter):
+    assert client.get("/politicians/9999/gifts").status_code == 404
+
+
+def test_detail_embeds_a_preview_and_counts(client, voter):
+    details = client.get(f"/politicians/{voter}", params={"preview": 3}).json()
+    assert details["vote_count"] == 24 and len(details["votes"]) == 3
+    assert details["votes"] == client.get(f"/politicians/{voter}/votes", params={"limit": 3}).json()["results"]
+    assert details["donation_count"] == 6 and details["campaign_donations"][0]["donor_name"] == "Donor 6"
+    assert details["gift_count"] == 0 and details["gifts_received"] == []
+
+
+def _count_selects(engine, request):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        response = request()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    return response, statements
+
+
+def test_detail_include_and_fields_trim_the_profile(client, engine, voter):
+    response, statements = _count_selects(
+        engine, lambda: client.get(f"/politicians/{voter}", params={"include": "positions", "fields": "last_name"})
+    )
+    assert response.json() == {"id": voter, "last_name": "Voter", "positions": []}
+    # The cache-version lookup, the profile and its positions; skipped sections cost nothing
+    assert len(statements) == 3
+    assert not any("votes" in statement for statement in statements)
+
+
+def test_detail_include_empty_returns_only_the_header(client, voter):
+    details = client.get(f"/politicians/{voter}", params={"include": ""}).json()
+    assert set(details) == {"id", "first_name", "last_name", "date_of_birth", "biography", "official_website_url"}
+
+
+def test_detail_rejects_unknown_sections(client, voter):
+    response = client.get(f"/politicians/{voter}", params={"include": "votes,speeches"})
+    assert response.status_code == 400
+    assert "speeches" in response.json()["detail"]
+
+
+def test_detail_etag_revalidates_with_304(client, engine, voter):
+    first = client.get(f"/politicians/{voter}")
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+
+    response, statements = _count_selects(
+        engine, lambda: client.get(f"/politicians/{voter}", headers={"If-None-Match": etag})
+    )
+    assert response.status_code == 304 and response.content == b""
+    # Only the cache-version lookup runs; the profile comes from the cache
+    assert len(statements) == 1
+
+    # A different representation has its own tag
+    assert client.get(f"/politicians/{voter}", params={"include": "votes"}).headers["etag"] != etag
+
+
+def test_detail_etag_is_weak_across_encodings(client, voter):
+    client.app.add_middleware(GZipMiddleware, minimum_size=1024)
+    identity = client.get(f"/politicians/{voter}", headers={"Accept-Encoding": "identity"})
+    compressed = client.get(f"/politicians/{voter}", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in identity.headers
+    assert compressed.headers["content-encoding"] == "gzip"
+
+    # One tag for both encodings, so it must not claim byte-for-byte equality
+    etag = identity.headers["etag"]
+    assert etag.startswith('W/"') and compressed.headers["etag"] == etag
+    response = client.get(f"/politicians/{voter}", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_detail_cache_is_invalidated_by_related_writes(client, engine, voter):
+    etag = client.get(f"/politicians/{voter}").headers["etag"]
+
+    with Session(engine) as session:
+        session.add(CampaignDonation(donor_name="Donor 7", donor_type="Individual", amount=70.0,
+                                     date=date(2022, 7, 1), recipient_id=voter))
+        session.commit()
+
+    response = client.get(f"/politicians/{voter}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["donation_count"] == 7
+
+    # Writes that bypass the ORM invalidate the profile too
+    etag = response.headers["etag"]
+    with engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO campaign_donations (donor_name, donor_type, amount, date, recipient_id, created_at, updated_at)"
+            f" VALUES ('Donor 8', 'Individual', 80.0, '2022-08-01', {voter}, '2022-08-01', '2022-08-01')"
+        ))
+    response = client.get(f"/politicians/{voter}", headers={"If-None-Match": etag})
+    assert response.status_code == 200 and response.json()["donation_count"] == 8
+
+
+def test_detail_cache_is_versioned_per_politician(client, engine, politicians, voter):
+    etag = client.get(f"/politicians/{voter}").headers["etag"]
+
+    # Ingesting another politician's donations leaves this profile cached
+    with Session(engine) as session:
+        session.add(CampaignDonation(donor_name="Donor 9", donor_type="Individual", amount=90.0,
+                                     date=date(2022, 9, 1), recipient_id=politicians[0]))
+        session.commit()
+    response, statements = _count_selects(
+        engine, lambda: client.get(f"/politicians/{voter}", headers={"If-None-Match": etag})
+    )
+    assert response.status_code == 304 and len(statements) == 1
+
+    # Renaming a bill they voted on changes their vote previews
+    with engine.begin() as connection:
+        connection.execute(text("UPDATE bills SET title = 'A Renamed Bill'"))
+    response = client.get(f"/politicians/{voter}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["votes"][0]["bill_title"] == "A Renamed Bill"
+
+
+def test_fast_path_responses_keep_the_documented_shapes(client, politicians, voter):
+    listing = client.get("/politicians", params={"size": 3}).json()
+    assert routes.PaginatedPoliticianResponse.model_validate(listing).model_dump() == listing
+
+    details = client.get(f"/politicians/{voter}").json()
+    assert routes.PoliticianFullDetails.model_validate(details).model_dump() == details
+    assert details["votes"][0] == {"vote_date": datetime(2021, 3, 12, 12).isoformat(), "position": "Yes",
+                                   "bill_number": "S. 1", "bill_title": "A Bill"}
+
+
+def test_data_health_report_runs_the_checks_on_first_read(client, engine, politicians):
+    with Session(engine) as session:
+        complete = Politician(first_name="Zed", last_name="Zimmer", date_of_birth=date(1970, 1, 1),
+                              biography="Bio", official_website_url="https://example.com")
+        session.add(complete)
+        session.commit()
+        session.add_all([
+            PartyAffiliation(party_name="Independent", start_date=date(2010, 1, 1), politician_id=complete.id),
+            PoliticalPosition(title="Senator", jurisdiction="Vermont", chamber=Chamber.SENATE,
+                              start_date=date(2010, 1, 1), is_current=True, politician_id=complete.id),
+            FinancialDisclosure(report_year=2024, filing_date=date.today(),
+                                document_url="https://example.com/fd.pdf", politician_id=complete.id),
+        ])
+        session.commit()
+
+    response = client.get("/management/data-health")
+    assert response.status_code == 200
+    report = response.json()["politicians_with_issues"]
+    assert sorted(entry["id"] for entry in report) == sorted(politicians)
+    adams = next(entry for entry in report if entry["full_name"] == "Ann Adams")
+    assert {issue["field"] for issue in adams["issues"]} == {
+        "date_of_birth", "biography", "official_website_url", "positions", "financial_disclosures"
+    }
+
+
+def test_data_health_refresh_only_rechecks_changed_politicians(client, engine, politicians):
+    client.get("/management/data-health")
+    adams_id = politicians[0]
+
+    with Session(engine) as session:
+        session.add(PoliticalPosition(title="Mayor", jurisdiction="Springfield", chamber=Chamber.JOINT,
+                                      start_date=date(2020, 1, 1), is_current=True, politician_id=adams_id))
+        session.commit()
+
+    refresh = client.post("/management/data-health/refresh").json()
+    assert refresh["politicians_checked"] == 1
+    assert client.post("/management/data-health/refresh").json()["politicians_checked"] == 0
+
+    report = client.get("/management/data-health", params={"field": "positions"}).json()
+    assert adams_id not in [entry["id"] for entry in report["politicians_with_issues"]]
+    assert len(report["politicians_with_issues"]) == len(politicians) - 1
+    assert {issue["field"] for entry in report["politicians_with_issues"] for issue in entry["issues"]} == {"positions"}
+
+
+def test_data_health_refresh_picks_up_records_that_became_stale(client, engine, politicians):
+    client.get("/management/data-health")
+
+    with Session(engine) as session:
+        run = refresh_data_issues(session, now=datetime.utcnow() + timedelta(days=400))
+    assert run.politicians_checked == len(politicians)
+
+    report = client.get("/management/data-health", params={"field": "updated_at"}).json()
+    assert len(report["politicians_with_issues"]) == len(politicians)
+
+
+def test_data_health_pages_by_cursor(client, politicians):
+    report = client.get("/management/data-health", params={"size": 1000}).json()
+    expected = [entry["id"] for entry in report["politicians_with_issues"]]
+
+    ids, params = [], {"size": 3}
+    while True:
+        page = client.get("/management/data-health", params=params).json()
+        ids += [entry["id"] for entry in page["politicians_with_issues"]]
+        if not page["next_cursor"]:
+            break
+        params["cursor"] = page["next_cursor"]
+    assert ids == expected and len(ids) == len(politicians)
+
+
+def test_batch_matches_individual_profiles_with_shared_queries(client, engine, politicians, voter):
+    ids = [voter, politicians[0], 9999, politicians[1], voter]
+    response, statements = _count_selects(
+        engine, lambda: client.post("/politicians/batch", json={"ids": ids, "preview": 2})
+    )
+    batch = response.json()
+    assert batch["not_found"] == [9999]
+    assert [profile["id"] for profile in batch["results"]] == [voter, politicians[0], politicians[1]]
+    for profile in batch["results"]:
+        assert profile == client.get(f"/politicians/{profile['id']}", params={"preview": 2}).json()
+
+    # At most: the politicians, five relationship loads (committee memberships
+    # bring their committees), and a count and a preview per collection
+    assert len(statements) <= 1 + 5 + 4 * 2
+
+    trimmed = client.post("/politicians/batch", json={"ids": [voter], "include": ["votes"], "fields": []}).json()
+    assert set(trimmed["results"][0]) == {"id", "votes", "vote_count"}
+
+
+def test_batch_rejects_oversized_requests(client):
+    assert client.post("/politicians/batch", json={"ids": list(range(1, routes.MAX_BATCH_SIZE + 2))}).status_code == 422
+    assert client.post("/politicians/batch", json={"ids": []}).status_code == 422
+    assert client.post("/politicians/batch", json={"ids": [1], "preview": routes.MAX_BATCH_PREVIEW + 1}).status_code == 422
+
+
+def test_timeline_interleaves_every_kind_newest_first(client, engine, voter):
+    with Session(engine) as session:
+        session.add_all([
+            PoliticalPosition(title="Senator", jurisdiction="Ohio", chamber=Chamber.SENATE,
+                              start_date=date(2021, 3, 5), is_current=True, politician_id=voter),
+            PartyAffiliation(party_name="Whig", start_date=date(2019, 1, 1), politician_id=voter),
+        ])
+        session.commit()
+
+    everything = client.get(f"/politicians/{voter}/timeline", params={"limit": 500}).json()
+    assert everything["next_cursor"] is None
+    events = everything["results"]
+    assert len(events) == 24 + 6 + 2
+    assert [event["date"] for event in events] == sorted((event["date"] for event in events), reverse=True)
+    assert events[0] == {"kind": "donation", "date": "2022-06-01", "ref_id": events[0]["ref_id"],
+                         "data": {"donor_name": "Donor 6", "donor_type": "Individual", "amount": 60.0,
+                                  "date": "2022-06-01"}}
+    assert events[-1]["kind"] == "party_affiliation"
+
+    paged = _follow_collection(client, f"/politicians/{voter}/timeline", limit=4)
+    assert paged == events
+
+
+def test_timeline_window_and_kinds(client, voter):
+    events = client.get(f"/politicians/{voter}/timeline",
+                        params={"start_date": "2021-03-11", "end_date": "2022-01-31"}).json()["results"]
+    assert [event["kind"] for event in events] == ["donation"] + ["vote"] * 4
+
+    donations = _follow_collection(client, f"/politicians/{voter}/timeline", kinds="donation", limit=4)
+    assert {event["kind"] for event in donations} == {"donation"} and len(donations) == 6
+
+
+def test_donation_summary_is_served_from_the_rollups(client, engine, voter):
+    with Session(engine) as session:
+        session.add_all([
+            CampaignDonation(donor_name="Donor 1", donor_type="Individual", amount=5.0,
+                             date=date(2022, 1, 20), recipient_id=voter),
+            CampaignDonation(donor_name="Builders PAC", donor_type="PAC", amount=100.0,
+                             date=date(2023, 2, 1), recipient_id=voter),
+        ])
+        session.commit()
+
+    summary = client.get(f"/politicians/{voter}/donations/summary", params={"top": 2}).json()
+    assert routes.DonationSummary.model_validate(summary).model_dump() == summary
+    assert (summary["total_amount"], summary["donation_count"]) == (315.0, 8)
+    assert summary["by_cycle"] == [
+        {"cycle": 2022, "total_amount": 215.0, "donation_count": 7},
+        {"cycle": 2024, "total_amount": 100.0, "donation_count": 1},
+    ]
+    assert summary["by_donor_type"][0] == {"donor_type": "Individual", "total_amount": 215.0,
+                                           "donation_count": 7, "share": 215.0 / 315.0}
+    assert summary["by_month"][0] == {"month": "2022-01", "total_amount": 15.0, "donation_count": 2}
+    assert [donor["donor_name"] for donor in summary["top_donors"]] == ["Builders PAC", "Donor 6"]
+
+    cycle = client.get(f"/politicians/{voter}/donations/summary", params={"cycle": 2024}).json()
+    assert (cycle["total_amount"], [row["donor_type"] for row in cycle["by_donor_type"]]) == (100.0, ["PAC"])
+    assert len(cycle["by_cycle"]) == 2
+
+
+def test_financial_series_buckets_in_sql_and_downsamples(client, engine, voter):
+    with Session(engine) as session:
+        session.add(CampaignDonation(donor_name="Donor 1", donor_type="Individual", amount=5.0,
+                                     date=date(2022, 1, 20), recipient_id=voter))
+        session.commit()
+
+    series = client.get(f"/politicians/{voter}/financials/series").json()
+    assert routes.FinancialSeries.model_validate(series).model_dump(mode="json") == series
+    assert series["donations"]["buckets"] == 6
+    assert series["donations"]["points"][0] == {"date": "2022-01-01", "total": 15.0, "count": 2}
+    assert series["gifts"] == {"points": [], "buckets": 0}
+
+    weekly = client.get(f"/politicians/{voter}/financials/series", params={"bucket": "week"}).json()
+    # 2022-01-01 was a Saturday and 2022-01-20 a Thursday
+    assert [point["date"] for point in weekly["donations"]["points"][:2]] == ["2021-12-27", "2022-01-17"]
+
+    downsampled = client.get(f"/politicians/{voter}/financials/series", params={"points": 3}).json()["donations"]
+    assert downsampled["buckets"] == 6
+    assert [point["date"] for point in downsampled["points"]][::2] == ["2022-01-01", "2022-06-01"]
+    assert len(downsampled["points"]) == 3
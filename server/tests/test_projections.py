@@ -0,0 +1,175 @@
+"""
+Tests for the trigger-maintained read projections in server/projections.py.
+"""
+from datetime import date, datetime
+
+from sqlmodel import SQLModel, Session, select
+
+from server.models import (
+    Politician, PoliticalPosition, PartyAffiliation, PoliticianCurrentStatus, Chamber, CampaignDonation,
+    DonationRollup, DonorTotal, Bill, Vote, VotePosition, RollCall, RollCallPartyTally
+)
+from server.projections import ALL_CYCLES, UNKNOWN_PARTY
+
+
+def test_current_status_follows_positions_and_affiliations(session):
+    politician = Politician(first_name="Joe", last_name="Manchin")
+    session.add(politician)
+    session.commit()
+
+    status = session.get(PoliticianCurrentStatus, politician.id)
+    assert status is not None and status.party_name is None and status.position_title is None
+
+    democratic = PartyAffiliation(party_name="Democratic", start_date=date(1982, 1, 1), politician_id=politician.id)
+    session.add(democratic)
+    session.add(PoliticalPosition(title="Senator", jurisdiction="United States - West Virginia", chamber=Chamber.SENATE,
+                                  start_date=date(2010, 11, 15), is_current=True, politician_id=politician.id))
+    session.commit()
+    session.expire_all()
+
+    status = session.get(PoliticianCurrentStatus, politician.id)
+    assert status.party_name == "Democratic" and status.party_key == "democratic"
+    assert status.position_title == "Senator"
+    assert status.jurisdiction_key == "united states - west virginia"
+    assert status.chamber == Chamber.SENATE
+
+    democratic.end_date = date(2024, 5, 31)
+    session.add(democratic)
+    session.add(PartyAffiliation(party_name="Independent", start_date=date(2024, 5, 31), politician_id=politician.id))
+    session.commit()
+    session.expire_all()
+    assert session.get(PoliticianCurrentStatus, politician.id).party_name == "Independent"
+
+    session.delete(politician.positions[0])
+    session.commit()
+    session.expire_all()
+    assert session.get(PoliticianCurrentStatus, politician.id).position_title is None
+
+
+def test_current_status_is_backfilled_for_existing_rows(engine):
+    with Session(engine) as session:
+        politician = Politician(first_name="Bernie", last_name="Sanders")
+        session.add(politician)
+        session.commit()
+        session.add(PartyAffiliation(party_name="Independent", start_date=date(1979, 1, 1), politician_id=politician.id))
+        session.commit()
+        politician_id = politician.id
+
+    PoliticianCurrentStatus.__table__.drop(engine)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        assert session.get(PoliticianCurrentStatus, politician_id).party_name == "Independent"
+
+
+def _donor_totals(session):
+    return {(row.donor_name, row.cycle): (row.total_amount, row.donation_count)
+            for row in session.exec(select(DonorTotal))}
+
+
+def test_donation_rollups_follow_inserts_updates_and_deletes(session):
+    politician = Politician(first_name="Nancy", last_name="Pelosi")
+    session.add(politician)
+    session.commit()
+    first = CampaignDonation(donor_name="Jane Doe", donor_type="Individual", amount=100.0,
+                             date=date(2021, 3, 4), recipient_id=politician.id)
+    second = CampaignDonation(donor_name="Jane Doe", donor_type="Individual", amount=50.0,
+                              date=date(2021, 3, 20), recipient_id=politician.id)
+    session.add_all([first, second])
+    session.commit()
+
+    rollup = session.get(DonationRollup, (politician.id, 2022, "2021-03", "Individual", "Jane Doe"))
+    assert (rollup.total_amount, rollup.donation_count) == (150.0, 2)
+    assert _donor_totals(session) == {("Jane Doe", 2022): (150.0, 2), ("Jane Doe", ALL_CYCLES): (150.0, 2)}
+
+    # Moving a donation into the next cycle moves it between rollup rows
+    first.date = date(2023, 1, 5)
+    session.add(first)
+    session.commit()
+    session.expire_all()
+    assert session.get(DonationRollup, (politician.id, 2024, "2023-01", "Individual", "Jane Doe")).total_amount == 100.0
+    assert _donor_totals(session) == {
+        ("Jane Doe", 2022): (50.0, 1), ("Jane Doe", 2024): (100.0, 1), ("Jane Doe", ALL_CYCLES): (150.0, 2)
+    }
+
+    # Rows that no longer sum any donation are removed
+    session.delete(second)
+    session.commit()
+    session.expire_all()
+    assert session.get(DonationRollup, (politician.id, 2022, "2021-03", "Individual", "Jane Doe")) is None
+    assert _donor_totals(session) == {("Jane Doe", 2024): (100.0, 1), ("Jane Doe", ALL_CYCLES): (100.0, 1)}
+
+
+def test_donation_rollups_are_backfilled_for_existing_rows(engine):
+    with Session(engine) as session:
+        politician = Politician(first_name="Mitch", last_name="McConnell")
+        session.add(politician)
+        session.commit()
+        session.add_all([
+            CampaignDonation(donor_name="Acme PAC", donor_type="PAC", amount=amount,
+                             date=date(year, 6, 1), recipient_id=politician.id)
+            for year, amount in ((2019, 10.0), (2020, 20.0), (2021, 40.0))
+        ])
+        session.commit()
+
+    DonorTotal.__table__.drop(engine)
+    DonationRollup.__table__.drop(engine)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        assert _donor_totals(session) == {
+            ("Acme PAC", 2020): (30.0, 2), ("Acme PAC", 2022): (40.0, 1), ("Acme PAC", ALL_CYCLES): (70.0, 3)
+        }
+        assert len(session.exec(select(DonationRollup)).all()) == 3
+
+
+def _party_tallies(session):
+    return {row.party_name: (row.yes_count, row.no_count) for row in session.exec(select(RollCallPartyTally))}
+
+
+def test_roll_call_tallies_follow_votes_and_party_changes(session):
+    bill = Bill(bill_number="H.R. 1", title="For the People Act", congress_session=117,
+                introduced_date=date(2021, 1, 4), status="Passed House")
+    pelosi = Politician(first_name="Nancy", last_name="Pelosi")
+    amash = Politician(first_name="Justin", last_name="Amash")
+    session.add_all([bill, pelosi, amash])
+    session.commit()
+    session.add_all([
+        PartyAffiliation(party_name="Democratic", start_date=date(1987, 6, 2), politician_id=pelosi.id),
+        PartyAffiliation(party_name="Republican", start_date=date(2011, 1, 3), politician_id=amash.id),
+    ])
+    votes = [
+        Vote(vote_date=datetime(2021, 3, 3, 18), position=position, roll_call_number=62,
+             chamber=Chamber.HOUSE, politician_id=politician.id, bill_id=bill.id)
+        for politician, position in ((pelosi, VotePosition.YES), (amash, VotePosition.NO))
+    ]
+    session.add_all(votes)
+    session.commit()
+
+    roll_call = session.get(RollCall, (bill.id, Chamber.HOUSE, 62, date(2021, 3, 3)))
+    assert (roll_call.yes_count, roll_call.no_count) == (1, 1)
+    assert _party_tallies(session) == {"Democratic": (1, 0), "Republican": (0, 1)}
+
+    # A party switch recorded after the votes re-attributes the votes cast since
+    session.add(PartyAffiliation(party_name="Libertarian", start_date=date(2020, 4, 29), politician_id=amash.id))
+    session.commit()
+    session.expire_all()
+    assert _party_tallies(session) == {"Democratic": (1, 0), "Libertarian": (0, 1)}
+
+    # Ending a member's only affiliation before the vote leaves them without a party
+    session.delete(amash.party_affiliations[-1])
+    session.commit()
+    affiliation = session.exec(select(PartyAffiliation).where(PartyAffiliation.politician_id == amash.id)).one()
+    affiliation.end_date = date(2019, 7, 4)
+    session.add(affiliation)
+    session.commit()
+    session.expire_all()
+    assert _party_tallies(session) == {"Democratic": (1, 0), UNKNOWN_PARTY: (0, 1)}
+
+    votes[1].position = VotePosition.YES
+    session.add(votes[1])
+    session.commit()
+    session.delete(votes[0])
+    session.commit()
+    session.expire_all()
+    assert _party_tallies(session) == {UNKNOWN_PARTY: (1, 0)}
+    roll_call = session.get(RollCall, (bill.id, Chamber.HOUSE, 62, date(2021, 3, 3)))
+    assert (roll_call.yes_count, roll_call.no_count) == (1, 0)
@@ -0,0 +1,198 @@
+"""
+Query-plan regression checks for the API routes.
+
+Each route is exercised against an in-memory database while every statement
+it issues is captured, writes included (INSERT ... SELECT, and UPDATE or
+DELETE through their WHERE clauses). The captured statements are then run through
+``EXPLAIN QUERY PLAN`` and the test fails if any of them reads a table other
+than by an index SEARCH, full index scans included.
+"""
+import re
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import SQLModel, Session
+
+from server.models import (
+    Politician, PoliticalPosition, PartyAffiliation, Vote, VotePosition, Bill, Chamber,
+    Committee, CommitteeMembership, Gift, CampaignDonation, FinancialDisclosure, Source
+)
+
+# Statements that legitimately read whole tables: route -> table -> a
+# pattern found in the statement. Each entry should say why.
+FULL_SCAN_ALLOWED = {
+    # Without filters the exact total counts every politician (cached; see total=)
+    "/politicians": {"politicians": r"^SELECT count\(\*\)"},
+    # The index is built on first use, from every congress's votes
+    "/politicians/1/similar": {"bills": r"^SELECT DISTINCT bills.congress_session"},
+    # The first read runs the data-health checks, which count the whole
+    # queue of politicians waiting to be re-checked. The very first run
+    # queues every politician (later runs: see test_data_health_rerun_uses_indexes)
+    "/management/data-health": {
+        "data_health_pending": r"^SELECT count\(\*\) FROM data_health_pending",
+        "politicians": r"^INSERT OR IGNORE INTO data_health_pending \(politician_id\) SELECT id FROM politicians$",
+    },
+    "/management/data-health/refresh": {
+        "data_health_pending": r"^SELECT count\(\*\) FROM data_health_pending",
+        "politicians": r"^INSERT OR IGNORE INTO data_health_pending \(politician_id\) SELECT id FROM politicians$",
+    },
+    # Fuzzy name search scores the short queue of names not yet indexed
+    "/search": {"politician_name_pending": r"IN \(SELECT politician_name_pending.politician_id\s+FROM politician_name_pending\)"},
+}
+
+ROUTE_REQUESTS = [
+    ("GET", "/search", {"q": "Schumer"}),
+    ("GET", "/search", {"q": "Infrastructure"}),
+    ("GET", "/search", {"q": "Shumer"}),
+    ("GET", "/politicians", {}),
+    ("GET", "/politicians", {"sort_by": "first_name_desc", "size": 1}),
+    ("GET", "/politicians", {"party": "democratic", "jurisdiction": "united states - new york"}),
+    ("GET", "/politicians/1", {}),
+    ("GET", "/politicians/1/votes", {"start_date": "2021-01-01", "end_date": "2021-12-31"}),
+    ("GET", "/politicians/1/gifts", {}),
+    ("GET", "/politicians/1/donations", {"start_date": "2022-01-01"}),
+    ("GET", "/politicians/1/disclosures", {"end_date": "2023-12-31"}),
+    ("GET", "/politicians/1/donations/summary", {}),
+    ("GET", "/politicians/1/donations/summary", {"cycle": 2022}),
+    ("GET", "/politicians/1/financials/series", {"bucket": "week"}),
+    ("GET", "/bills/1/roll-calls", {}),
+    ("GET", "/politicians/1/timeline", {"start_date": "2000-01-01", "end_date": "2022-12-31"}),
+    ("GET", "/politicians/1/timeline", {"kinds": "vote", "limit": 1}),
+    ("POST", "/politicians/batch", {"ids": [1, 2]}),
+    ("GET", "/politicians/1/similar", {"min_shared_votes": 1}),
+    ("GET", "/management/data-health", {}),
+    ("GET", "/management/data-health", {"field": "positions", "jurisdiction": "united states - new york"}),
+    ("POST", "/management/data-health/refresh", {}),
+    ("GET", "/analytics/party-unity", {}),
+    ("GET", "/analytics/party-unity", {"congress_session": 117, "party": "democratic", "order": "highest"}),
+    ("GET", "/analytics/ideal-points", {}),
+    ("GET", "/analytics/ideal-points", {"congress_session": 117, "chamber": "Senate"}),
+    ("GET", "/analytics/top-donors", {}),
+    ("GET", "/analytics/money-votes", {}),
+    ("GET", "/analytics/top-donors", {"cycle": 2022, "donor_type": "Individual"}),
+]
+
+
+@pytest.fixture(autouse=True)
+def schumer(engine):
+    with Session(engine) as session:
+        source = Source(name="Senate.gov")
+        session.add(source)
+        session.commit()
+        schumer = Politician(first_name="Chuck", last_name="Schumer", source_id=source.id)
+        session.add(schumer)
+        session.commit()
+        bill = Bill(bill_number="H.R. 3684", title="Infrastructure Investment and Jobs Act",
+                    congress_session=117, introduced_date=date(2021, 6, 4), status="Became Law")
+        committee = Committee(name="Rules and Administration", chamber=Chamber.SENATE)
+        session.add_all([bill, committee])
+        session.commit()
+        session.add_all([
+            PoliticalPosition(title="Senator", jurisdiction="United States - New York", chamber=Chamber.SENATE,
+                              start_date=date(1999, 1, 3), is_current=True, politician_id=schumer.id),
+            PartyAffiliation(party_name="Democratic", start_date=date(1974, 1, 1), politician_id=schumer.id),
+            Vote(vote_date=datetime(2021, 8, 10), position=VotePosition.YES, roll_call_number=314,
+                 chamber=Chamber.SENATE, politician_id=schumer.id, bill_id=bill.id),
+            CommitteeMembership(role="Member", start_date=date(2021, 1, 20),
+                                politician_id=schumer.id, committee_id=committee.id),
+            Gift(description="Book", value=25.0, report_date=date(2022, 1, 1), donor="Publisher",
+                 recipient_id=schumer.id, source_id=source.id),
+            CampaignDonation(donor_name="Jane Doe", donor_type="Individual", amount=100.0,
+                             date=date(2022, 3, 1), recipient_id=schumer.id),
+            FinancialDisclosure(report_year=2022, filing_date=date(2023, 5, 15),
+                                document_url="https://example.com/fd.pdf", politician_id=schumer.id),
+        ])
+        session.commit()
+
+
+def _full_scans(connection, statement, parameters):
+    """
+    Return the base tables the statement reads other than by an index SEARCH.
+
+    The one kind of scan let through is an ordered index scan cut short by
+    LIMIT: the statement has ORDER BY ... LIMIT, the rows come out of the
+    index already in order (no temporary B-tree sorts them) and so reading
+    stops after the last row returned.
+    """
+    plan = [row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()]
+    base_tables = set(SQLModel.metadata.tables)
+    # The plan names tables by their alias, e.g. "politicians AS politicians_1"
+    names = {table: table for table in base_tables}
+    names.update(
+        (alias, table) for table, alias in re.findall(r"\b(\w+) AS (\w+)\b", statement) if table in base_tables
+    )
+    bounded = (
+        re.search(r"\bORDER BY\b.*\bLIMIT\b", statement, re.IGNORECASE | re.DOTALL) is not None
+        and not any("TEMP B-TREE FOR ORDER BY" in detail for detail in plan)
+    )
+    scanned = set()
+    for detail in plan:
+        words = detail.split()
+        # An automatic index is built by scanning the whole table on every execution
+        if "AUTOMATIC" in detail:
+            scanned.add(names.get(words[1], words[1]))
+            continue
+        if words[0] != "SCAN" or words[1] not in names:
+            continue
+        if bounded and "USING" in words and "INDEX" in words:
+            continue
+        scanned.add(names[words[1]])
+    return scanned
+
+
+def test_full_scan_detection(engine):
+    with engine.connect() as connection:
+        # An ordered index scan cut short by LIMIT is the only scan let through
+        assert _full_scans(connection, "SELECT id FROM politicians ORDER BY last_name, id LIMIT 10", ()) == set()
+        assert _full_scans(connection, "SELECT id FROM politicians ORDER BY last_name, id", ()) == {"politicians"}
+        assert _full_scans(connection, "SELECT id FROM politicians ORDER BY biography LIMIT 10", ()) == {"politicians"}
+        # Aliased tables are named by their alias in the plan
+        assert _full_scans(connection, "SELECT count(*) FROM politicians AS p", ()) == {"politicians"}
+        assert _full_scans(connection, "SELECT first_name FROM politicians AS p WHERE p.id = 1", ()) == set()
+        # Writes are checked for the rows they read
+        assert _full_scans(connection, "UPDATE politicians SET biography = '' WHERE biography IS NULL", ()) == {"politicians"}
+        assert _full_scans(connection, "DELETE FROM politicians WHERE id = 1", ()) == set()
+        assert _full_scans(connection, "INSERT INTO data_health_pending SELECT id FROM politicians", ()) == {"politicians"}
+
+
+def _assert_route_uses_indexes(engine, client, method, path, params, allowed):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        # Writes read tables too: INSERT ... SELECT, and UPDATE / DELETE through WHERE and subqueries
+        if statement.lstrip().upper().startswith(("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")):
+            statements.append((statement, parameters[0] if executemany else parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        if method == "POST":
+            response = client.request(method, path, json=params)
+        else:
+            response = client.request(method, path, params=params)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    assert response.status_code == 200, response.text
+    assert statements, f"{path} issued no queries"
+
+    with engine.connect() as connection:
+        for statement, parameters in statements:
+            scans = {
+                table for table in _full_scans(connection, statement, parameters)
+                if table not in allowed or not re.search(allowed[table], statement)
+            }
+            assert not scans, f"{path} fully scans {sorted(scans)}:\n{statement}"
+
+
+@pytest.mark.parametrize("method, path, params", ROUTE_REQUESTS)
+def test_route_queries_use_indexes(engine, client, method, path, params):
+    _assert_route_uses_indexes(engine, client, method, path, params, FULL_SCAN_ALLOWED.get(path, {}))
+
+
+def test_data_health_rerun_uses_indexes(engine, client):
+    # Only the first run reads every politician; later ones seek the changed and newly stale ones
+    assert client.post("/management/data-health/refresh").status_code == 200
+    _assert_route_uses_indexes(
+        engine, client, "POST", "/management/data-health/refresh", {},
+        {"data_health_pending": r"^SELECT count\(\*\) FROM data_health_pending"},
+    )
@@ -0,0 +1,195 @@
+"""
+Tests for the FTS5-backed search index in server/search.py.
+"""
+from datetime import date, datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlmodel import SQLModel
+
+from server.models import Politician, Bill, Vote, VotePosition, Chamber, Committee, CommitteeMembership
+from server.search import build_match_query, rank_politicians, trigrams, fuzzy_match_politicians, NameSuggester
+from server import search as search_module
+from server.api import routes
+from server.api.pagination import encode_cursor, decode_cursor
+
+
+def test_build_match_query_quotes_and_prefixes_tokens():
+    assert build_match_query("Ocasio-Cortez") == '"ocasio"* "cortez"*'
+    assert build_match_query("O'Connor") == '"o"* "connor"*'
+    assert build_match_query("  ") is None
+
+
+def test_rank_politicians_matches_names_bills_and_committees(session):
+    name_match = Politician(first_name="Alexandria", last_name="Ocasio-Cortez")
+    voter = Politician(first_name="Chuck", last_name="Schumer")
+    member = Politician(first_name="Nancy", last_name="Pelosi")
+    session.add_all([name_match, voter, member])
+    session.commit()
+
+    bill = Bill(bill_number="H.R. 3684", title="Infrastructure Investment and Jobs Act",
+                congress_session=117, introduced_date=date(2021, 6, 4), status="Became Law")
+    committee = Committee(name="Transportation and Infrastructure", chamber=Chamber.HOUSE)
+    session.add_all([bill, committee])
+    session.commit()
+
+    session.add(Vote(vote_date=datetime(2021, 11, 5), position=VotePosition.YES, roll_call_number=369,
+                     chamber=Chamber.SENATE, politician_id=voter.id, bill_id=bill.id))
+    session.add(CommitteeMembership(role="Member", start_date=date(2019, 1, 3),
+                                    politician_id=member.id, committee_id=committee.id))
+    session.commit()
+
+    assert [pid for pid, _ in rank_politicians(session, "alexandria", limit=10)] == [name_match.id]
+    assert {pid for pid, _ in rank_politicians(session, "infrastr", limit=10)} == {voter.id, member.id}
+    assert rank_politicians(session, "xyzrandomuniquestring", limit=10) == []
+
+
+def test_search_index_follows_updates_and_deletes(session):
+    politician = Politician(first_name="Chuck", last_name="Schumer")
+    session.add(politician)
+    session.commit()
+
+    politician.last_name = "Shumer"
+    session.add(politician)
+    session.commit()
+    assert rank_politicians(session, "schumer", limit=10) == []
+    assert [pid for pid, _ in rank_politicians(session, "shumer", limit=10)] == [politician.id]
+
+    session.delete(politician)
+    session.commit()
+    assert rank_politicians(session, "shumer", limit=10) == []
+
+
+def test_rank_politicians_pages_with_keyset(session):
+    session.add_all([Politician(first_name="Chuck", last_name=f"Member{i}") for i in range(5)])
+    session.commit()
+
+    first_page = rank_politicians(session, "chuck", limit=3)
+    assert len(first_page) == 3
+    last_id, last_score = first_page[-1]
+    second_page = rank_politicians(session, "chuck", limit=3, after=(last_score, last_id))
+    assert len(second_page) == 2
+    assert {pid for pid, _ in first_page}.isdisjoint({pid for pid, _ in second_page})
+
+
+def test_search_skips_ranked_politicians_without_a_row(client, session):
+    voter = Politician(first_name="Chuck", last_name="Schumer")
+    bill = Bill(bill_number="H.R. 3684", title="Infrastructure Investment and Jobs Act",
+                congress_session=117, introduced_date=date(2021, 6, 4), status="Became Law")
+    session.add_all([voter, bill])
+    session.commit()
+    # A vote left behind by a politician removed outside the ORM still ranks
+    for politician_id in (voter.id, 9999):
+        session.add(Vote(vote_date=datetime(2021, 11, 5), position=VotePosition.YES, roll_call_number=369,
+                         chamber=Chamber.SENATE, politician_id=politician_id, bill_id=bill.id))
+    session.commit()
+
+    response = client.get("/search", params={"q": "infrastructure"})
+    assert response.status_code == 200
+    assert [row["id"] for row in response.json()["results"]] == [voter.id]
+
+
+def test_search_reports_when_candidate_bills_are_capped(client, session, monkeypatch):
+    monkeypatch.setattr(search_module, "MAX_BILL_CANDIDATES", 2)
+    session.add_all([
+        Bill(bill_number=f"H.R. {i}", title=f"Clean Water Act {i}", congress_session=117,
+             introduced_date=date(2021, 6, 4), status="Introduced")
+        for i in range(3)
+    ])
+    session.commit()
+
+    assert client.get("/search", params={"q": "water"}).json()["candidates_truncated"] is True
+    assert client.get("/search", params={"q": "water 1"}).json()["candidates_truncated"] is False
+
+
+def test_search_database_errors_are_logged(client, monkeypatch, caplog):
+    def fail(*args, **kwargs):
+        raise OperationalError("SELECT", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(routes, "rank_politicians", fail)
+    response = client.get("/search", params={"q": "schumer"})
+    assert response.status_code == 500
+    assert "Search for 'schumer' failed" in caplog.text
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    assert decode_cursor(encode_cursor(-1.25, 42), float, int) == [-1.25, 42]
+    with pytest.raises(HTTPException):
+        decode_cursor("not-a-cursor", float, int)
+    with pytest.raises(HTTPException):
+        decode_cursor(encode_cursor(1), float, int)
+    # Well-formed, but holding values of the wrong types
+    for values in (("x", 42), (-1.25, [1]), (-1.25, None), (-1.25, True)):
+        with pytest.raises(HTTPException):
+            decode_cursor(encode_cursor(*values), float, int)
+
+
+def test_trigrams_pad_words_and_fold_accents():
+    assert trigrams("Shumer") == {"  s", " sh", "shu", "hum", "ume", "mer", "er "}
+    assert trigrams("José") == trigrams("jose")
+
+
+def test_fuzzy_match_tolerates_misspellings(session):
+    schumer = Politician(first_name="Chuck", last_name="Schumer")
+    aoc = Politician(first_name="Alexandria", last_name="Ocasio-Cortez")
+    session.add_all([schumer, aoc, Politician(first_name="Nancy", last_name="Pelosi")])
+    session.commit()
+
+    assert fuzzy_match_politicians(session, "Shumer", limit=5)[0][0] == schumer.id
+    assert [pid for pid, _ in fuzzy_match_politicians(session, "Ocasio Cortes", limit=5)] == [aoc.id]
+    assert fuzzy_match_politicians(session, "Zzyzx", limit=5) == []
+
+    schumer.last_name = "Warnock"
+    session.add(schumer)
+    session.commit()
+    assert [pid for pid, _ in fuzzy_match_politicians(session, "Warnok", limit=5)] == [schumer.id]
+
+
+def test_fuzzy_match_follows_raw_sql_writes(engine, session):
+    def pending():
+        return session.execute(text("SELECT count(*) FROM politician_name_pending")).scalar_one()
+
+    session.execute(text(
+        "INSERT INTO politicians (id, first_name, last_name, created_at, updated_at)"
+        " VALUES (7, 'Chuck', 'Schumer', '2024-01-01', '2024-01-01')"
+    ))
+    session.commit()
+    assert pending() == 1
+    assert [pid for pid, _ in fuzzy_match_politicians(session, "Shumer", limit=5)] == [7]
+
+    # Startup indexes the queued names
+    SQLModel.metadata.create_all(engine)
+    assert pending() == 0
+    assert [pid for pid, _ in fuzzy_match_politicians(session, "Shumer", limit=5)] == [7]
+
+    session.execute(text("UPDATE politicians SET last_name = 'Warnock' WHERE id = 7"))
+    session.commit()
+    assert fuzzy_match_politicians(session, "Shumer", limit=5) == []
+    assert [pid for pid, _ in fuzzy_match_politicians(session, "Warnok", limit=5)] == [7]
+
+    session.execute(text("DELETE FROM politicians WHERE id = 7"))
+    session.commit()
+    assert fuzzy_match_politicians(session, "Warnok", limit=5) == []
+    assert pending() == 0
+
+
+def test_name_suggester_prefix_lookup_and_updates(session):
+    aoc = Politician(first_name="Alexandria", last_name="Ocasio-Cortez")
+    session.add_all([aoc, Politician(first_name="Chuck", last_name="Schumer")])
+    session.commit()
+
+    suggester = NameSuggester()
+    suggester.load(session)
+    assert suggester.suggest("ocasio c", limit=5) == [(aoc.id, "Alexandria Ocasio-Cortez")]
+    assert suggester.suggest("CORT", limit=5) == [(aoc.id, "Alexandria Ocasio-Cortez")]
+    assert suggester.suggest("x", limit=5) == []
+
+    aoc.last_name = "Smith"
+    suggester.upsert(aoc)
+    assert suggester.suggest("cort", limit=5) == []
+    assert suggester.suggest("smi", limit=5) == [(aoc.id, "Alexandria Smith")]
+
+    suggester.remove(aoc.id)
+    assert suggester.suggest("alex", limit=5) == []